@@ -0,0 +1,67 @@
+"""
+Compare loading the whole Morpheme table and aggregating in pandas with
+querying only the chart data, on SQLite: time and size of the data read.
+
+Usage: python -m benchmarks.bench_chart_data --songs 500
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.corpus import generate_songs
+from morphemes_extractor.chart_data import (
+    load_pos_counts,
+    load_top_morpheme_song_counts,
+    load_top_morphemes,
+)
+from morphemes_extractor.data_extractor import iter_song_batches
+from morphemes_extractor.db_func import save_to_db
+from morphemes_extractor.romanizer import SUDACHI_ENGINE
+from visualize import load_morpheme_table
+
+
+def time_load(func: Callable[[], list[pd.DataFrame]]) -> tuple[float, int]:
+    """
+    Time a chart data load.
+    :param func: Function returning the DataFrames read from the database.
+    :return: Seconds and the in-memory size of the DataFrames in bytes.
+    """
+    start = time.perf_counter()
+    frames = func()
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(int(df.memory_usage(deep=True).sum()) for df in frames)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--songs", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+
+    songs = generate_songs(args.songs, args.lines)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_url = f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        rows = save_to_db(iter_song_batches(songs, romanizer=SUDACHI_ENGINE), db_url)
+        print(f"songs: {args.songs}, rows: {rows}")
+
+        results = {
+            "whole table": time_load(lambda: [load_morpheme_table(db_url)]),
+            "chart data": time_load(
+                lambda: [
+                    load_top_morphemes(db_url),
+                    load_pos_counts(db_url),
+                    load_top_morpheme_song_counts(db_url),
+                ]
+            ),
+        }
+        for name, (seconds, size) in results.items():
+            print(f"{name:<12} {seconds * 1000:>10.1f} ms {size / 1024:>12,.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
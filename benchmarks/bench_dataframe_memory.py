@@ -0,0 +1,40 @@
+"""
+Compare the memory of the morpheme DataFrame with object string columns
+and with the categorical columns produced by the extractor.
+
+Usage: python -m benchmarks.bench_dataframe_memory --songs 2000
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import generate_songs
+from morphemes_extractor.data_extractor import iter_song_batches
+from morphemes_extractor.data_transformer import concat_dataframes
+from morphemes_extractor.romanizer import SUDACHI_ENGINE
+from visualize import count_values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--songs", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+
+    songs = generate_songs(args.songs, args.lines)
+    categorical_df = concat_dataframes(
+        list(iter_song_batches(songs, romanizer=SUDACHI_ENGINE))
+    )
+    object_df = categorical_df.astype(object)
+    print(f"songs: {args.songs}, rows: {len(categorical_df)}")
+
+    for name, df in (("object", object_df), ("categorical", categorical_df)):
+        size_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+        start = time.perf_counter()
+        count_values(df, "Morpheme")
+        count_ms = (time.perf_counter() - start) * 1000
+        print(f"{name:<12} {size_mb:>10.1f} MiB {count_ms:>10.1f} ms morpheme counts")
+
+
+if __name__ == "__main__":
+    main()
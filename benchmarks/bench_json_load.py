@@ -0,0 +1,95 @@
+"""
+Compare loading lyrics files serially with the json module against
+load_songs, which reads and decodes the files in a thread pool
+with the decoder of get_json_decoder (orjson when it is installed).
+Two corpora are timed: hundreds of small files and a few very large ones.
+Every configuration must load the same songs in the same order.
+
+Usage: python -m benchmarks.bench_json_load --small-files 400 --large-files 3
+"""
+
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.corpus import generate_songs, write_lyrics_files
+from morphemes_extractor.json_utils import LYRICS_DIR, load_songs
+
+
+def time_load(
+    paths: list[str], workers: int, repeat: int
+) -> tuple[float, list[dict[str, str]]]:
+    """
+    Time loading all songs of lyrics files.
+    :param paths: Paths of the lyrics files.
+    :param workers: Number of threads.
+    :param repeat: Number of runs; the fastest is kept.
+    :return: Seconds of the fastest run and the loaded songs.
+    """
+    best = float("inf")
+    songs: list[dict[str, str]] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        songs = load_songs(paths, workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best, songs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--small-files", type=int, default=400)
+    parser.add_argument("--songs-per-small-file", type=int, default=5)
+    parser.add_argument("--large-files", type=int, default=3)
+    parser.add_argument("--songs-per-large-file", type=int, default=10000)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    decoders = ["json"]
+    if importlib.util.find_spec("orjson") is not None:
+        decoders.append("orjson")
+
+    with tempfile.TemporaryDirectory(dir=LYRICS_DIR) as tmp_dir:
+        corpora = {
+            "small files": write_lyrics_files(
+                generate_songs(
+                    args.small_files * args.songs_per_small_file, args.lines
+                ),
+                Path(tmp_dir) / "small",
+                args.songs_per_small_file,
+            ),
+            "large files": write_lyrics_files(
+                generate_songs(
+                    args.large_files * args.songs_per_large_file, args.lines
+                ),
+                Path(tmp_dir) / "large",
+                args.songs_per_large_file,
+            ),
+        }
+        for corpus_name, paths in corpora.items():
+            size_mb = sum(Path(path).stat().st_size for path in paths) / 1e6
+            print(f"{corpus_name}: {len(paths)} files, {size_mb:.1f} MB")
+            reference = None
+            for decoder in decoders:
+                for workers in args.workers:
+                    with patch.dict(os.environ, {"JSON_DECODER": decoder}):
+                        seconds, songs = time_load(paths, workers, args.repeat)
+                    if reference is None:
+                        reference = songs
+                    elif songs != reference:
+                        raise AssertionError(
+                            f"{decoder} with {workers} workers loaded other songs"
+                        )
+                    print(
+                        f"  {decoder:<8} {workers:>3} workers"
+                        f" {seconds * 1000:>10.1f} ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare rendering the charts serially in this process with rendering them
+concurrently in the rendering process pool: wall time and per-chart time.
+The first pooled run includes starting the processes; later runs reuse them.
+
+Usage: python -m benchmarks.bench_render_charts --songs 200 --workers 3
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+
+from benchmarks.corpus import generate_songs
+from morphemes_extractor.data_extractor import iter_song_batches
+from morphemes_extractor.data_transformer import concat_dataframes
+from morphemes_extractor.romanizer import SUDACHI_ENGINE
+from visualize import render_charts, shutdown_render_pool
+
+
+def time_render(
+    chart_data: dict[str, pd.DataFrame], workers: int
+) -> tuple[float, dict[str, float]]:
+    """
+    Time one render of all charts.
+    :param chart_data: Data of each chart, by chart name.
+    :param workers: Number of rendering processes.
+    :return: Wall seconds and the render seconds of each chart.
+    """
+    start = time.perf_counter()
+    render_seconds = render_charts(chart_data, font_scale=2.0, workers=workers)
+    return time.perf_counter() - start, render_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--songs", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    # Missing CJK fonts only change the glyphs, not the work done;
+    # spawned rendering processes read the filter from the environment
+    warnings.simplefilter("ignore", UserWarning)
+    os.environ["PYTHONWARNINGS"] = "ignore::UserWarning"
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+
+    df = concat_dataframes(
+        list(
+            iter_song_batches(
+                generate_songs(args.songs, args.lines), romanizer=SUDACHI_ENGINE
+            )
+        )
+    )
+    chart_data = {
+        "top_morphemes": df,
+        "pos_distribution": df,
+        "morpheme_song_heatmap": df,
+    }
+    print(f"songs: {args.songs}, rows: {len(df)}, CPUs: {os.cpu_count()}")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            runs = {
+                "serial": time_render(chart_data, 1),
+                "pool (cold)": time_render(chart_data, args.workers),
+                "pool (warm)": time_render(chart_data, args.workers),
+            }
+        finally:
+            shutdown_render_pool()
+            os.chdir(cwd)
+
+    for name, (seconds, render_seconds) in runs.items():
+        charts = ", ".join(
+            f"{os.path.basename(path)} {chart_seconds * 1000:.0f} ms"
+            for path, chart_seconds in render_seconds.items()
+        )
+        print(f"{name:<12} {seconds * 1000:>8.0f} ms  ({charts})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare rows/sec of the Morpheme table load methods: PostgreSQL COPY,
+batched executemany and pandas to_sql.
+
+COPY is only measured when a PostgreSQL URL is given.
+
+Usage: python -m benchmarks.bench_save_to_db --rows 100000 [--db-url postgresql://...]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from morphemes_extractor.db_func import (
+    COPY_LOAD_METHOD,
+    EXECUTEMANY_LOAD_METHOD,
+    TO_SQL_LOAD_METHOD,
+    write_batches,
+)
+
+
+def generate_rows(row_count: int) -> pd.DataFrame:
+    """
+    Generate a Morpheme table shaped DataFrame.
+    :param row_count: Number of rows.
+    :return: DataFrame.
+    """
+    morphemes = ["夜", "駆ける", "君", "僕", "空", "見る", "行く", "今日"]
+    return pd.DataFrame(
+        {
+            "Morpheme": [morphemes[i % len(morphemes)] for i in range(row_count)],
+            "Romanji": [f"Romanji{i % 100}" for i in range(row_count)],
+            "Part_of_Speech": ["Noun"] * row_count,
+            "Song": [f"Song {i % 50}" for i in range(row_count)],
+            "Song_Romanji": [f"Song Romanji {i % 50}" for i in range(row_count)],
+            "Timestamp": "2024-01-01 00:00:00",
+        }
+    )
+
+
+def time_load(db_url: str, df: pd.DataFrame, batch_size: int, method: str) -> float:
+    """
+    Load the rows into a fresh Morpheme table.
+    :param db_url: SQLAlchemy database URL.
+    :param df: DataFrame to load.
+    :param batch_size: Rows per batch.
+    :param method: Load method.
+    :return: Rows per second.
+    """
+    batches = [df.iloc[i : i + batch_size] for i in range(0, len(df), batch_size)]
+    engine = create_engine(db_url)
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        write_batches(conn, batches, replace=True, method=method)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return len(df) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--db-url", help="Database URL, defaults to a SQLite file")
+    args = parser.parse_args()
+
+    df = generate_rows(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_url = args.db_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        methods = [EXECUTEMANY_LOAD_METHOD, TO_SQL_LOAD_METHOD]
+        if db_url.startswith("postgresql"):
+            methods.insert(0, COPY_LOAD_METHOD)
+
+        print(f"rows: {args.rows}, batch size: {args.batch_size}")
+        for method in methods:
+            rows_per_sec = time_load(db_url, df, args.batch_size, method)
+            print(f"{method:<12} {rows_per_sec:>12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
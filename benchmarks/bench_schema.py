@@ -0,0 +1,77 @@
+"""
+Compare the flat Morpheme table with the normalized schema on SQLite:
+database file size and the time of the top-morphemes GROUP BY query.
+
+Usage: python -m benchmarks.bench_schema --songs 500
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.corpus import generate_songs
+from morphemes_extractor.data_extractor import iter_song_batches
+from morphemes_extractor.db_engine import dispose_engines
+from morphemes_extractor.db_func import FLAT_SCHEMA, NORMALIZED_SCHEMA, save_to_db
+from morphemes_extractor.romanizer import SUDACHI_ENGINE
+
+TOP_MORPHEMES_QUERIES = {
+    FLAT_SCHEMA: """
+    SELECT "Morpheme", COUNT(*) AS "Count" FROM "Morpheme"
+    GROUP BY "Morpheme" ORDER BY "Count" DESC LIMIT 20
+    """,
+    NORMALIZED_SCHEMA: """
+    SELECT l."Morpheme", SUM(o."Count") AS "Count"
+    FROM (
+        SELECT "Lexeme_ID", COUNT(*) AS "Count" FROM "Occurrence" GROUP BY "Lexeme_ID"
+    ) o
+    JOIN "Lexeme" l ON l."Lexeme_ID" = o."Lexeme_ID"
+    GROUP BY l."Morpheme" ORDER BY "Count" DESC LIMIT 20
+    """,
+}
+
+
+def time_query(db_url: str, query: str, repeat: int = 5) -> float:
+    """
+    Time a query.
+    :param db_url: SQLAlchemy database URL.
+    :param query: SQL query.
+    :param repeat: Number of runs; the fastest one is reported.
+    :return: Seconds.
+    """
+    timings = []
+    with create_engine(db_url).connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(query)).fetchall()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--songs", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+
+    songs = generate_songs(args.songs, args.lines)
+    batches = list(iter_song_batches(songs, romanizer=SUDACHI_ENGINE))
+    rows = sum(len(batch) for batch in batches)
+    print(f"songs: {args.songs}, rows: {rows}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for schema in (FLAT_SCHEMA, NORMALIZED_SCHEMA):
+            db_path = Path(tmp_dir) / f"{schema}.db"
+            db_url = f"sqlite:///{db_path}"
+            save_to_db(batches, db_url, schema=schema)
+            dispose_engines()
+            size_mb = db_path.stat().st_size / 1024 / 1024
+            query_ms = time_query(db_url, TOP_MORPHEMES_QUERIES[schema]) * 1000
+            print(f"{schema:<11} {size_mb:>8.2f} MB {query_ms:>10.2f} ms top morphemes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Measure the API cold start: the import time of main from `python -X importtime`,
+with the slowest modules, and the time to first byte of a freshly started server.
+Exits with status 1 when a --max-import-ms or --max-ttfb-ms budget is exceeded,
+so import regressions fail a CI step.
+
+Usage: python -m benchmarks.bench_startup --runs 3 --max-import-ms 1500
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+# Served by the API without touching the database or the extraction pipeline
+TTFB_PATH = "/db-pool/"
+STARTUP_TIMEOUT_SECONDS = 60.0
+
+
+def measure_imports(module: str) -> dict[str, int]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+    :param module: Module name.
+    :return: Cumulative import time in microseconds of every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def measure_ttfb() -> float:
+    """
+    Start the API with uvicorn and poll it until the first response.
+    :return: Seconds from starting the server process to the first response byte.
+    """
+    port = get_free_port()
+    url = f"http://127.0.0.1:{port}{TTFB_PATH}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=REPO_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    try:
+        while time.perf_counter() - start < STARTUP_TIMEOUT_SECONDS:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    response.read(1)
+                    return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                if server.poll() is not None:
+                    raise RuntimeError("The API server exited during startup")
+                time.sleep(0.005)
+        raise RuntimeError("The API server did not respond")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float)
+    parser.add_argument("--max-ttfb-ms", type=float)
+    args = parser.parse_args()
+
+    import_runs = [measure_imports("main") for _ in range(args.runs)]
+    import_ms = statistics.median(run["main"] for run in import_runs) / 1000
+    ttfb_ms = statistics.median(measure_ttfb() for _ in range(args.runs)) * 1000
+
+    print(f"import main: {import_ms:>8.1f} ms (median of {args.runs})")
+    print(f"time to first byte: {ttfb_ms:>8.1f} ms (median of {args.runs})")
+    print("slowest imports (cumulative, last run):")
+    slowest = sorted(import_runs[-1].items(), key=lambda item: item[1], reverse=True)
+    for name, cumulative_us in slowest[1 : args.top + 1]:
+        print(f"  {name:<40} {cumulative_us / 1000:>8.1f} ms")
+
+    over_budget = [
+        f"{name} {value:.1f} ms > {budget:.1f} ms"
+        for name, value, budget in (
+            ("import main", import_ms, args.max_import_ms),
+            ("time to first byte", ttfb_ms, args.max_ttfb_ms),
+        )
+        if budget is not None and value > budget
+    ]
+    if over_budget:
+        print("Over budget: " + "; ".join(over_budget))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
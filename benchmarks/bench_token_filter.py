@@ -0,0 +1,117 @@
+"""
+Compare the per-morpheme filtering of tokenized lyrics by Japanese part of speech
+and per-word string checks against filter_morphemes, which excludes parts of speech
+by POS id and classifies the dictionary forms with one precompiled pattern,
+memoized per dictionary form.
+Both filters run on the same tokenized lyrics and must keep the same morphemes.
+
+Usage: python -m benchmarks.bench_token_filter --songs 200 --lines 40
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from sudachipy import MorphemeList
+
+from benchmarks.corpus import generate_songs
+from morphemes_extractor.data_extractor import (
+    filter_morphemes,
+    get_excluded_pos_dict,
+    get_jp_pos_dict,
+    is_english,
+)
+from morphemes_extractor.tokenizer_provider import get_split_mode, get_tokenizer
+
+
+def filter_by_pos_name(morpheme_list: MorphemeList) -> list[tuple[str, str]]:
+    """
+    Filter morphemes the way tokenize_lyrics did before filter_morphemes.
+    :param morpheme_list: Sudachi morphemes.
+    :return: Kept dictionary forms with their parts of speech.
+    """
+    excluded_jp_pos_tags = get_excluded_pos_dict()
+    jp_pos_tags = get_jp_pos_dict()
+    kept = []
+    for morpheme in morpheme_list:
+        part_of_speech = morpheme.part_of_speech()[0]
+        if part_of_speech in excluded_jp_pos_tags:
+            continue
+        word = morpheme.dictionary_form().strip()
+        if not word or is_english(word) or word.isdigit():
+            continue
+        kept.append((word, jp_pos_tags.get(part_of_speech, part_of_speech)))
+    return kept
+
+
+def filter_by_pos_id(morpheme_list: MorphemeList) -> list[tuple[str, str]]:
+    """
+    Filter morphemes with filter_morphemes.
+    :param morpheme_list: Sudachi morphemes.
+    :return: Kept dictionary forms with their parts of speech.
+    """
+    return [
+        (word, part_of_speech)
+        for _, word, part_of_speech in filter_morphemes(morpheme_list)
+    ]
+
+
+def time_filter(
+    func: Callable[[MorphemeList], list[tuple[str, str]]],
+    morpheme_lists: list[MorphemeList],
+    repeat: int,
+) -> float:
+    """
+    Time a filter over all tokenized lyrics.
+    :param func: Filter function.
+    :param morpheme_lists: Tokenized lyrics.
+    :param repeat: Number of runs; the fastest is kept.
+    :return: Seconds of the fastest run.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for morpheme_list in morpheme_lists:
+            func(morpheme_list)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--songs", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokenizer_obj = get_tokenizer()
+    mode = get_split_mode()
+    start = time.perf_counter()
+    morpheme_lists = [
+        tokenizer_obj.tokenize(song["lyrics"], mode)
+        for song in generate_songs(args.songs, args.lines)
+    ]
+    tokenize_seconds = time.perf_counter() - start
+    morpheme_count = sum(len(morpheme_list) for morpheme_list in morpheme_lists)
+
+    # The check also builds the POS table and caches the word classifications,
+    # as the first songs of an extraction run do
+    for morpheme_list in morpheme_lists:
+        if filter_by_pos_id(morpheme_list) != filter_by_pos_name(morpheme_list):
+            raise AssertionError("The filters kept different morphemes")
+
+    print(f"{args.songs} songs, {morpheme_count} morphemes")
+    print(f"  {'tokenize (reference)':<24} {tokenize_seconds * 1000:>10.1f} ms")
+    for name, func in (
+        ("filter by POS name", filter_by_pos_name),
+        ("filter by POS id", filter_by_pos_id),
+    ):
+        seconds = time_filter(func, morpheme_lists, args.repeat)
+        print(
+            f"  {name:<24} {seconds * 1000:>10.1f} ms"
+            f" {seconds * 1e9 / morpheme_count:>8.0f} ns/morpheme"
+        )
+
+
+if __name__ == "__main__":
+    main()
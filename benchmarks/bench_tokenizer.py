@@ -0,0 +1,76 @@
+"""
+Compare the per-song tokenization cost of creating a Sudachi dictionary per call
+against the shared tokenizer provider.
+
+Usage: python -m benchmarks.bench_tokenizer --songs 20
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from sudachipy import dictionary
+
+from benchmarks.corpus import generate_songs
+from morphemes_extractor.tokenizer_provider import (
+    get_split_mode,
+    get_tokenizer,
+    reset_tokenizer,
+)
+
+
+def tokenize_per_call(lyrics: str) -> int:
+    """
+    Tokenize lyrics the way the extractor did before the shared provider:
+    one dictionary for the morphemes and another one for the part of speech.
+    :param lyrics: Lyrics.
+    :return: Number of morphemes.
+    """
+    mode = get_split_mode()
+    morphemes = dictionary.Dictionary().create().tokenize(lyrics, mode)
+    dictionary.Dictionary().create().tokenize(lyrics, mode)
+    return len(morphemes)
+
+
+def tokenize_shared(lyrics: str) -> int:
+    """
+    Tokenize lyrics with the shared tokenizer.
+    :param lyrics: Lyrics.
+    :return: Number of morphemes.
+    """
+    return len(get_tokenizer().tokenize(lyrics, get_split_mode()))
+
+
+def time_per_song(func: Callable[[str], int], lyrics_list: list[str]) -> float:
+    """
+    Time a tokenize function over all lyrics.
+    :param func: Tokenize function.
+    :param lyrics_list: List of lyrics.
+    :return: Average seconds per song.
+    """
+    start = time.perf_counter()
+    for lyrics in lyrics_list:
+        func(lyrics)
+    return (time.perf_counter() - start) / len(lyrics_list)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--songs", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+
+    lyrics_list = [song["lyrics"] for song in generate_songs(args.songs, args.lines)]
+
+    per_call = time_per_song(tokenize_per_call, lyrics_list)
+    reset_tokenizer()
+    shared = time_per_song(tokenize_shared, lyrics_list)
+
+    print(f"songs: {args.songs}, lines per song: {args.lines}")
+    print(f"dictionary per call: {per_call * 1000:.2f} ms/song")
+    print(f"shared tokenizer:    {shared * 1000:.2f} ms/song")
+    print(f"speedup:             {per_call / shared:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Synthetic lyrics for benchmarks.
+"""
+
+import json
+import random
+from pathlib import Path
+
+from morphemes_extractor.json_utils import SONGS_KEY
+
+# Lyric lines mixing particles, auxiliaries, kanji, katakana, English and numbers
+LYRIC_LINES = [
+    "ふざけあっても 分かり合えた気がした",
+    "嗚呼いつもの様に 過ぎる日々にあくびが出る",
+    "夜に駆ける 君の手を握って",
+    "沈むように溶けてゆくように",
+    "二人だけの空が広がる夜に",
+    "知らず知らず隠してた 本当の声を響かせてよ",
+    "好きなものを好きだと言う 怖くて仕方ないけど",
+    "眩しい光に 目を細めて笑った",
+    "Hello 明日の僕へ 123 回目の朝",
+    "忘れないでいて 心の奥で鳴り続ける音",
+    "さよならだけが 人生だなんて言わないで",
+    "もう一度だけ 君に会いたいと願った",
+]
+
+
+def generate_lyrics(rng: random.Random, line_count: int = 40) -> str:
+    """
+    Generate synthetic lyrics.
+    :param rng: Random number generator.
+    :param line_count: Number of lines.
+    :return: Lyrics as a single string.
+    """
+    return "\n".join(rng.choice(LYRIC_LINES) for _ in range(line_count))
+
+
+def generate_songs(
+    song_count: int, line_count: int = 40, seed: int = 0
+) -> list[dict[str, str]]:
+    """
+    Generate synthetic songs in the lyrics JSON shape.
+    :param song_count: Number of songs.
+    :param line_count: Number of lines per song.
+    :param seed: Random seed.
+    :return: List of songs.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"テスト曲{i}",
+            "romanji_title": f"Tesuto Kyoku {i}",
+            "lyrics": generate_lyrics(rng, line_count),
+        }
+        for i in range(song_count)
+    ]
+
+
+def write_lyrics_files(
+    songs: list[dict[str, str]], lyrics_dir: Path, songs_per_file: int = 1000
+) -> list[str]:
+    """
+    Write songs as lyrics JSON files in the lyrics/template.json shape.
+    :param songs: List of songs.
+    :param lyrics_dir: Directory to write the files to.
+    :param songs_per_file: Maximum number of songs per file.
+    :return: Paths of the written files.
+    """
+    lyrics_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for start in range(0, len(songs), songs_per_file):
+        path = lyrics_dir / f"songs_{start // songs_per_file:05d}.json"
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {SONGS_KEY: songs[start : start + songs_per_file]},
+                file,
+                ensure_ascii=False,
+            )
+        paths.append(str(path))
+    return paths
@@ -0,0 +1,400 @@
+"""
+Benchmark every pipeline stage on synthetic lyrics at several corpus sizes,
+write the timings to a JSON file, and compare them with a stored baseline.
+
+Stages, timed separately for each corpus size:
+- load_json: reading the lyrics JSON files
+- tokenize: Sudachi analysis of the lyrics
+- pos: the rest of tokenize_lyrics, which filters the morphemes and tags their
+  part of speech and reading in the same pass as the analysis
+- romanize: romanizing the morphemes with cold caches
+- transform: transform_data_to_df per song and concat_dataframes
+- save_to_db: save_to_db into a new SQLite database
+- chart_data: the chart queries of the visualizations
+- save_to_parquet, parquet_chart_data: save_to_parquet, then loading the charted
+  columns of the dataset and counting them
+- plot_*: each plot function on the chart data
+
+Usage:
+    python -m benchmarks.suite run --songs 10 1000 --output results.json
+    python -m benchmarks.suite run --songs 10 1000 100000 --compare baseline.json
+    python -m benchmarks.suite compare results.json baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from benchmarks.corpus import generate_songs, write_lyrics_files
+from morphemes_extractor.chart_data import (
+    load_pos_counts,
+    load_top_morpheme_song_counts,
+    load_top_morphemes,
+)
+from morphemes_extractor.data_extractor import (
+    extract_romanji_from_jp_characters,
+    extract_romanji_from_readings,
+    get_morpheme_batch_size,
+    get_song_list,
+    tokenize_lyrics,
+)
+from morphemes_extractor.data_transformer import concat_dataframes, transform_data_to_df
+from morphemes_extractor.db_engine import dispose_engines
+from morphemes_extractor.db_func import save_to_db
+from morphemes_extractor.exporters import save_to_parquet
+from morphemes_extractor.jobs import utc_now
+from morphemes_extractor.jp_data import TokenizedLyrics
+from morphemes_extractor.json_utils import load_json
+from morphemes_extractor.romanizer import (
+    SUDACHI_ENGINE,
+    clear_romanization_cache,
+    get_romanizer_engine,
+)
+from morphemes_extractor.tokenizer_provider import get_split_mode, get_tokenizer
+from visualize import (
+    CHART_COLUMNS,
+    aggregate_chart_data,
+    load_morpheme_dataset,
+    plot_morpheme_song_heatmap,
+    plot_pos_distribution,
+    plot_top_morphemes,
+    setup_visualization,
+)
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+# load_json only reads files inside the lyrics directory
+LYRICS_DIR = REPO_DIR / "lyrics"
+DEFAULT_SCALES = [10, 1000]
+DEFAULT_OUTPUT = "benchmark_results.json"
+# A stage regresses when it is this much slower than the baseline...
+DEFAULT_THRESHOLD = 0.2
+# ...and slower by at least this many seconds, to ignore noise on tiny stages
+DEFAULT_MIN_SECONDS = 0.01
+
+
+@dataclass
+class Regression:
+    scale: str
+    stage: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline_seconds if self.baseline_seconds else 0.0
+
+
+class StageTimer:
+    """
+    Collect the seconds spent in each stage, keeping the fastest of the repeats.
+    """
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] = min(seconds, self.seconds.get(stage, seconds))
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.record(stage, time.perf_counter() - start)
+
+
+def get_git_commit() -> str | None:
+    """
+    Get the commit the benchmark runs on.
+    :return: Commit hash, or None outside a git checkout.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_pipeline(
+    json_paths: list[str], romanizer: str, timer: StageTimer
+) -> dict[str, int]:
+    """
+    Run every stage once on the lyrics files.
+    :param json_paths: Paths of the lyrics JSON files.
+    :param romanizer: Romanization engine name.
+    :param timer: Collects the stage timings.
+    :return: Numbers of songs and morpheme rows.
+    """
+    with timer.time("load_json"):
+        song_list = get_song_list(load_json(json_paths))
+
+    tokenizer_obj = get_tokenizer()
+    mode = get_split_mode()
+    with timer.time("tokenize"):
+        for song in song_list:
+            tokenizer_obj.tokenize(song["lyrics"], mode)
+    start = time.perf_counter()
+    tokenized_songs: list[TokenizedLyrics] = [
+        tokenize_lyrics(song["lyrics"]) for song in song_list
+    ]
+    tokenize_lyrics_seconds = time.perf_counter() - start
+    timer.record("pos", max(tokenize_lyrics_seconds - timer.seconds["tokenize"], 0.0))
+
+    clear_romanization_cache()
+    with timer.time("romanize"):
+        if romanizer == SUDACHI_ENGINE:
+            romanized_songs = [
+                extract_romanji_from_readings(
+                    tokenized.readings, tokenized.part_of_speech_list
+                )
+                for tokenized in tokenized_songs
+            ]
+        else:
+            romanized_songs = [
+                extract_romanji_from_jp_characters(tokenized.morphemes)
+                for tokenized in tokenized_songs
+            ]
+
+    with timer.time("transform"):
+        df = concat_dataframes(
+            [
+                transform_data_to_df(
+                    tokenized.morphemes,
+                    romanized,
+                    tokenized.part_of_speech_list,
+                    song["title"],
+                    song["romanji_title"],
+                )
+                for song, tokenized, romanized in zip(
+                    song_list, tokenized_songs, romanized_songs
+                )
+            ]
+        )
+
+    batch_size = get_morpheme_batch_size()
+
+    def iter_batches() -> Iterator[pd.DataFrame]:
+        return (df.iloc[i : i + batch_size] for i in range(0, len(df), batch_size))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_url = f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        with timer.time("save_to_db"):
+            save_to_db(iter_batches(), db_url)
+        with timer.time("chart_data"):
+            chart_data = (
+                load_top_morphemes(db_url),
+                load_pos_counts(db_url),
+                load_top_morpheme_song_counts(db_url),
+            )
+        dispose_engines()
+        dataset_dir = str(Path(tmp_dir) / "morphemes")
+        with timer.time("save_to_parquet"):
+            save_to_parquet(iter_batches(), dataset_dir)
+        with timer.time("parquet_chart_data"):
+            aggregate_chart_data(
+                load_morpheme_dataset(dataset_dir, columns=CHART_COLUMNS)
+            )
+
+        font_sizes = setup_visualization(2.0)
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            plots: dict[str, Callable[[pd.DataFrame], str]] = {
+                "plot_top_morphemes": lambda d: plot_top_morphemes(d, font_sizes),
+                "plot_pos_distribution": lambda d: plot_pos_distribution(d, font_sizes),
+                "plot_morpheme_song_heatmap": lambda d: plot_morpheme_song_heatmap(
+                    d, font_sizes
+                ),
+            }
+            for (stage, plot), data in zip(plots.items(), chart_data):
+                with timer.time(stage):
+                    plot(data)
+        finally:
+            os.chdir(cwd)
+
+    return {"songs": len(song_list), "rows": len(df)}
+
+
+def run_benchmarks(
+    scales: list[int], lines: int, repeat: int, romanizer: str
+) -> dict[str, Any]:
+    """
+    Benchmark the stages at each corpus size.
+    :param scales: Numbers of songs.
+    :param lines: Number of lyric lines per song.
+    :param repeat: Runs per corpus size; the fastest time of each stage is kept.
+    :param romanizer: Romanization engine name.
+    :return: Benchmark results with the environment they ran in.
+    """
+    results: dict[str, Any] = {}
+    for song_count in scales:
+        songs = generate_songs(song_count, lines)
+        timer = StageTimer()
+        with tempfile.TemporaryDirectory(dir=LYRICS_DIR, prefix=".bench-") as tmp:
+            json_paths = write_lyrics_files(songs, Path(tmp))
+            for _ in range(repeat):
+                counts = run_pipeline(json_paths, romanizer, timer)
+        results[str(song_count)] = {**counts, "stages": timer.seconds}
+        print_results(str(song_count), results[str(song_count)])
+    return {
+        "meta": {
+            "created_at": utc_now(),
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "lines_per_song": lines,
+            "repeat": repeat,
+            "romanizer": romanizer,
+        },
+        "results": results,
+    }
+
+
+def print_results(scale: str, result: dict[str, Any]) -> None:
+    print(f"{scale} songs, {result['rows']} rows")
+    for stage, seconds in result["stages"].items():
+        per_song_ms = seconds * 1000 / max(result["songs"], 1)
+        print(f"  {stage:<28} {seconds * 1000:>12.1f} ms {per_song_ms:>10.3f} ms/song")
+
+
+def compare_results(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+) -> list[Regression]:
+    """
+    Find the stages that got slower than in the baseline.
+    Only corpus sizes and stages present in both results are compared.
+    :param results: Benchmark results.
+    :param baseline: Baseline benchmark results.
+    :param threshold: Relative slowdown above which a stage regresses.
+    :param min_seconds: Absolute slowdown below which a stage does not regress.
+    :return: Regressions, in the order of the results.
+    """
+    regressions = []
+    for scale, result in results["results"].items():
+        baseline_stages = baseline["results"].get(scale, {}).get("stages", {})
+        for stage, seconds in result["stages"].items():
+            if stage not in baseline_stages:
+                continue
+            baseline_seconds = baseline_stages[stage]
+            if (
+                seconds > baseline_seconds * (1 + threshold)
+                and seconds - baseline_seconds >= min_seconds
+            ):
+                regressions.append(Regression(scale, stage, baseline_seconds, seconds))
+    return regressions
+
+
+def report_comparison(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+    min_seconds: float,
+) -> int:
+    """
+    Print the stage timings next to the baseline and flag regressions.
+    :return: Exit status, 1 if any stage regressed.
+    """
+    regressions = compare_results(results, baseline, threshold, min_seconds)
+    flagged = {(r.scale, r.stage) for r in regressions}
+    print(f"Compared with baseline from commit {baseline['meta'].get('commit')}:")
+    for scale, result in results["results"].items():
+        baseline_stages = baseline["results"].get(scale, {}).get("stages", {})
+        for stage, seconds in result["stages"].items():
+            if stage not in baseline_stages:
+                continue
+            baseline_seconds = baseline_stages[stage]
+            change = (seconds / baseline_seconds - 1) * 100 if baseline_seconds else 0.0
+            flag = "  REGRESSION" if (scale, stage) in flagged else ""
+            print(
+                f"  {scale:>7} {stage:<28} {baseline_seconds * 1000:>10.1f} ms"
+                f" -> {seconds * 1000:>10.1f} ms {change:>+7.1f}%{flag}"
+            )
+    if regressions:
+        print(f"{len(regressions)} stage(s) regressed by more than {threshold:.0%}")
+        return 1
+    return 0
+
+
+def read_results(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        results: dict[str, Any] = json.load(file)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--songs", type=int, nargs="+", default=DEFAULT_SCALES)
+    run_parser.add_argument("--lines", type=int, default=40)
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--romanizer", default=None)
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    run_parser.add_argument("--compare", metavar="BASELINE")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare stored results")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("baseline")
+
+    for sub_parser in (run_parser, compare_parser):
+        sub_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+        sub_parser.add_argument(
+            "--min-seconds", type=float, default=DEFAULT_MIN_SECONDS
+        )
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        sys.exit(
+            report_comparison(
+                read_results(args.results),
+                read_results(args.baseline),
+                args.threshold,
+                args.min_seconds,
+            )
+        )
+
+    # Keep the output to the timings; missing CJK fonts only change the glyphs
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore", UserWarning)
+    results = run_benchmarks(
+        args.songs, args.lines, args.repeat, get_romanizer_engine(args.romanizer)
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        sys.exit(
+            report_comparison(
+                results, read_results(args.compare), args.threshold, args.min_seconds
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
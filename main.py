@@ -1,33 +1,63 @@
 import os
+import itertools
 import logging
+import sys
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
 
-from morphemes_extractor.data_extractor import get_morphemes_from_songs
-from morphemes_extractor.db_func import save_to_db
-from morphemes_extractor.json_utils import find_json_files
+from morphemes_extractor.db_engine import (
+    DB_URL_ENV,
+    dispose_engines,
+    get_engine,
+    get_pool_stats,
+)
+from morphemes_extractor.incremental import plan_incremental_update
+from morphemes_extractor.jobs import Job, JobManager
+from morphemes_extractor.json_utils import find_json_files, load_songs
 from morphemes_extractor.logger_config import setup_logger
-from visualize import (
-    load_morpheme_table,
-    plot_morpheme_song_heatmap,
-    plot_pos_distribution,
-    plot_top_morphemes,
-    setup_visualization,
+from morphemes_extractor.metrics import CONTENT_TYPE, expose, snapshot, summarize
+from morphemes_extractor.warmup import (
+    CANARY_STEP,
+    DB_ENGINE_STEP,
+    FONTS_STEP,
+    ROMANIZER_STEP,
+    TOKENIZER_STEP,
+    WarmUp,
+    get_warmup_steps,
+    warm_up_canary,
+    warm_up_db_engine,
+    warm_up_romanizer,
+    warm_up_tokenizer,
 )
 
+# pandas, Sudachi, Cutlet, matplotlib and seaborn are imported by the endpoints
+# that use them, so the API starts without loading them
+
 # Set up logger
 logger: logging.Logger = setup_logger(__name__, logging.WARNING)
 
 load_dotenv()
 
-app = FastAPI()
+# Runs the work submitted through the /jobs/ endpoints
+job_manager = JobManager()
+# Started by the lifespan; /health/ reports ready once it has finished
+warm_up = WarmUp()
 
 
 def get_db_url() -> str:
     """
-    Construct the database URL from environment variables.
-    Required environment variables: DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
+    Get the database URL from the DB_URL environment variable, e.g.
+    sqlite:///morphemes.db for a local SQLite database, or construct
+    the PostgreSQL URL from environment variables.
+    Required environment variables without DB_URL: DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
     """
+    db_url = os.getenv(DB_URL_ENV)
+    if db_url:
+        return db_url
     db_user = os.getenv("DB_USER")
     db_password = os.getenv("DB_PASSWORD")
     db_host = os.getenv("DB_HOST")
@@ -51,12 +81,91 @@ def get_db_url() -> str:
     return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 
 
-@app.post("/extract-morphemes/")
-def extract_morphemes_api() -> dict[str, str | int]:
+def warm_up_fonts() -> None:
+    """
+    Prime matplotlib's font cache for the Japanese chart font.
+    """
+    from visualize import prime_font_cache
+
+    prime_font_cache()
+
+
+def get_warmup_tasks(steps: list[str]) -> dict[str, Callable[[], Any]]:
+    """
+    Get the functions of the warm-up steps, in the order of the steps.
+    """
+    tasks: dict[str, Callable[[], Any]] = {
+        TOKENIZER_STEP: warm_up_tokenizer,
+        ROMANIZER_STEP: warm_up_romanizer,
+        DB_ENGINE_STEP: lambda: warm_up_db_engine(get_db_url()),
+        FONTS_STEP: warm_up_fonts,
+        CANARY_STEP: warm_up_canary,
+    }
+    return {step: tasks[step] for step in steps}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Create the shared database engine and start the warm-up at startup,
+    and dispose the pools at shutdown.
+    """
+    try:
+        get_engine(get_db_url())
+    except RuntimeError as e:
+        logger.warning(f"Database engine not created at startup: {e}")
+    # Requests are served during the warm-up; /health/ reports when it is done
+    warm_up.start(get_warmup_tasks(get_warmup_steps()))
+    yield
+    job_manager.shutdown()
+    if "visualize" in sys.modules:
+        from visualize import shutdown_render_pool
+
+        shutdown_render_pool()
+    dispose_engines()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def run_extraction(incremental: bool, job: Job | None = None) -> dict[str, Any]:
     """
     Extract morphemes from JSON files and save to database.
+    :param incremental: Only process songs added or changed since the previous
+    incremental run, and delete rows of removed songs.
+    :param job: If given, progress is reported to the job and the run stops
+    when the job is cancelled.
+    :return: Summary of the rows saved and the metrics of the run.
     """
-    db_url = get_db_url()
+    from morphemes_extractor.data_extractor import (
+        iter_morpheme_batches,
+        iter_song_batches,
+    )
+    from morphemes_extractor.db_func import (
+        load_song_hashes,
+        save_incremental_to_db,
+        save_to_db,
+    )
+    from morphemes_extractor.exporters import (
+        PARQUET_STORE,
+        get_morpheme_store,
+        get_parquet_dir,
+        save_to_parquet,
+    )
+
+    # Jobs report each song and each written batch; the plain endpoint does not
+    progress: dict[str, Any] = (
+        {} if job is None else {"progress": job.set_songs_processed}
+    )
+    metrics_before = snapshot()
+    to_parquet = get_morpheme_store() == PARQUET_STORE
+    if to_parquet and incremental:
+        raise HTTPException(
+            status_code=400,
+            detail="Incremental extraction needs the database morpheme store.",
+        )
+    # The Parquet store needs no database
+    db_url = None if to_parquet else get_db_url()
     json_dir = os.getenv("JSON_DIR")
     if not json_dir:
         logger.error("JSON_DIR enviroment viable not provided.")
@@ -71,44 +180,253 @@ def extract_morphemes_api() -> dict[str, str | int]:
             status_code=404, detail="No JSON files found in the specified directory."
         )
 
-    df = get_morphemes_from_songs(json_file_path_list)
-    if df.empty:
+    if incremental:
+        assert db_url is not None
+        # Planning hashes every song, so the files are read up front, concurrently
+        song_list = load_songs(json_file_path_list)
+        try:
+            plan = plan_incremental_update(song_list, load_song_hashes(db_url))
+        except ValueError as e:
+            logger.error(f"Cannot plan incremental update: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        batches = iter_song_batches(plan.songs_to_process, **progress)
+        if job is not None:
+            batches = job.track_batches(batches)
+        rows_saved = save_incremental_to_db(batches, plan, db_url)
+        return {
+            "message": "Morphemes extracted incrementally and saved to database.",
+            "rows_saved": rows_saved,
+            "songs_skipped": len(plan.skipped),
+            "songs_updated": len(plan.updated),
+            "songs_deleted": len(plan.deleted),
+            "metrics": summarize(metrics_before),
+        }
+
+    # Stream row batches into the database instead of building one DataFrame
+    batches = iter_morpheme_batches(json_file_path_list, **progress)
+    if job is not None:
+        batches = job.track_batches(batches)
+    first_batch = next(batches, None)
+    if first_batch is None:
         logger.warning("No morphemes found in the JSON files.")
         raise HTTPException(
             status_code=404, detail="No morphemes found in the JSON files."
         )
 
-    save_to_db(df, db_url)
+    batches = itertools.chain([first_batch], batches)
+    if to_parquet:
+        parquet_dir = get_parquet_dir()
+        rows_saved = save_to_parquet(batches, parquet_dir)
+        return {
+            "message": f"Morphemes extracted and saved to {parquet_dir}.",
+            "rows_saved": rows_saved,
+            "metrics": summarize(metrics_before),
+        }
+    assert db_url is not None
+    rows_saved = save_to_db(batches, db_url)
     return {
         "message": "Morphemes extracted and saved to database.",
-        "rows_saved": len(df),
+        "rows_saved": rows_saved,
+        "metrics": summarize(metrics_before),
     }
 
 
-@app.post("/visualize/")
-def make_visualizations(font_scale: float = 2.0) -> dict[str, str | list[str]]:
+@app.post("/extract-morphemes/")
+def extract_morphemes_api(incremental: bool = False) -> dict[str, Any]:
     """
-    Generate and save visualizations from morpheme data in the database.
-    Returns a JSON response with the output file paths.
+    Extract morphemes from JSON files and save to database.
+    With incremental=true, only songs added or changed since the previous
+    incremental run are processed, and rows of removed songs are deleted.
+    """
+    return run_extraction(incremental)
+
+
+def run_visualization(font_scale: float, job: Job | None = None) -> dict[str, Any]:
+    """
+    Generate and save visualizations from morpheme data in the database,
+    or in the Parquet dataset with the parquet morpheme store.
+    :param font_scale: Font scale of the plots.
+    :param job: If given, the run stops before rendering when the job is cancelled.
+    :return: Output file paths, the render time of each plot, the plots
+    restored from the render cache and the metrics of the run.
     """
-    font_sizes = setup_visualization(font_scale)
-    db_url = get_db_url()
-    df = load_morpheme_table(db_url)
+    from morphemes_extractor.chart_data import (
+        load_pos_counts,
+        load_top_morpheme_song_counts,
+        load_top_morphemes,
+    )
+    from morphemes_extractor.exporters import (
+        PARQUET_STORE,
+        get_morpheme_store,
+        get_parquet_dir,
+    )
+    from visualize import (
+        CHART_COLUMNS,
+        aggregate_chart_data,
+        load_morpheme_dataset,
+        render_charts,
+    )
+
+    metrics_before = snapshot()
     logger.info(f"Generating visualizations with font scale: {font_scale}...")
-    plot_top_morphemes(df, font_sizes)
-    plot_pos_distribution(df, font_sizes)
-    plot_morpheme_song_heatmap(df, font_sizes_or_top_n=font_sizes)
+    if get_morpheme_store() == PARQUET_STORE:
+        # Only the charted columns are read from the dataset, then counted
+        chart_data = aggregate_chart_data(
+            load_morpheme_dataset(get_parquet_dir(), columns=CHART_COLUMNS)
+        )
+    else:
+        # The database groups, orders and limits the counts; only the plotted rows are read
+        db_url = get_db_url()
+        chart_data = {
+            "top_morphemes": load_top_morphemes(db_url),
+            "pos_distribution": load_pos_counts(db_url),
+            "morpheme_song_heatmap": load_top_morpheme_song_counts(db_url),
+        }
+    if job is not None:
+        job.check_cancelled()
+    cached_files: list[str] = []
+    render_seconds = render_charts(chart_data, font_scale, cached=cached_files)
     logger.info(
         "✅ Plots saved successfully:\n"
-        "  - visual_output/top_morphemes.png\n"
-        "  - visual_output/pos_distribution.png\n"
-        "  - visual_output/morpheme_song_heatmap.png"
+        + "\n".join(
+            f"  - {path} ({seconds * 1000:.0f} ms)"
+            for path, seconds in render_seconds.items()
+        )
     )
     return {
         "message": "Plots saved successfully.",
-        "output_files": [
-            "visual_output/top_morphemes.png",
-            "visual_output/pos_distribution.png",
-            "visual_output/morpheme_song_heatmap.png",
-        ],
+        "output_files": list(render_seconds),
+        "render_ms": {
+            path: round(seconds * 1000, 1) for path, seconds in render_seconds.items()
+        },
+        "cached_files": cached_files,
+        "metrics": summarize(metrics_before),
     }
+
+
+@app.post("/visualize/")
+def make_visualizations(font_scale: float = 2.0) -> dict[str, Any]:
+    """
+    Generate and save visualizations from morpheme data in the database.
+    The plots are rendered concurrently in worker processes; plots whose data
+    and font scale are unchanged are restored from the render cache.
+    Returns a JSON response with the output file paths and per-plot render times.
+    """
+    return run_visualization(font_scale)
+
+
+@app.post("/jobs/extract-morphemes/", status_code=202)
+def submit_extraction_job(incremental: bool = False) -> dict[str, Any]:
+    """
+    Submit a morpheme extraction job and return it without waiting for it.
+    An identical pending or running job is returned instead of a new one.
+    """
+    job = job_manager.submit(
+        "extract-morphemes",
+        {"incremental": incremental},
+        lambda job: run_extraction(incremental, job),
+    )
+    return job.to_dict()
+
+
+@app.post("/jobs/visualize/", status_code=202)
+def submit_visualization_job(font_scale: float = 2.0) -> dict[str, Any]:
+    """
+    Submit a visualization job and return it without waiting for it.
+    An identical pending or running job is returned instead of a new one.
+    """
+    job = job_manager.submit(
+        "visualize",
+        {"font_scale": font_scale},
+        lambda job: run_visualization(font_scale, job),
+    )
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str) -> dict[str, Any]:
+    """
+    Report the status, progress and result of a job.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str) -> dict[str, Any]:
+    """
+    Cancel a job. A running job stops at its next song or batch, or before rendering.
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+
+@app.get("/health/", response_model=None)
+def health() -> dict[str, Any] | JSONResponse:
+    """
+    Report readiness: 503 until the startup warm-up has finished, then 200.
+    The status is "degraded" if a warm-up step failed; its error is in "errors".
+    """
+    if not warm_up.ready:
+        state = "warming_up"
+    elif warm_up.errors:
+        state = "degraded"
+    else:
+        state = "ready"
+    status = {"status": state}
+    status.update(warm_up.to_dict())
+    if not warm_up.ready:
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """
+    Expose the pipeline stage metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(expose(), media_type=CONTENT_TYPE)
+
+
+@app.get("/db-pool/")
+def db_pool_stats() -> dict[str, list[dict[str, Any]]]:
+    """
+    Report the connection pool status and checkout latency of the shared engines.
+    """
+    return {"engines": get_pool_stats()}
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, with weak comparison.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+@app.get("/charts/{name}")
+def get_chart(name: str, if_none_match: str | None = Header(default=None)) -> Response:
+    """
+    Serve the latest rendered PNG of a chart, e.g. top_morphemes.
+    The ETag is derived from the file content, so a client sending it back in
+    If-None-Match gets 304 Not Modified until the chart changes.
+    """
+    from visualize import CHART_PLOTTERS, get_chart_path, get_file_etag
+
+    if name not in CHART_PLOTTERS:
+        raise HTTPException(status_code=404, detail=f"Chart not found: {name}")
+    path = get_chart_path(name)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail=f"Chart not rendered yet: {name}")
+    etag = get_file_etag(path)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type="image/png", headers=headers)
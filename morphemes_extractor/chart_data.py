@@ -0,0 +1,123 @@
+"""
+Query the data behind the visualizations.
+
+The counts are grouped, ordered and limited by the database, so only the
+rows a chart shows are transferred. They are read from the aggregate tables
+refreshed at load time, or computed from the Morpheme table when the
+aggregate tables do not exist yet.
+"""
+
+import logging
+
+import pandas as pd
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from morphemes_extractor.db_engine import connect
+from morphemes_extractor.db_func import (
+    AGGREGATE_QUERIES,
+    MORPHEME_COUNT_TABLE,
+    MORPHEME_SONG_COUNT_TABLE,
+    POS_COUNT_TABLE,
+    POSTGRESQL_DIALECT,
+)
+from morphemes_extractor.logger_config import setup_logger
+from morphemes_extractor.sql_query import (
+    select_table_query,
+    top_counts_query,
+    top_morpheme_song_counts_query,
+)
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+# Order ties by code point on PostgreSQL, like SQLite and pandas do
+POSTGRESQL_COLLATION = ' COLLATE "C"'
+
+DEFAULT_TOP_MORPHEMES = 20
+DEFAULT_HEATMAP_TOP_MORPHEMES = 10
+
+
+def get_collation(conn: Connection) -> str:
+    """
+    Get the COLLATE clause that orders text by code point.
+    :param conn: SQLAlchemy connection
+    :return: COLLATE clause, or an empty string if the default order already is
+    """
+    return POSTGRESQL_COLLATION if conn.dialect.name == POSTGRESQL_DIALECT else ""
+
+
+def get_count_query(conn: Connection, table: str) -> str:
+    """
+    Get the query returning the rows of an aggregate count table.
+    :param conn: SQLAlchemy connection
+    :param table: Aggregate table name, a key of AGGREGATE_QUERIES
+    :return: SELECT SQL query on the aggregate table if it exists,
+    else the GROUP BY query on the Morpheme table
+    """
+    if inspect(conn).has_table(table):
+        return select_table_query(table)
+    logger.warning(f"{table} table not found, aggregate the Morpheme table")
+    return AGGREGATE_QUERIES[table]()
+
+
+def load_top_morphemes(db_url: str, top_n: int = DEFAULT_TOP_MORPHEMES) -> pd.DataFrame:
+    """
+    Load the most frequent morphemes.
+    :param db_url: SQLAlchemy database URL
+    :param top_n: Number of morphemes
+    :return: DataFrame with Morpheme and Count columns, most frequent first
+    """
+    try:
+        with connect(db_url) as conn:
+            query = top_counts_query(
+                get_count_query(conn, MORPHEME_COUNT_TABLE),
+                "Morpheme",
+                get_collation(conn),
+            )
+            return pd.read_sql_query(text(query), conn, params={"limit": top_n})
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading top morphemes from database: {e}")
+        raise
+
+
+def load_pos_counts(db_url: str) -> pd.DataFrame:
+    """
+    Load the occurrence count of each part of speech.
+    :param db_url: SQLAlchemy database URL
+    :return: DataFrame with Part_of_Speech and Count columns, most frequent first
+    """
+    try:
+        with connect(db_url) as conn:
+            query = top_counts_query(
+                get_count_query(conn, POS_COUNT_TABLE),
+                "Part_of_Speech",
+                get_collation(conn),
+                limit=False,
+            )
+            return pd.read_sql_query(text(query), conn)
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading part of speech counts from database: {e}")
+        raise
+
+
+def load_top_morpheme_song_counts(
+    db_url: str, top_n: int = DEFAULT_HEATMAP_TOP_MORPHEMES
+) -> pd.DataFrame:
+    """
+    Load the per-song counts of the most frequent morphemes.
+    :param db_url: SQLAlchemy database URL
+    :param top_n: Number of morphemes
+    :return: DataFrame with Morpheme, Song and Count columns
+    """
+    try:
+        with connect(db_url) as conn:
+            query = top_morpheme_song_counts_query(
+                get_count_query(conn, MORPHEME_SONG_COUNT_TABLE),
+                get_count_query(conn, MORPHEME_COUNT_TABLE),
+                get_collation(conn),
+            )
+            return pd.read_sql_query(text(query), conn, params={"limit": top_n})
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading top morpheme song counts from database: {e}")
+        raise
@@ -1,13 +1,43 @@
 import logging
+import multiprocessing
+import os
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict
 import pandas as pd
-from cutlet import cutlet
-from sudachipy import Tokenizer, dictionary, tokenizer
+from functools import lru_cache
+from sudachipy import Morpheme, MorphemeList, Tokenizer
 from typing import Dict, List, Tuple
 
 from morphemes_extractor.logger_config import setup_logger
-from morphemes_extractor.data_transformer import transform_data_to_df
-from morphemes_extractor.json_utils import load_json
-from morphemes_extractor.jp_data import MorphemeData
+from morphemes_extractor.romanizer import (
+    CUTLET_ENGINE,
+    SUDACHI_ENGINE,
+    get_cache_stats,
+    get_cutlet,
+    get_romanizer_engine,
+    romanize,
+    romanize_reading,
+)
+from morphemes_extractor.data_transformer import (
+    concat_dataframes,
+    transform_data_to_df,
+)
+from morphemes_extractor.json_utils import iter_songs
+from morphemes_extractor.jp_data import (
+    CacheStats,
+    MorphemeData,
+    SongTimings,
+    TokenizedLyrics,
+)
+from morphemes_extractor.metrics import record_song
+from morphemes_extractor.tokenizer_provider import (
+    get_dictionary,
+    get_split_mode,
+    get_tokenizer,
+)
 from morphemes_extractor.utils import check_list_len
 
 # Set up logger
@@ -19,6 +49,27 @@ TITLE_KEY = "title"
 ROMANJI_TITLE_KEY = "romanji_title"
 LYRICS_KEY = "lyrics"
 
+# DataFrame attribute holding the romanization cache stats of a run
+ROMANIZATION_CACHE_ATTR = "romanization_cache"
+
+# Environment variable and default for the number of extraction processes
+EXTRACTION_WORKERS_ENV = "EXTRACTION_WORKERS"
+DEFAULT_EXTRACTION_WORKERS = 1
+
+# Environment variable and default for the number of rows per streamed batch
+MORPHEME_BATCH_SIZE_ENV = "MORPHEME_BATCH_SIZE"
+DEFAULT_MORPHEME_BATCH_SIZE = 10000
+
+# Dictionary forms containing an ASCII letter (English words) are dropped after
+# POS filtering, as are blank ones and ones that are all digits once stripped
+EXCLUDED_WORD_PATTERN = re.compile(r"[A-Za-z]")
+# Distinct dictionary forms whose classification is kept; lyrics reuse a small vocabulary
+WORD_CACHE_SIZE = 65536
+
+# Extracted data of a song: morphemes, romanized morphemes, parts of speech,
+# song name and romanized song name
+ExtractedSong = Tuple[List[str], List[str], List[str], str, str]
+
 
 def is_english(word: str) -> bool:
     """
@@ -53,32 +104,135 @@ def extract_morphemes_from_lyrics(lyrics: str) -> list[str]:
     :return: List[String]
     """
     logger.info("Extract words from lyrics...")
+    return tokenize_lyrics(lyrics).morphemes
+
+
+@lru_cache(maxsize=1)
+def get_pos_table() -> tuple[str | None, ...]:
+    """
+    Get the part of speech stored for each POS id of the Sudachi dictionary.
+    Parts of speech without an English translation keep their Japanese tag.
+    :return: English part of speech by POS id, None for excluded parts of speech.
+    """
     excluded_jp_pos_tags = get_excluded_pos_dict()
+    jp_pos_tags = get_jp_pos_dict()
+    pos_table: list[str | None] = []
+    while (pos := get_dictionary().pos_of(len(pos_table))) is not None:
+        part_of_speech = pos[0]
+        pos_table.append(
+            None
+            if part_of_speech in excluded_jp_pos_tags
+            else jp_pos_tags.get(part_of_speech, part_of_speech)
+        )
+    return tuple(pos_table)
 
-    logger.info("Create tokenizer")
-    tokenizer_obj: Tokenizer = dictionary.Dictionary().create()
 
-    logger.info("Use Tokenizer Mode C")
-    mode = tokenizer.Tokenizer.SplitMode.C
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def classify_word(dictionary_form: str) -> str | None:
+    """
+    Classify a dictionary form with EXCLUDED_WORD_PATTERN and str.isdigit.
+    :param dictionary_form: Dictionary form of a morpheme.
+    :return: Stripped dictionary form, or None if it is blank, English or a number.
+    """
+    if EXCLUDED_WORD_PATTERN.search(dictionary_form):
+        return None
+    word = dictionary_form.strip()
+    if not word or word.isdigit():
+        return None
+    return word
 
-    logger.info(
-        "Create words list by adding words into 'words' list if word is not in 'excluded_jp_pos_tags'"
+
+def filter_morphemes(
+    morpheme_list: MorphemeList,
+) -> Iterator[tuple[Morpheme, str, str]]:
+    """
+    Drop whitespace, symbols, adnominals, English words and numbers from tokenized lyrics.
+    Parts of speech are excluded by POS id before any string is read from the morpheme,
+    and the dictionary forms left are checked by classify_word.
+    :param morpheme_list: Sudachi morphemes.
+    :return: Iterator of tuples of the morpheme, its stripped dictionary form
+    and its English part of speech.
+    """
+    pos_table = get_pos_table()
+    for morpheme in morpheme_list:
+        part_of_speech = pos_table[morpheme.part_of_speech_id()]
+        if part_of_speech is None:
+            continue
+        word = classify_word(morpheme.dictionary_form())
+        if word is None:
+            continue
+        yield morpheme, word, part_of_speech
+
+
+def tokenize_lyrics(lyrics: str) -> TokenizedLyrics:
+    """
+    Tokenize the lyrics once and collect each morpheme's dictionary form,
+    part of speech and reading.
+    Remove white space.
+    Exclude English words, Integer, and Japanese Auxiliary Symbols.
+    :param lyrics: String
+    :return: TokenizedLyrics with equal-length morpheme, part of speech and reading lists.
+    """
+    logger.info("Tokenize lyrics...")
+    tokenizer_obj: Tokenizer = get_tokenizer()
+    mode = get_split_mode()
+    logger.info(f"Use Tokenizer Mode {mode}")
+
+    tokenized_lyrics = TokenizedLyrics(
+        morphemes=[], part_of_speech_list=[], readings=[]
     )
-    words = [
-        m.dictionary_form()
-        for m in tokenizer_obj.tokenize(lyrics, mode)
-        if m.part_of_speech()[0] not in excluded_jp_pos_tags
-    ]
+    for morpheme, word, part_of_speech in filter_morphemes(
+        tokenizer_obj.tokenize(lyrics, mode)
+    ):
+        tokenized_lyrics.morphemes.append(word)
+        tokenized_lyrics.part_of_speech_list.append(part_of_speech)
+        tokenized_lyrics.readings.append(get_dictionary_form_reading(morpheme))
 
-    logger.info("Remove newline characters and whitespace")
-    words = [word.strip() for word in words if word.strip()]
+    return tokenized_lyrics
 
-    logger.info("Exclude English words")
-    words = [word for word in words if not is_english(word)]
 
-    logger.info("Exclude Integer")
-    words = [word for word in words if not word.isdigit()]
-    return words
+def get_dictionary_form_reading(morpheme: Morpheme) -> str:
+    """
+    Get the reading of the morpheme's dictionary form.
+    The reading of an inflected morpheme belongs to its surface form,
+    so the dictionary form is looked up in the Sudachi dictionary instead.
+    :param morpheme: Sudachi morpheme.
+    :return: Reading in katakana.
+    """
+    if morpheme.surface() == morpheme.dictionary_form():
+        reading: str = morpheme.reading_form()
+        return reading
+    return lookup_reading(
+        morpheme.dictionary_form(),
+        morpheme.reading_form(),
+        morpheme.part_of_speech()[0],
+    )
+
+
+@lru_cache(maxsize=4096)
+def lookup_reading(
+    dictionary_form: str, surface_reading: str, part_of_speech: str
+) -> str:
+    """
+    Look up the reading of a dictionary form.
+    When the dictionary form has several readings, pick the one sharing
+    the longest prefix with the surface reading.
+    :param dictionary_form: Dictionary form of the morpheme.
+    :param surface_reading: Reading of the morpheme's surface form.
+    :param part_of_speech: Japanese part of speech of the morpheme.
+    :return: Reading in katakana, or the surface reading if the lookup fails.
+    """
+    readings: list[str] = [
+        entry.reading_form()
+        for entry in get_dictionary().lookup(dictionary_form)
+        if entry.part_of_speech()[0] == part_of_speech
+    ]
+    if not readings:
+        return surface_reading
+    return max(
+        readings,
+        key=lambda reading: len(os.path.commonprefix([reading, surface_reading])),
+    )
 
 
 def get_jp_pos_dict() -> dict[str, str]:
@@ -100,6 +254,7 @@ def get_jp_pos_dict() -> dict[str, str]:
         "接尾辞": "Suffix",
         "接続詞": "Conjunction",
         "接頭辞": "Prefix",
+        "記号": "Symbol",
     }
 
 
@@ -113,11 +268,9 @@ def extract_part_of_speech_from_morphemes(morpheme_list: list[str]) -> list[str]
     logger.info("Extract part of speech from morpheme list...")
     jp_pos_tags = get_jp_pos_dict()
 
-    logger.info("Create tokenizer")
-    tokenizer_obj: Tokenizer = dictionary.Dictionary().create()
-
-    logger.info("Mode C")
-    mode = tokenizer.Tokenizer.SplitMode.C
+    tokenizer_obj: Tokenizer = get_tokenizer()
+    mode = get_split_mode()
+    logger.info(f"Use Tokenizer Mode {mode}")
 
     logger.info(
         "Create part of speech list by extracting part of speech from morpheme list"
@@ -148,21 +301,42 @@ def extract_romanji_from_jp_characters(jp_characters: list[str]) -> list[str]:
     return [extract_romanji(jp_char) for jp_char in jp_characters]
 
 
+def extract_romanji_from_readings(
+    readings: list[str], part_of_speech_list: list[str]
+) -> list[str]:
+    """
+    Extract Romanji from Sudachi katakana readings.
+    :param readings: List of katakana readings.
+    :param part_of_speech_list: List of English parts of speech, aligned with readings.
+    :return: List[String]
+    """
+    logger.info("Extract romanjis from readings list...")
+    return [
+        romanize_reading(reading, part_of_speech)
+        for reading, part_of_speech in zip(readings, part_of_speech_list)
+    ]
+
+
 def extract_romanji(jp_char: str) -> str:
     """
     Extract Romanji from Japanese words.
     :param jp_char: Japanese character.
     :return: Romanji.
     """
-    return cutlet.Cutlet().romaji(jp_char)  # type: ignore
+    return romanize(jp_char)
 
 
 def extract_data(
     song: Dict[str, str],
-) -> Tuple[List[str], List[str], List[str], str, str]:
+    romanizer: str | None = None,
+    timings: SongTimings | None = None,
+) -> ExtractedSong:
     """
     Extract data from the JSON file.
     :param song: YOASOBI song.
+    :param romanizer: Romanization engine ("cutlet" or "sudachi").
+    If not given, the ROMANIZER environment variable is used, then "cutlet".
+    :param timings: If given, the tokenization and romanization times are stored in it.
     :return: Tuple of extracted data from the JSON file.
     """
     song_name: str = song[TITLE_KEY]
@@ -171,14 +345,25 @@ def extract_data(
     song_eng_name: str = song[ROMANJI_TITLE_KEY]
     lyrics: str = song[LYRICS_KEY]
 
-    morphemes: List[str] = extract_morphemes_from_lyrics(lyrics)
+    start = time.perf_counter()
+    tokenized_lyrics = tokenize_lyrics(lyrics)
+    tokenized = time.perf_counter()
+    morphemes: List[str] = tokenized_lyrics.morphemes
     logger.debug(f"morphemes list: {morphemes}")
 
-    romanized_morphemes: List[str] = extract_romanji_from_jp_characters(morphemes)
-
-    part_of_speech_list: List[str] = extract_part_of_speech_from_morphemes(morphemes)
+    if get_romanizer_engine(romanizer) == SUDACHI_ENGINE:
+        romanized_morphemes: List[str] = extract_romanji_from_readings(
+            tokenized_lyrics.readings, tokenized_lyrics.part_of_speech_list
+        )
+    else:
+        romanized_morphemes = extract_romanji_from_jp_characters(morphemes)
+    if timings is not None:
+        timings.tokenize_seconds = tokenized - start
+        timings.romanize_seconds = time.perf_counter() - tokenized
 
-    morpheme_data = MorphemeData(morphemes, romanized_morphemes, part_of_speech_list)
+    morpheme_data = MorphemeData(
+        morphemes, romanized_morphemes, tokenized_lyrics.part_of_speech_list
+    )
     list_len = check_list_len(morpheme_data)
     words_len = list_len[0]
     romanized_words_len = list_len[1]
@@ -214,26 +399,174 @@ def get_song_list(json_data: dict[str, list[dict[str, str]]]) -> list[dict[str,
     return song_list
 
 
-def get_morphemes_from_songs(json_path_list: list[str]) -> pd.DataFrame:
+def get_extraction_workers(workers: int | None = None) -> int:
     """
-    Extract morphemes and related information from songs in JSON files.
+    Get the number of processes used to extract songs.
+    :param workers: Number of processes. 0 uses one process per CPU.
+    If not given, the EXTRACTION_WORKERS environment variable is used, then 1.
+    :return: Number of processes. 1 means songs are extracted serially.
+    """
+    if workers is None:
+        workers = int(os.getenv(EXTRACTION_WORKERS_ENV, DEFAULT_EXTRACTION_WORKERS))
+    if workers < 0:
+        raise ValueError(f"Invalid number of extraction workers: {workers}")
+    return workers or os.cpu_count() or 1
 
-    :param json_path_list: List of paths to JSON files containing song data.
-    :return: DataFrame with columns: morphemes, romanized morphemes,
-             parts of speech, song names, and romanized song names.
-             Returns empty DataFrame if no valid data is found.
+
+def init_extraction_worker(romanizer: str) -> None:
+    """
+    Create the tokenizer and romanizer of an extraction process once,
+    before it receives any song.
+    :param romanizer: Romanization engine name.
+    :return: None
+    """
+    get_tokenizer()
+    if romanizer == CUTLET_ENGINE:
+        get_cutlet()
+
+
+def extract_song_with_cache_stats(
+    song: Dict[str, str], romanizer: str
+) -> tuple[ExtractedSong, CacheStats, SongTimings]:
+    """
+    Extract data from a song and measure the romanization cache usage and stage times.
+    Runs in extraction processes, whose caches and metrics are not visible to the parent.
+    :param song: YOASOBI song.
+    :param romanizer: Romanization engine name.
+    :return: Tuple of the extracted data, the cache stats and the stage times of this song.
+    """
+    cache_stats_before = get_cache_stats()
+    timings = SongTimings()
+    extracted_song = extract_data(song, romanizer, timings)
+    return extracted_song, get_cache_stats() - cache_stats_before, timings
+
+
+def record_extracted_song(
+    extracted_song: ExtractedSong, cache_stats: CacheStats, timings: SongTimings
+) -> tuple[ExtractedSong, CacheStats]:
+    """
+    Record the metrics of an extracted song.
+    :param extracted_song: Extracted data of the song.
+    :param cache_stats: Romanization cache stats of the song.
+    :param timings: Stage times of the song.
+    :return: Tuple of the extracted data and the cache stats.
+    """
+    record_song(
+        len(extracted_song[0]),
+        timings.tokenize_seconds,
+        timings.romanize_seconds,
+        cache_stats,
+    )
+    return extracted_song, cache_stats
+
+
+def iter_extracted_songs(
+    songs: Iterable[dict[str, str]],
+    workers: int | None = None,
+    romanizer: str | None = None,
+) -> Iterator[tuple[ExtractedSong, CacheStats]]:
+    """
+    Extract data from songs, serially or in a process pool, and record their metrics.
+    Serially, songs are read from the iterable one at a time as they are extracted.
+    In parallel mode all songs are read first and the longest lyrics are scheduled
+    first to cut tail latency; results are still yielded in the order of the songs.
+    :param songs: Songs, e.g. a list or the iterator of iter_songs.
+    :param workers: Number of processes, see get_extraction_workers.
+    :param romanizer: Romanization engine name, see get_romanizer_engine.
+    :return: Iterator of tuples of the extracted data and its cache stats.
+    """
+    workers = get_extraction_workers(workers)
+    romanizer = get_romanizer_engine(romanizer)
+    # Scheduling needs all songs; serial extraction reads them as it goes
+    song_list = list(songs) if workers > 1 else None
+    if song_list is None or len(song_list) <= 1:
+        for song in songs if song_list is None else song_list:
+            yield record_extracted_song(*extract_song_with_cache_stats(song, romanizer))
+        return
+
+    logger.info(f"Extract {len(song_list)} songs with {workers} processes...")
+    schedule = sorted(
+        range(len(song_list)),
+        key=lambda index: len(song_list[index].get(LYRICS_KEY) or ""),
+        reverse=True,
+    )
+    # Spawn fresh processes: forking a process that already holds
+    # tokenizers, taggers or server threads is not safe
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(song_list)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_extraction_worker,
+        initargs=(romanizer,),
+    ) as executor:
+        futures: dict[int, Future[tuple[ExtractedSong, CacheStats, SongTimings]]] = {
+            index: executor.submit(
+                extract_song_with_cache_stats, song_list[index], romanizer
+            )
+            for index in schedule
+        }
+        try:
+            for index in range(len(song_list)):
+                yield record_extracted_song(*futures.pop(index).result())
+        finally:
+            # Drop queued songs when the consumer stops early, e.g. a cancelled job
+            for future in futures.values():
+                future.cancel()
+
+
+def get_morpheme_batch_size(batch_size: int | None = None) -> int:
+    """
+    Get the number of rows per streamed morpheme batch.
+    :param batch_size: Number of rows.
+    If not given, the MORPHEME_BATCH_SIZE environment variable is used, then 10000.
+    :return: Number of rows per batch.
+    """
+    if batch_size is None:
+        batch_size = int(
+            os.getenv(MORPHEME_BATCH_SIZE_ENV, DEFAULT_MORPHEME_BATCH_SIZE)
+        )
+    if batch_size < 1:
+        raise ValueError(f"Invalid morpheme batch size: {batch_size}")
+    return batch_size
+
+
+def iter_song_batches(
+    songs: Iterable[dict[str, str]],
+    batch_size: int | None = None,
+    workers: int | None = None,
+    romanizer: str | None = None,
+    cache_stats: CacheStats | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Extract morphemes from songs and stream them as fixed-size row batches.
+    Only the rows of the current batch and the song being split are held in memory.
+    :param songs: Songs, see iter_extracted_songs.
+    :param batch_size: Number of rows per batch, see get_morpheme_batch_size.
+    The last batch may be smaller.
+    :param workers: Number of extraction processes, see get_extraction_workers.
+    :param romanizer: Romanization engine name, see get_romanizer_engine.
+    :param cache_stats: If given, romanization cache stats are added to it.
+    :param progress: If given, called with the number of songs extracted so far
+    after each song.
+    :return: Iterator of DataFrames with the columns of transform_data_to_df.
     """
-    json_data = load_json(json_path_list)
-    song_list = get_song_list(json_data)
-    df_list: list[pd.DataFrame] = []
-    for song in song_list:
+    batch_size = get_morpheme_batch_size(batch_size)
+    pending: list[pd.DataFrame] = []
+    pending_rows = 0
+    for songs_extracted, (extracted_song, song_cache_stats) in enumerate(
+        iter_extracted_songs(songs, workers, romanizer), start=1
+    ):
+        if cache_stats is not None:
+            cache_stats += song_cache_stats
+        if progress is not None:
+            progress(songs_extracted)
         (
             morphemes,
             romanized_morphemes,
             part_of_speech_list,
             song_name,
             song_romanized_name,
-        ) = extract_data(song)
+        ) = extracted_song
         df = transform_data_to_df(
             morphemes,
             romanized_morphemes,
@@ -241,8 +574,81 @@ def get_morphemes_from_songs(json_path_list: list[str]) -> pd.DataFrame:
             song_name,
             song_romanized_name,
         )
-        if not df.empty:
-            df_list.append(df)
+        if df.empty:
+            continue
+
+        pending.append(df)
+        pending_rows += len(df)
+        while pending_rows >= batch_size:
+            rows = concat_dataframes(pending)
+            yield rows.iloc[:batch_size].reset_index(drop=True)
+            rest = rows.iloc[batch_size:].reset_index(drop=True)
+            pending = [rest] if not rest.empty else []
+            pending_rows = len(rest)
+
+    if pending:
+        yield concat_dataframes(pending)
+
+
+def iter_morpheme_batches(
+    json_path_list: list[str],
+    batch_size: int | None = None,
+    workers: int | None = None,
+    romanizer: str | None = None,
+    cache_stats: CacheStats | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Extract morphemes from songs in lyrics files and stream them as fixed-size row batches.
+    With serial extraction, songs are read from the files one at a time.
+    :param json_path_list: List of paths to lyrics files, see iter_file_songs.
+    :param batch_size: Number of rows per batch, see get_morpheme_batch_size.
+    :param workers: Number of extraction processes, see get_extraction_workers.
+    :param romanizer: Romanization engine name, see get_romanizer_engine.
+    :param cache_stats: If given, romanization cache stats are added to it.
+    :param progress: If given, called with the number of songs extracted so far.
+    :return: Iterator of DataFrames with the columns of transform_data_to_df.
+    """
+    yield from iter_song_batches(
+        iter_songs(json_path_list),
+        batch_size,
+        workers,
+        romanizer,
+        cache_stats,
+        progress,
+    )
+
+
+def get_morphemes_from_songs(
+    json_path_list: list[str],
+    workers: int | None = None,
+    romanizer: str | None = None,
+) -> pd.DataFrame:
+    """
+    Extract morphemes and related information from songs in JSON files.
+
+    :param json_path_list: List of paths to JSON files containing song data.
+    :param workers: Number of extraction processes, see get_extraction_workers.
+    :param romanizer: Romanization engine name, see get_romanizer_engine.
+    :return: DataFrame with columns: morphemes, romanized morphemes,
+             parts of speech, song names, and romanized song names.
+             Returns empty DataFrame if no valid data is found.
+             Romanization cache stats of the run are stored in
+             df.attrs["romanization_cache"].
+    """
+    cache_stats = CacheStats()
+    df_list = list(
+        iter_morpheme_batches(
+            json_path_list,
+            workers=workers,
+            romanizer=romanizer,
+            cache_stats=cache_stats,
+        )
+    )
+    df = concat_dataframes(df_list)
 
-    df = pd.concat(df_list, ignore_index=True) if df_list else pd.DataFrame()
+    logger.info(
+        f"Romanization cache: {cache_stats.hits} hits, {cache_stats.misses} misses"
+    )
+    df.attrs[ROMANIZATION_CACHE_ATTR] = asdict(cache_stats)
     return df
@@ -1,5 +1,6 @@
 import datetime
 import pandas as pd
+from pandas.api.types import union_categoricals
 from morphemes_extractor.logger_config import setup_logger
 import logging
 
@@ -11,6 +12,17 @@ SONG_COL = "Song"
 SONG_ROMANJI_COL = "Song_Romanji"
 TIMESTAMP_COL = "Timestamp"
 
+# Low-cardinality string columns stored as categoricals:
+# each distinct string is kept once and rows hold small integer codes
+CATEGORICAL_COLS = (
+    MORPHEME_COL,
+    ROMANJI_COL,
+    POS_COL,
+    SONG_COL,
+    SONG_ROMANJI_COL,
+    TIMESTAMP_COL,
+)
+
 # Set up logger
 logger: logging.Logger = setup_logger(__name__)
 
@@ -29,7 +41,7 @@ def transform_data_to_df(
     :param part_of_speech_list: Part of speech list
     :param song_name: Song's name in Japanese
     :param song_romanized_name: Song's name in Romanji
-    :return: A pandas dataframe
+    :return: A pandas dataframe with categorical columns
     """
     logger.info("Transforming data into a pandas dataframe...")
 
@@ -44,4 +56,33 @@ def transform_data_to_df(
     df[SONG_ROMANJI_COL] = song_romanized_name
     df[TIMESTAMP_COL] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    return df
+    return to_categorical(df)
+
+
+def to_categorical(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the morpheme string columns of a DataFrame to categoricals.
+    :param df: DataFrame with some or all of the CATEGORICAL_COLS columns
+    :return: DataFrame with those columns as categoricals
+    """
+    return df.astype({col: "category" for col in CATEGORICAL_COLS if col in df.columns})
+
+
+def concat_dataframes(df_list: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate DataFrames with the same columns.
+    pd.concat turns categorical columns with different categories into object columns,
+    so the categories of those columns are merged instead.
+    :param df_list: List of DataFrames
+    :return: Concatenated DataFrame with a new index
+    """
+    if not df_list:
+        return pd.DataFrame()
+    columns = {}
+    for col in df_list[0].columns:
+        series_list = [df[col] for df in df_list]
+        if all(isinstance(s.dtype, pd.CategoricalDtype) for s in series_list):
+            columns[col] = pd.Series(union_categoricals(series_list), name=col)
+        else:
+            columns[col] = pd.concat(series_list, ignore_index=True)
+    return pd.DataFrame(columns)
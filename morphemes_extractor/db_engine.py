@@ -0,0 +1,219 @@
+"""
+Share one pooled SQLAlchemy engine per database URL.
+
+Creating an engine per call throws its connection pool away, so every request
+paid for a new database connection. The API lifespan creates the engine at
+startup and disposes all engines at shutdown; the write and read paths get
+the same engine through get_engine and check connections out with connect,
+which records the pool checkout latency.
+
+SQLite engines run in WAL mode with the pragmas of SQLITE_PRAGMAS, and every
+transaction, DDL included, is opened by an explicit BEGIN, so a whole load
+commits or rolls back at once.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Connection, Engine, create_engine, event, make_url
+
+from morphemes_extractor.logger_config import setup_logger
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+# Environment variables and defaults for the connection pool
+POOL_SIZE_ENV = "DB_POOL_SIZE"
+DEFAULT_POOL_SIZE = 5
+MAX_OVERFLOW_ENV = "DB_MAX_OVERFLOW"
+DEFAULT_MAX_OVERFLOW = 10
+POOL_TIMEOUT_ENV = "DB_POOL_TIMEOUT"
+DEFAULT_POOL_TIMEOUT = 30.0
+POOL_PRE_PING_ENV = "DB_POOL_PRE_PING"
+DEFAULT_POOL_PRE_PING = True
+POOL_RECYCLE_ENV = "DB_POOL_RECYCLE"
+DEFAULT_POOL_RECYCLE = 1800
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+# Environment variable of the SQLAlchemy database URL, e.g. sqlite:///morphemes.db;
+# if it is not set, the PostgreSQL URL is built from the DB_* variables
+DB_URL_ENV = "DB_URL"
+
+# SQLite connections are cheap and its default pools do not take size arguments
+SQLITE_BACKEND = "sqlite"
+
+# Pragmas set on every SQLite connection. WAL lets readers run during a load;
+# with WAL, synchronous=NORMAL only syncs at checkpoints and stays crash-safe.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # Negative sizes are in KiB: 64 MiB of page cache
+    "cache_size": "-65536",
+    "mmap_size": str(256 * 1024 * 1024),
+    "busy_timeout": "5000",
+}
+
+
+@dataclass
+class PoolStats:
+    """
+    Connection pool checkout statistics of an engine.
+    """
+
+    checkouts: int = 0
+    total_checkout_seconds: float = 0.0
+    max_checkout_seconds: float = 0.0
+
+    @property
+    def mean_checkout_seconds(self) -> float:
+        return self.total_checkout_seconds / self.checkouts if self.checkouts else 0.0
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_checkout_seconds += seconds
+        self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+
+
+_engines: dict[str, Engine] = {}
+_pool_stats: dict[str, PoolStats] = {}
+_engines_lock = threading.Lock()
+
+
+def get_pool_settings(db_url: str) -> dict[str, Any]:
+    """
+    Get the connection pool settings from environment variables.
+    :param db_url: SQLAlchemy database URL
+    :return: Keyword arguments for create_engine
+    """
+    settings: dict[str, Any] = {
+        "pool_pre_ping": os.getenv(POOL_PRE_PING_ENV, str(DEFAULT_POOL_PRE_PING))
+        .strip()
+        .lower()
+        in TRUE_VALUES,
+        "pool_recycle": int(os.getenv(POOL_RECYCLE_ENV, DEFAULT_POOL_RECYCLE)),
+    }
+    if make_url(db_url).get_backend_name() != SQLITE_BACKEND:
+        settings["pool_size"] = int(os.getenv(POOL_SIZE_ENV, DEFAULT_POOL_SIZE))
+        settings["max_overflow"] = int(
+            os.getenv(MAX_OVERFLOW_ENV, DEFAULT_MAX_OVERFLOW)
+        )
+        settings["pool_timeout"] = float(
+            os.getenv(POOL_TIMEOUT_ENV, DEFAULT_POOL_TIMEOUT)
+        )
+    return settings
+
+
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Set the pragmas of SQLITE_PRAGMAS on a new SQLite connection, and stop
+    the sqlite3 driver from opening transactions itself, see begin_sqlite_transaction.
+    :param dbapi_connection: sqlite3 connection
+    :param connection_record: Pool record of the connection
+    :return: None
+    """
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def begin_sqlite_transaction(conn: Connection) -> None:
+    """
+    Open the transaction of a SQLite connection with an explicit BEGIN.
+    The sqlite3 driver only opens one before INSERT, UPDATE and DELETE,
+    so DROP and CREATE statements before the first insert were committed at once.
+    :param conn: SQLAlchemy connection
+    :return: None
+    """
+    conn.exec_driver_sql("BEGIN")
+
+
+def configure_sqlite_engine(engine: Engine) -> None:
+    """
+    Set the pragmas and the transaction handling of a SQLite engine.
+    :param engine: SQLAlchemy engine of a SQLite database
+    :return: None
+    """
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(engine, "begin", begin_sqlite_transaction)
+
+
+def get_engine(db_url: str) -> Engine:
+    """
+    Get the shared engine of a database URL, creating it on first use.
+    :param db_url: SQLAlchemy database URL
+    :return: SQLAlchemy engine
+    """
+    engine = _engines.get(db_url)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(db_url)
+            if engine is None:
+                settings = get_pool_settings(db_url)
+                engine = create_engine(db_url, **settings)
+                if engine.url.get_backend_name() == SQLITE_BACKEND:
+                    configure_sqlite_engine(engine)
+                logger.info(
+                    f"Create engine for {engine.url.render_as_string()} with {settings}"
+                )
+                _engines[db_url] = engine
+                _pool_stats[db_url] = PoolStats()
+    return engine
+
+
+@contextmanager
+def connect(db_url: str) -> Iterator[Connection]:
+    """
+    Check a connection out of the shared engine's pool.
+    The time spent waiting for the connection is recorded in the pool stats.
+    :param db_url: SQLAlchemy database URL
+    :return: Context manager yielding an open connection
+    """
+    engine = get_engine(db_url)
+    start = time.perf_counter()
+    conn = engine.connect()
+    _pool_stats.setdefault(db_url, PoolStats()).record(time.perf_counter() - start)
+    with conn:
+        yield conn
+
+
+def get_pool_stats() -> list[dict[str, Any]]:
+    """
+    Get the pool status and checkout latency of every shared engine.
+    :return: One entry per engine, with the password hidden in the URL
+    """
+    stats = []
+    for db_url, engine in list(_engines.items()):
+        pool_stats = _pool_stats.get(db_url, PoolStats())
+        stats.append(
+            {
+                "url": engine.url.render_as_string(),
+                "pool": engine.pool.status(),
+                "checkouts": pool_stats.checkouts,
+                "mean_checkout_ms": pool_stats.mean_checkout_seconds * 1000,
+                "max_checkout_ms": pool_stats.max_checkout_seconds * 1000,
+            }
+        )
+    return stats
+
+
+def dispose_engines() -> None:
+    """
+    Close the pooled connections of every shared engine and forget the engines.
+    :return: None
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _pool_stats.clear()
@@ -1,32 +1,528 @@
+import io
 import logging
+import os
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, inspect, text
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from morphemes_extractor.db_engine import connect
+from morphemes_extractor.incremental import IncrementalPlan
 from morphemes_extractor.logger_config import setup_logger
+from morphemes_extractor.metrics import record_db_write
+from morphemes_extractor.sql_query import (
+    MORPHEME_COLUMNS,
+    copy_data_query,
+    create_morpheme_view_query,
+    create_table_as_query,
+    create_normalized_tables_queries,
+    delete_normalized_song_query,
+    delete_orphan_lexemes_query,
+    delete_song_occurrences_query,
+    delete_song_rows_query,
+    drop_morpheme_table_query,
+    drop_morpheme_view_query,
+    drop_normalized_tables_queries,
+    drop_song_hash_table_query,
+    drop_table_query,
+    insert_data_query,
+    morpheme_count_select_query,
+    morpheme_song_count_select_query,
+    pos_count_select_query,
+    select_lexemes_query,
+    select_max_occurrence_id_query,
+    select_songs_query,
+)
 
-# Table name constant
+# Table name constants
 MORPHEME_TABLE = "Morpheme"
+SONG_HASH_TABLE = "Song_Hash"
+SONG_TABLE = "Song"
+LEXEME_TABLE = "Lexeme"
+OCCURRENCE_TABLE = "Occurrence"
+MORPHEME_COUNT_TABLE = "Morpheme_Count"
+POS_COUNT_TABLE = "POS_Count"
+MORPHEME_SONG_COUNT_TABLE = "Morpheme_Song_Count"
+
+# Aggregate tables and the queries that compute them from the Morpheme table or view
+AGGREGATE_QUERIES: dict[str, Callable[[], str]] = {
+    MORPHEME_COUNT_TABLE: morpheme_count_select_query,
+    POS_COUNT_TABLE: pos_count_select_query,
+    MORPHEME_SONG_COUNT_TABLE: morpheme_song_count_select_query,
+}
+
+# Song_Hash column name constants
+SONG_COL = "Song"
+CONTENT_HASH_COL = "Content_Hash"
+
+# Normalized schema column name constants
+SONG_ID_COL = "Song_ID"
+LEXEME_ID_COL = "Lexeme_ID"
+OCCURRENCE_ID_COL = "Occurrence_ID"
+SONG_ROMANJI_COL = "Song_Romanji"
+LEXEME_KEY_COLS = ["Morpheme", "Romanji", "Part_of_Speech"]
+TIMESTAMP_COL = "Timestamp"
+
+# Environment variable, names and default for the storage schema
+SCHEMA_ENV = "MORPHEME_SCHEMA"
+FLAT_SCHEMA = "flat"
+NORMALIZED_SCHEMA = "normalized"
+SCHEMAS = (FLAT_SCHEMA, NORMALIZED_SCHEMA)
+DEFAULT_SCHEMA = FLAT_SCHEMA
+
+# Environment variable, names and default for the bulk-load method
+LOAD_METHOD_ENV = "DB_LOAD_METHOD"
+AUTO_LOAD_METHOD = "auto"
+COPY_LOAD_METHOD = "copy"
+EXECUTEMANY_LOAD_METHOD = "executemany"
+TO_SQL_LOAD_METHOD = "to_sql"
+LOAD_METHODS = (
+    AUTO_LOAD_METHOD,
+    COPY_LOAD_METHOD,
+    EXECUTEMANY_LOAD_METHOD,
+    TO_SQL_LOAD_METHOD,
+)
+
+POSTGRESQL_DIALECT = "postgresql"
+# copy_batch uses copy_expert, which only psycopg2 cursors have
+COPY_DRIVER = "psycopg2"
 
 # Set up logger
 logger: logging.Logger = setup_logger(__name__)
 
 
-def save_to_db(df: pd.DataFrame, db_url: str) -> None:
+def get_load_method(conn: Connection, method: str | None = None) -> str:
     """
-    Save a DataFrame to a database using SQLAlchemy.
-    :param df: DataFrame containing the morpheme data to be saved
-    :param db_url: SQLAlchemy database URL
+    Get the bulk-load method for a connection.
+    :param conn: SQLAlchemy connection
+    :param method: "auto", "copy", "executemany" or "to_sql".
+    If not given, the DB_LOAD_METHOD environment variable is used, then "auto".
+    "auto" uses COPY on PostgreSQL through psycopg2 and executemany otherwise,
+    including other PostgreSQL drivers such as psycopg or asyncpg.
+    :return: Resolved load method
+    """
+    method = (method or os.getenv(LOAD_METHOD_ENV) or AUTO_LOAD_METHOD).lower()
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Invalid load method: {method}")
+    supports_copy = (
+        conn.dialect.name == POSTGRESQL_DIALECT and conn.dialect.driver == COPY_DRIVER
+    )
+    if method == AUTO_LOAD_METHOD:
+        return COPY_LOAD_METHOD if supports_copy else EXECUTEMANY_LOAD_METHOD
+    if method == COPY_LOAD_METHOD and not supports_copy:
+        raise ValueError(
+            f"COPY is not supported by {conn.dialect.name}+{conn.dialect.driver}"
+        )
+    return method
+
+
+def get_db_schema(schema: str | None = None) -> str:
+    """
+    Get the storage schema of the morpheme data.
+    :param schema: "flat" for one Morpheme table with a row per occurrence,
+    or "normalized" for Song, Lexeme and Occurrence tables behind a Morpheme view.
+    If not given, the MORPHEME_SCHEMA environment variable is used, then "flat".
+    :return: Schema name
+    """
+    name = (schema or os.getenv(SCHEMA_ENV) or DEFAULT_SCHEMA).lower()
+    if name not in SCHEMAS:
+        raise ValueError(f"Invalid schema: {name}")
+    return name
+
+
+def copy_batch(
+    conn: Connection, batch: pd.DataFrame, table: str = MORPHEME_TABLE
+) -> None:
+    """
+    Stream a DataFrame batch into a table with PostgreSQL COPY FROM STDIN.
+    :param conn: Open SQLAlchemy connection to PostgreSQL; the caller commits
+    :param batch: DataFrame batch
+    :param table: Table name
+    :return: None
+    """
+    buffer = io.StringIO()
+    batch.to_csv(buffer, header=False, index=False, na_rep="\\N")
+    buffer.seek(0)
+    dbapi_connection = conn.connection.dbapi_connection
+    assert dbapi_connection is not None
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(copy_data_query(list(batch.columns), table), buffer)
+    finally:
+        cursor.close()
+
+
+def insert_batch(
+    conn: Connection, batch: pd.DataFrame, table: str = MORPHEME_TABLE
+) -> None:
+    """
+    Insert a DataFrame batch into a table with a single executemany.
+    The query is compiled once for the dialect and rows are passed straight to the driver,
+    which skips SQLAlchemy's per-row parameter processing.
+    :param conn: Open SQLAlchemy connection; the caller commits
+    :param batch: DataFrame batch
+    :param table: Table name
+    :return: None
+    """
+    columns = list(batch.columns)
+    column_values: list[list[Any]] = []
+    for column in columns:
+        series = batch[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            # The drivers expect datetime.datetime, not pd.Timestamp
+            column_values.append(
+                [None if pd.isna(value) else value.to_pydatetime() for value in series]
+            )
+        else:
+            column_values.append(
+                series.astype(object).where(series.notna(), None).tolist()
+            )
+    rows = list(zip(*column_values))
+
+    compiled = text(insert_data_query(columns, table)).compile(dialect=conn.dialect)
+    if compiled.positiontup is not None:
+        # Positional drivers such as sqlite3 take the rows as they are
+        # when the placeholders follow the column order, as they do here
+        if list(compiled.positiontup) == columns:
+            params: list[Any] = rows
+        else:
+            positions = [columns.index(name) for name in compiled.positiontup]
+            params = [tuple(row[i] for i in positions) for row in rows]
+    else:
+        params = [dict(zip(columns, row)) for row in rows]
+    conn.exec_driver_sql(compiled.string, params)
+
+
+def load_batch(conn: Connection, batch: pd.DataFrame, table: str, method: str) -> None:
+    """
+    Append a DataFrame batch to an existing table.
+    :param conn: Open SQLAlchemy connection; the caller commits
+    :param batch: DataFrame batch
+    :param table: Table name
+    :param method: Resolved load method, see get_load_method
+    :return: None
+    """
+    if batch.empty:
+        return
+    if method == COPY_LOAD_METHOD:
+        copy_batch(conn, batch, table)
+    elif method == EXECUTEMANY_LOAD_METHOD:
+        insert_batch(conn, batch, table)
+    else:
+        batch.to_sql(table, conn, if_exists="append", index=False)
+
+
+def is_morpheme_view(conn: Connection) -> bool:
+    """
+    Check whether Morpheme is the view of the normalized schema.
+    :param conn: SQLAlchemy connection
+    :return: True if Morpheme is a view
+    """
+    return MORPHEME_TABLE in inspect(conn).get_view_names()
+
+
+def drop_normalized_schema(conn: Connection) -> None:
+    """
+    Drop the Morpheme view and the Song, Lexeme and Occurrence tables.
+    :param conn: Open SQLAlchemy connection; the caller commits
+    :return: None
+    """
+    if is_morpheme_view(conn):
+        conn.execute(text(drop_morpheme_view_query()))
+    for query in drop_normalized_tables_queries():
+        conn.execute(text(query))
+
+
+def write_batches(
+    conn: Connection,
+    batches: Iterable[pd.DataFrame],
+    replace: bool,
+    method: str | None = None,
+) -> int:
+    """
+    Write DataFrame batches to the Morpheme table.
+    :param conn: Open SQLAlchemy connection; the caller commits
+    :param batches: Iterable of DataFrame batches
+    :param replace: Replace the table with the first batch instead of appending to it
+    :param method: Bulk-load method, see get_load_method
+    :return: Number of rows written
+    """
+    method = get_load_method(conn, method)
+    logger.info(f"Write batches with load method {method}")
+    if replace:
+        drop_normalized_schema(conn)
+    elif is_morpheme_view(conn):
+        raise ValueError(
+            "Morpheme uses the normalized schema, "
+            "run a full extraction to switch to the flat schema"
+        )
+    rows_saved = 0
+    for batch_number, batch in enumerate(batches):
+        # Time the write only; producing the batch is timed by the extraction
+        start = time.perf_counter()
+        if_exists = "replace" if replace and batch_number == 0 else "append"
+        if method == TO_SQL_LOAD_METHOD:
+            batch.to_sql(MORPHEME_TABLE, conn, if_exists=if_exists, index=False)
+        else:
+            # Let pandas create the table from the empty frame, then bulk-load the rows
+            batch.head(0).to_sql(MORPHEME_TABLE, conn, if_exists=if_exists, index=False)
+            load_batch(conn, batch, MORPHEME_TABLE, method)
+        record_db_write(len(batch), time.perf_counter() - start)
+        rows_saved += len(batch)
+    return rows_saved
+
+
+def write_normalized_batches(
+    conn: Connection,
+    batches: Iterable[pd.DataFrame],
+    replace: bool,
+    method: str | None = None,
+) -> int:
+    """
+    Write DataFrame batches to the Song, Lexeme and Occurrence tables.
+    Songs and lexemes not stored yet get the next free integer ID,
+    and every row becomes an Occurrence of integer keys.
+    :param conn: Open SQLAlchemy connection; the caller commits
+    :param batches: Iterable of DataFrame batches with the Morpheme table columns
+    :param replace: Drop the stored data before writing instead of appending to it
+    :param method: Bulk-load method, see get_load_method
+    :return: Number of rows written
+    """
+    method = get_load_method(conn, method)
+    logger.info(f"Write normalized batches with load method {method}")
+    morpheme_is_view = is_morpheme_view(conn)
+    if replace:
+        drop_normalized_schema(conn)
+        conn.execute(text(drop_morpheme_table_query()))
+        morpheme_is_view = False
+    elif inspect(conn).has_table(MORPHEME_TABLE) and not morpheme_is_view:
+        raise ValueError(
+            "Morpheme uses the flat schema, "
+            "run a full extraction to switch to the normalized schema"
+        )
+    for query in create_normalized_tables_queries():
+        conn.execute(text(query))
+    if not morpheme_is_view:
+        conn.execute(text(create_morpheme_view_query()))
+
+    song_ids: dict[tuple[Any, ...], int] = {
+        tuple(row[1:]): row[0] for row in conn.execute(text(select_songs_query()))
+    }
+    lexeme_ids: dict[tuple[Any, ...], int] = {
+        tuple(row[1:]): row[0] for row in conn.execute(text(select_lexemes_query()))
+    }
+    next_song_id = max(song_ids.values(), default=0) + 1
+    next_lexeme_id = max(lexeme_ids.values(), default=0) + 1
+    next_occurrence_id = (
+        conn.execute(text(select_max_occurrence_id_query())).scalar_one() + 1
+    )
+
+    rows_saved = 0
+    for batch in batches:
+        start = time.perf_counter()
+        values = batch.reindex(columns=list(MORPHEME_COLUMNS)).astype(object)
+        values = values.where(values.notna(), None)
+
+        new_songs = []
+        row_song_ids = []
+        for song, song_romanji, timestamp in zip(
+            values[SONG_COL], values[SONG_ROMANJI_COL], values[TIMESTAMP_COL]
+        ):
+            song_key = (song, song_romanji)
+            song_id = song_ids.get(song_key)
+            if song_id is None:
+                song_id = song_ids[song_key] = next_song_id
+                next_song_id += 1
+                new_songs.append((song_id, song, song_romanji, timestamp))
+            row_song_ids.append(song_id)
+
+        new_lexemes = []
+        row_lexeme_ids = []
+        for key in zip(*(values[column] for column in LEXEME_KEY_COLS)):
+            lexeme_id = lexeme_ids.get(key)
+            if lexeme_id is None:
+                lexeme_id = lexeme_ids[key] = next_lexeme_id
+                next_lexeme_id += 1
+                new_lexemes.append((lexeme_id, *key))
+            row_lexeme_ids.append(lexeme_id)
+
+        song_columns = [SONG_ID_COL, SONG_COL, SONG_ROMANJI_COL, TIMESTAMP_COL]
+        lexeme_columns = [LEXEME_ID_COL, *LEXEME_KEY_COLS]
+        load_batch(
+            conn, pd.DataFrame(new_songs, columns=song_columns), SONG_TABLE, method
+        )
+        load_batch(
+            conn,
+            pd.DataFrame(new_lexemes, columns=lexeme_columns),
+            LEXEME_TABLE,
+            method,
+        )
+        occurrences = pd.DataFrame(
+            {
+                OCCURRENCE_ID_COL: range(
+                    next_occurrence_id, next_occurrence_id + len(batch)
+                ),
+                SONG_ID_COL: row_song_ids,
+                LEXEME_ID_COL: row_lexeme_ids,
+            }
+        )
+        load_batch(conn, occurrences, OCCURRENCE_TABLE, method)
+        next_occurrence_id += len(batch)
+        record_db_write(len(batch), time.perf_counter() - start)
+        rows_saved += len(batch)
+    return rows_saved
+
+
+def refresh_aggregate_tables(conn: Connection) -> None:
+    """
+    Recompute the morpheme, part of speech and morpheme-by-song count tables
+    from the Morpheme table, so readers do not scan every occurrence row.
+    :param conn: Open SQLAlchemy connection; the caller commits
     :return: None
-    This function connects to a database specified by db_url and appends
-    the data from the provided DataFrame to a table named 'Morpheme'. If the
-    table doesn't exist, it will be created.
     """
+    for table, select_query in AGGREGATE_QUERIES.items():
+        conn.execute(text(drop_table_query(table)))
+        conn.execute(text(create_table_as_query(table, select_query())))
+    logger.info("Aggregate tables refreshed")
+
+
+def load_aggregate_table(db_url: str, table: str) -> pd.DataFrame:
+    """
+    Load an aggregate count table.
+    If the table was not created yet, e.g. the data was loaded by an older version,
+    the counts are computed by the database from the Morpheme table instead.
+    :param db_url: SQLAlchemy database URL
+    :param table: Aggregate table name, a key of AGGREGATE_QUERIES
+    :return: DataFrame with the grouping columns and a Count column
+    """
+    try:
+        with connect(db_url) as conn:
+            if inspect(conn).has_table(table):
+                return pd.read_sql_table(table, conn)
+            logger.warning(f"{table} table not found, aggregate the Morpheme table")
+            return pd.read_sql_query(text(AGGREGATE_QUERIES[table]()), conn)
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading {table} from database: {e}")
+        raise
+
+
+def save_to_db(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    db_url: str,
+    method: str | None = None,
+    schema: str | None = None,
+) -> int:
+    """
+    Save a DataFrame, or a stream of DataFrame batches, to a database using SQLAlchemy.
+    :param df: DataFrame containing the morpheme data to be saved,
+    or an iterable of DataFrame batches that is consumed one batch at a time
+    :param db_url: SQLAlchemy database URL
+    :param method: Bulk-load method, see get_load_method
+    :param schema: Storage schema, see get_db_schema
+    :return: Number of rows saved
+    This function connects to a database specified by db_url and replaces
+    the table named 'Morpheme' with the provided data in a single transaction.
+    If the table doesn't exist, it will be created. Song hashes from
+    incremental runs are dropped, so the next incremental run starts over.
+    The aggregate count tables are refreshed in the same transaction.
+    """
+    batches = [df] if isinstance(df, pd.DataFrame) else df
+    write = (
+        write_normalized_batches
+        if get_db_schema(schema) == NORMALIZED_SCHEMA
+        else write_batches
+    )
+    try:
+        with connect(db_url) as conn:
+            rows_saved = write(conn, batches, replace=True, method=method)
+            conn.execute(text(drop_song_hash_table_query()))
+            refresh_aggregate_tables(conn)
+            conn.commit()
+        logger.info(f"{rows_saved} rows saved to database")
+        return rows_saved
+    except OperationalError as e:
+        logger.error(f"OperationalError saving DataFrame to database: {e}")
+        raise
+    except SQLAlchemyError as e:
+        logger.error(f"Error saving DataFrame to database: {e}")
+        raise
+
+
+def load_song_hashes(db_url: str) -> dict[str, str]:
+    """
+    Load the song content hashes stored by the previous incremental run.
+    :param db_url: SQLAlchemy database URL
+    :return: Mapping of song title to content hash. Empty if there was no run.
+    """
+    try:
+        with connect(db_url) as conn:
+            if not inspect(conn).has_table(SONG_HASH_TABLE):
+                return {}
+            df = pd.read_sql_table(SONG_HASH_TABLE, conn)
+        return dict(zip(df[SONG_COL], df[CONTENT_HASH_COL]))
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading song hashes from database: {e}")
+        raise
+
+
+def save_incremental_to_db(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    plan: IncrementalPlan,
+    db_url: str,
+    method: str | None = None,
+    schema: str | None = None,
+) -> int:
+    """
+    Apply an incremental update to the Morpheme table in a single transaction.
+    Rows of changed and deleted songs are removed, rows of added and changed
+    songs are appended, and the song hashes are replaced.
+    Without any skipped song there is nothing to keep, so the table is replaced.
+    The aggregate count tables are refreshed in the same transaction.
+    :param df: DataFrame, or iterable of DataFrame batches, with the rows
+    of the songs in plan.songs_to_process
+    :param plan: IncrementalPlan from plan_incremental_update
+    :param db_url: SQLAlchemy database URL
+    :param method: Bulk-load method, see get_load_method
+    :param schema: Storage schema, see get_db_schema
+    :return: Number of rows saved
+    """
+    batches = [df] if isinstance(df, pd.DataFrame) else df
+    normalized = get_db_schema(schema) == NORMALIZED_SCHEMA
     try:
-        engine = create_engine(db_url)
-        with engine.connect() as conn:
-            df.to_sql(MORPHEME_TABLE, conn, if_exists="replace", index=False)
+        with connect(db_url) as conn:
+            replace = not plan.skipped
+            stale_songs = plan.changed + plan.deleted
+            if not replace and stale_songs:
+                stale_params = [{"song": song} for song in stale_songs]
+                if normalized and inspect(conn).has_table(OCCURRENCE_TABLE):
+                    conn.execute(text(delete_song_occurrences_query()), stale_params)
+                    conn.execute(text(delete_normalized_song_query()), stale_params)
+                elif not normalized and inspect(conn).has_table(MORPHEME_TABLE):
+                    conn.execute(text(delete_song_rows_query()), stale_params)
+            if normalized:
+                rows_saved = write_normalized_batches(
+                    conn, batches, replace=replace, method=method
+                )
+                if not replace:
+                    conn.execute(text(delete_orphan_lexemes_query()))
+            else:
+                rows_saved = write_batches(
+                    conn, batches, replace=replace, method=method
+                )
+            pd.DataFrame(
+                {
+                    SONG_COL: list(plan.song_hashes),
+                    CONTENT_HASH_COL: list(plan.song_hashes.values()),
+                }
+            ).to_sql(SONG_HASH_TABLE, conn, if_exists="replace", index=False)
+            refresh_aggregate_tables(conn)
             conn.commit()
-        logger.info("DataFrame saved to database")
+        logger.info(
+            f"{rows_saved} rows saved to database, "
+            f"{len(stale_songs)} songs' old rows removed"
+        )
+        return rows_saved
     except OperationalError as e:
         logger.error(f"OperationalError saving DataFrame to database: {e}")
         raise
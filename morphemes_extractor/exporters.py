@@ -0,0 +1,185 @@
+"""
+File sinks for the morpheme data.
+"""
+
+import itertools
+import logging
+import os
+import pathlib
+import shutil
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from morphemes_extractor.data_transformer import SONG_COL
+from morphemes_extractor.logger_config import setup_logger
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Environment variable, names and default for where the morpheme data is stored
+# and read from; "parquet" needs no database
+MORPHEME_STORE_ENV = "MORPHEME_STORE"
+DB_STORE = "db"
+PARQUET_STORE = "parquet"
+MORPHEME_STORES = (DB_STORE, PARQUET_STORE)
+DEFAULT_MORPHEME_STORE = DB_STORE
+
+# Environment variable and default for the directory of the Parquet dataset
+PARQUET_DIR_ENV = "PARQUET_DIR"
+DEFAULT_PARQUET_DIR = "morpheme_parquet"
+
+PARQUET_COMPRESSION = "zstd"
+# pyarrow stops at 1024 partitions by default; there is one per song
+MAX_PARQUET_PARTITIONS = 1_000_000
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+
+def get_morpheme_store(store: str | None = None) -> str:
+    """
+    Get where the morpheme data is stored and read from.
+    :param store: "db" for the database, or "parquet" for the Parquet dataset.
+    If not given, the MORPHEME_STORE environment variable is used, then "db".
+    :return: Store name
+    """
+    name = (store or os.getenv(MORPHEME_STORE_ENV) or DEFAULT_MORPHEME_STORE).lower()
+    if name not in MORPHEME_STORES:
+        raise ValueError(f"Invalid morpheme store: {name}")
+    return name
+
+
+def get_parquet_dir(dataset_dir: str | None = None) -> str:
+    """
+    Get the directory of the Parquet dataset.
+    :param dataset_dir: Directory.
+    If not given, the PARQUET_DIR environment variable is used, then "morpheme_parquet".
+    :return: Directory
+    """
+    return dataset_dir or os.getenv(PARQUET_DIR_ENV) or DEFAULT_PARQUET_DIR
+
+
+def save_to_csv(df: pd.DataFrame | Iterable[pd.DataFrame], csv_path: str) -> int:
+    """
+    Save a DataFrame, or a stream of DataFrame batches, to a CSV file.
+    Batches are appended one at a time, so memory stays bounded by the batch size.
+    :param df: DataFrame containing the morpheme data,
+    or an iterable of DataFrame batches
+    :param csv_path: Path to the CSV file, overwritten if it exists
+    :return: Number of rows saved
+    """
+    batches = [df] if isinstance(df, pd.DataFrame) else df
+    path = pathlib.Path(csv_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows_saved = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        for batch_number, batch in enumerate(batches):
+            batch.to_csv(file, header=batch_number == 0, index=False)
+            rows_saved += len(batch)
+    logger.info(f"{rows_saved} rows saved to {csv_path}")
+    return rows_saved
+
+
+def get_parquet_schema(table: "pa.Table") -> "pa.Schema":
+    """
+    Get the schema of the Parquet dataset from the first batch.
+    String and categorical columns become dictionary-encoded strings with int32 indices,
+    so every batch has the same schema whatever the number of its categories.
+    :param table: Arrow table of the first batch
+    :return: Arrow schema
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field in table.schema:
+        value_type = (
+            field.type.value_type if pa.types.is_dictionary(field.type) else field.type
+        )
+        if pa.types.is_string(value_type) or pa.types.is_large_string(value_type):
+            field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def save_to_parquet(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    dataset_dir: str,
+    partition_col: str = SONG_COL,
+) -> int:
+    """
+    Save a DataFrame, or a stream of DataFrame batches, as a Parquet dataset
+    partitioned by song, with one Song=<title> directory per song.
+    String columns are dictionary-encoded, in the files and when read back.
+    Batches are written one at a time, so memory stays bounded by the batch size.
+    The dataset is written next to dataset_dir. Then the old dataset is renamed
+    aside, the new one is renamed into place and the old one is deleted.
+    Readers never see a partly written dataset, though dataset_dir is missing
+    between the two renames. If the second rename fails, the old dataset is restored.
+    :param df: DataFrame containing the morpheme data,
+    or an iterable of DataFrame batches
+    :param dataset_dir: Directory of the dataset, replaced if it exists
+    :param partition_col: Column partitioning the dataset
+    :return: Number of rows saved
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    batches = [df] if isinstance(df, pd.DataFrame) else df
+    path = pathlib.Path(dataset_dir)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    old_path = path.with_name(f"{path.name}.old")
+    for stale_path in (tmp_path, old_path):
+        if stale_path.exists():
+            shutil.rmtree(stale_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    rows_saved = 0
+    tables = (
+        pa.Table.from_pandas(batch, preserve_index=False)
+        for batch in batches
+        if not batch.empty
+    )
+    first_table = next(tables, None)
+    if first_table is not None:
+        schema = get_parquet_schema(first_table)
+
+        def record_batches() -> Iterator["pa.RecordBatch"]:
+            nonlocal rows_saved
+            for table in itertools.chain([first_table], tables):
+                rows_saved += table.num_rows
+                yield from table.cast(schema).to_batches()
+
+        parquet_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            record_batches(),
+            tmp_path,
+            schema=schema,
+            format=parquet_format,
+            file_options=parquet_format.make_write_options(
+                use_dictionary=True, compression=PARQUET_COMPRESSION
+            ),
+            partitioning=ds.partitioning(
+                pa.schema([schema.field(partition_col)]), flavor="hive"
+            ),
+            basename_template="part-{i}.parquet",
+            max_partitions=MAX_PARQUET_PARTITIONS,
+            preserve_order=True,
+        )
+    else:
+        tmp_path.mkdir()
+
+    replaced = path.exists()
+    if replaced:
+        path.rename(old_path)
+    try:
+        tmp_path.rename(path)
+    except OSError:
+        if replaced:
+            old_path.rename(path)
+        raise
+    if replaced:
+        shutil.rmtree(old_path)
+    logger.info(f"{rows_saved} rows saved to {dataset_dir}")
+    return rows_saved
@@ -0,0 +1,77 @@
+"""
+Plan incremental re-extraction from per-song content hashes.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+
+from morphemes_extractor.logger_config import setup_logger
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+# Song fields covered by the content hash
+HASHED_SONG_KEYS = ("title", "romanji_title", "lyrics")
+TITLE_KEY = "title"
+
+
+@dataclass
+class IncrementalPlan:
+    songs_to_process: list[dict[str, str]] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    song_hashes: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def updated(self) -> list[str]:
+        return self.added + self.changed
+
+
+def compute_song_hash(song: dict[str, str]) -> str:
+    """
+    Compute the content hash of a song.
+    The romanji title is stored on every row, so it is hashed along with
+    the title and the lyrics.
+    :param song: YOASOBI song.
+    :return: SHA-256 hex digest.
+    """
+    content = "\0".join(song.get(key) or "" for key in HASHED_SONG_KEYS)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def plan_incremental_update(
+    song_list: list[dict[str, str]], stored_hashes: dict[str, str]
+) -> IncrementalPlan:
+    """
+    Compare songs with the hashes stored by the previous run.
+    :param song_list: List of songs.
+    :param stored_hashes: Mapping of song title to content hash from the previous run.
+    :return: IncrementalPlan with the songs to process and the titles
+    that were added, changed, skipped or deleted.
+    """
+    plan = IncrementalPlan()
+    for song in song_list:
+        title = song[TITLE_KEY]
+        if title in plan.song_hashes:
+            raise ValueError(f"Duplicate song title: {title}")
+
+        song_hash = compute_song_hash(song)
+        plan.song_hashes[title] = song_hash
+        if title not in stored_hashes:
+            plan.added.append(title)
+            plan.songs_to_process.append(song)
+        elif stored_hashes[title] != song_hash:
+            plan.changed.append(title)
+            plan.songs_to_process.append(song)
+        else:
+            plan.skipped.append(title)
+
+    plan.deleted = [title for title in stored_hashes if title not in plan.song_hashes]
+    logger.info(
+        f"Incremental plan: {len(plan.added)} added, {len(plan.changed)} changed, "
+        f"{len(plan.skipped)} skipped, {len(plan.deleted)} deleted"
+    )
+    return plan
@@ -0,0 +1,281 @@
+"""
+Run extraction and visualization as background jobs.
+
+The synchronous endpoints hold a request worker for the whole pipeline, which
+proxies may time out on. A submitted job returns its id at once and runs in a
+dedicated thread pool, reporting its progress (songs processed, rows written)
+and result through JobManager.get. A job submitted while an identical one is
+pending or running is coalesced into that job instead of running again.
+Cancellation is cooperative: the job function calls Job.check_cancelled between
+units of work, and the raised JobCancelled unwinds it (rolling back database
+writes) like any other error.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from morphemes_extractor.logger_config import setup_logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+# Environment variable and default for the number of concurrent jobs
+JOB_WORKERS_ENV = "JOB_WORKERS"
+DEFAULT_JOB_WORKERS = 1
+
+# Finished jobs kept for status lookups; older ones are forgotten first
+MAX_FINISHED_JOBS = 100
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job function when cancellation of the job was requested.
+    """
+
+
+def get_job_workers(workers: int | None = None) -> int:
+    """
+    Get the number of jobs run at the same time.
+    :param workers: Number of workers.
+    If not given, the JOB_WORKERS environment variable is used, then 1.
+    :return: Number of workers.
+    """
+    if workers is None:
+        workers = int(os.getenv(JOB_WORKERS_ENV, DEFAULT_JOB_WORKERS))
+    if workers < 1:
+        raise ValueError(f"Invalid number of job workers: {workers}")
+    return workers
+
+
+def utc_now() -> str:
+    """
+    Get the current UTC time in ISO 8601 format.
+    :return: Timestamp string.
+    """
+    return datetime.now(UTC).isoformat()
+
+
+@dataclass
+class Job:
+    """
+    Status, progress and result of a background job.
+    """
+
+    kind: str
+    params: dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = PENDING
+    created_at: str = field(default_factory=utc_now)
+    started_at: str | None = None
+    finished_at: str | None = None
+    songs_processed: int = 0
+    rows_written: int = 0
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def key(self) -> tuple[str, tuple[tuple[str, Any], ...]]:
+        """
+        Identify the work of the job; jobs with the same key are coalesced.
+        """
+        return self.kind, tuple(sorted(self.params.items()))
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def check_cancelled(self) -> None:
+        """
+        Stop the job if its cancellation was requested.
+        :return: None
+        """
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"Job {self.id} cancelled")
+
+    def set_songs_processed(self, songs_processed: int) -> None:
+        """
+        Record the number of songs processed and stop the job if it was cancelled.
+        Matches the progress callback of iter_song_batches.
+        :param songs_processed: Number of songs processed so far.
+        :return: None
+        """
+        self.songs_processed = songs_processed
+        self.check_cancelled()
+
+    def track_batches(
+        self, batches: Iterator["pd.DataFrame"]
+    ) -> Iterator["pd.DataFrame"]:
+        """
+        Count the rows of the batches handed to the database writer
+        and stop the job between batches if it was cancelled.
+        :param batches: Iterator of row batches.
+        :return: The same batches.
+        """
+        for batch in batches:
+            self.check_cancelled()
+            self.rows_written += len(batch)
+            yield batch
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the job into a JSON-serializable dict.
+        :return: Job status, progress and result.
+        """
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "cancel_requested": self.cancel_event.is_set(),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": {
+                "songs_processed": self.songs_processed,
+                "rows_written": self.rows_written,
+            },
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Run jobs in a thread pool and keep track of their status.
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        self._workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: dict[str, Job] = {}
+        self._futures: dict[str, Future[None]] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        func: Callable[[Job], dict[str, Any]],
+    ) -> Job:
+        """
+        Submit a job, or get the pending or running job doing the same work.
+        :param kind: Kind of work, e.g. "extract-morphemes".
+        :param params: Parameters of the work; part of the coalescing key.
+        :param func: Function doing the work. It gets the job to report progress
+        and check cancellation, and returns the job result.
+        :return: Submitted or coalesced job.
+        """
+        job = Job(kind, params)
+        with self._lock:
+            for active_job in self._jobs.values():
+                if (
+                    active_job.key == job.key
+                    and not active_job.finished
+                    and not active_job.cancel_event.is_set()
+                ):
+                    logger.info(f"Coalesce {kind} job into job {active_job.id}")
+                    return active_job
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=get_job_workers(self._workers),
+                    thread_name_prefix="job",
+                )
+            self._prune_finished_jobs()
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(self._run, job, func)
+        logger.info(f"Submit {kind} job {job.id} with {params}")
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Get a job by id.
+        :param job_id: Job id.
+        :return: Job, or None if it is unknown or was forgotten.
+        """
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """
+        Request cancellation of a job.
+        A pending job is cancelled at once; a running job stops at its next check.
+        :param job_id: Job id.
+        :return: Job, or None if it is unknown or was forgotten.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.cancel_event.set()
+            future = self._futures.get(job_id)
+            if future is not None and future.cancel():
+                self._finish(job, CANCELLED)
+        logger.info(f"Cancel job {job_id}")
+        return job
+
+    def shutdown(self) -> None:
+        """
+        Cancel all unfinished jobs and wait for the running ones to stop.
+        :return: None
+        """
+        with self._lock:
+            for job_id, job in self._jobs.items():
+                if not job.finished:
+                    job.cancel_event.set()
+                    future = self._futures.get(job_id)
+                    if future is not None and future.cancel():
+                        self._finish(job, CANCELLED)
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _run(self, job: Job, func: Callable[[Job], dict[str, Any]]) -> None:
+        with self._lock:
+            if job.finished:
+                return
+            job.status = RUNNING
+            job.started_at = utc_now()
+        try:
+            job.check_cancelled()
+            result = func(job)
+        except JobCancelled:
+            logger.info(f"Job {job.id} cancelled")
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            # Any error must finish the job, or it would stay running forever;
+            # the traceback is logged, the job reports the message
+            logger.exception(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            self._finish(job, FAILED)
+        else:
+            job.result = result
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = utc_now()
+        self._futures.pop(job.id, None)
+
+    def _prune_finished_jobs(self) -> None:
+        finished_ids = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished_ids[: max(len(finished_ids) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
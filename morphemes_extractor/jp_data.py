@@ -7,3 +7,38 @@ class MorphemeData:
     morphemes: List[str]
     romanized_morphemes: List[str]
     part_of_speech_list: List[str]
+
+
+@dataclass
+class TokenizedLyrics:
+    morphemes: List[str]
+    part_of_speech_list: List[str]
+    readings: List[str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(self.hits + other.hits, self.misses + other.misses)
+
+    def __iadd__(self, other: "CacheStats") -> "CacheStats":
+        self.hits += other.hits
+        self.misses += other.misses
+        return self
+
+    def __sub__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(self.hits - other.hits, self.misses - other.misses)
+
+
+@dataclass
+class SongTimings:
+    tokenize_seconds: float = 0.0
+    romanize_seconds: float = 0.0
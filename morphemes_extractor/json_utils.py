@@ -1,9 +1,109 @@
+import gzip
+import importlib.util
+import io
+import itertools
 import json
 import os
 import pathlib
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, TypeVar, cast
 
 SONGS_KEY = "songs"
 
+# Lyrics files are only read from this directory
+LYRICS_DIR = pathlib.Path(__file__).parent.parent / 'lyrics'
+# {"songs": [...]} documents and JSON Lines files of one song per line,
+# optionally compressed
+JSON_SUFFIX = '.json'
+JSONL_SUFFIX = '.jsonl'
+GZIP_SUFFIX = '.gz'
+ZSTD_SUFFIX = '.zst'
+LYRICS_SUFFIXES = (JSON_SUFFIX, JSONL_SUFFIX)
+COMPRESSION_SUFFIXES = (GZIP_SUFFIX, ZSTD_SUFFIX)
+# Characters decoded per read while streaming a JSON document
+STREAM_CHUNK_SIZE = 65536
+
+# Environment variable and default for the number of threads loading files
+JSON_LOAD_WORKERS_ENV = "JSON_LOAD_WORKERS"
+DEFAULT_JSON_LOAD_WORKERS = 8
+
+# Environment variable, names and default for the decoder of whole files;
+# "auto" uses orjson when it is installed, else the json module
+JSON_DECODER_ENV = "JSON_DECODER"
+AUTO_JSON_DECODER = "auto"
+ORJSON_DECODER = "orjson"
+STDLIB_JSON_DECODER = "json"
+JSON_DECODERS = (AUTO_JSON_DECODER, ORJSON_DECODER, STDLIB_JSON_DECODER)
+DEFAULT_JSON_DECODER = AUTO_JSON_DECODER
+
+T = TypeVar('T')
+
+_decoder = json.JSONDecoder()
+_whitespace = json.decoder.WHITESPACE  # type: ignore[attr-defined]
+
+
+def get_json_load_workers(workers: int | None = None) -> int:
+    """
+    Get the number of threads reading and decoding lyrics files.
+    :param workers: Number of threads. 1 loads the files serially.
+    If not given, the JSON_LOAD_WORKERS environment variable is used, then 8.
+    :return: Number of threads.
+    """
+    if workers is None:
+        workers = int(os.getenv(JSON_LOAD_WORKERS_ENV, DEFAULT_JSON_LOAD_WORKERS))
+    if workers < 1:
+        raise ValueError(f"Invalid number of JSON load workers: {workers}")
+    return workers
+
+
+def get_json_decoder(decoder: str | None = None) -> str:
+    """
+    Get the decoder of whole JSON files.
+    :param decoder: Decoder name ("auto", "orjson" or "json").
+    If not given, the JSON_DECODER environment variable is used, then "auto".
+    :return: "orjson" or "json". "auto" resolves to orjson when it is installed.
+    """
+    name = (decoder or os.getenv(JSON_DECODER_ENV) or DEFAULT_JSON_DECODER).lower()
+    if name not in JSON_DECODERS:
+        raise ValueError(f"Invalid JSON decoder: {name}")
+    orjson_installed = importlib.util.find_spec(ORJSON_DECODER) is not None
+    if name == ORJSON_DECODER and not orjson_installed:
+        raise ImportError("Install orjson to use the orjson JSON decoder")
+    if name == AUTO_JSON_DECODER:
+        return ORJSON_DECODER if orjson_installed else STDLIB_JSON_DECODER
+    return name
+
+
+def decode_json(data: bytes, decoder: str) -> Any:
+    """
+    Decode a UTF-8 JSON document.
+    Both decoders raise json.JSONDecodeError on invalid JSON.
+    :param data: JSON document
+    :param decoder: Resolved decoder name, see get_json_decoder
+    :return: Decoded value
+    """
+    if decoder == ORJSON_DECODER:
+        import orjson
+
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def map_in_threads(func: Callable[[str], T], file_path_list: list[str], workers: int | None = None) -> list[T]:
+    """
+    Apply a function to files in a thread pool, keeping the order of the files.
+    :param func: Function reading a file
+    :param file_path_list: List of file paths
+    :param workers: Number of threads, see get_json_load_workers
+    :return: Results in the order of file_path_list, whatever the number of threads
+    """
+    workers = min(get_json_load_workers(workers), len(file_path_list))
+    if workers <= 1:
+        return [func(file_path) for file_path in file_path_list]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='json-load') as executor:
+        return list(executor.map(func, file_path_list))
+
 
 def load_json_file(file_path: str) -> dict[str, list[dict[str, str]]]:
     """
@@ -12,12 +112,11 @@ def load_json_file(file_path: str) -> dict[str, list[dict[str, str]]]:
     :return: JSON data as a dictionary with songs list
     """
     # Only allow .json files in the lyrics directory
-    base_dir = pathlib.Path(__file__).parent.parent / 'lyrics'
+    base_dir = LYRICS_DIR
     abs_path = pathlib.Path(file_path).resolve()
     if not abs_path.is_file() or abs_path.suffix != '.json' or base_dir not in abs_path.parents:
         raise ValueError(f"Invalid or unauthorized file path: {file_path}")
-    with open(abs_path, 'r', encoding='utf-8') as file:
-        return json.load(file)  # type: ignore
+    return decode_json(abs_path.read_bytes(), get_json_decoder())  # type: ignore
 
 
 def combine_json_data(json_data_list: list[dict[str, list[dict[str, str]]]]) -> dict[str, list[dict[str, str]]]:
@@ -32,30 +131,271 @@ def combine_json_data(json_data_list: list[dict[str, list[dict[str, str]]]]) ->
     return {SONGS_KEY: combined_songs}
 
 
-def load_json(json_file_path_list: list[str]) -> dict[str, list[dict[str, str]]]:
+def load_json(json_file_path_list: list[str], workers: int | None = None) -> dict[str, list[dict[str, str]]]:
     """
-    Load JSON data from multiple files and combine them.
+    Load JSON data from multiple files concurrently and combine them.
     :param json_file_path_list: List of paths to JSON files
-    :return: Combined JSON data as a dictionary
+    :param workers: Number of threads, see get_json_load_workers
+    :return: Combined JSON data as a dictionary, with the songs in file order
     """
-    json_data_list = [load_json_file(file_path) for file_path in json_file_path_list]
+    json_data_list = map_in_threads(load_json_file, json_file_path_list, workers)
     return combine_json_data(json_data_list)
 
 
+def get_lyrics_format(file_name: str) -> tuple[str, str | None]:
+    """
+    Get the format and compression of a lyrics file from its name.
+    :param file_name: File name, e.g. "songs.jsonl.gz"
+    :return: Tuple of the format suffix (".json" or ".jsonl")
+    and the compression suffix (".gz", ".zst" or None)
+    """
+    suffixes = pathlib.PurePath(file_name).suffixes
+    compression = suffixes.pop() if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES else None
+    if not suffixes or suffixes[-1] not in LYRICS_SUFFIXES:
+        raise ValueError(f"Invalid lyrics file: {file_name}")
+    return suffixes[-1], compression
+
+
+def is_lyrics_file(file_name: str) -> bool:
+    """
+    Check whether a file name has a supported lyrics format and compression.
+    :param file_name: File name
+    :return: True if the file can be read by iter_file_songs
+    """
+    try:
+        get_lyrics_format(file_name)
+    except ValueError:
+        return False
+    return True
+
+
+def open_lyrics_file(abs_path: pathlib.Path, compression: str | None) -> IO[bytes]:
+    """
+    Open a lyrics file for reading, decompressing it on the fly.
+    Reading .zst files requires the zstandard package.
+    :param abs_path: Resolved path of the file
+    :param compression: Compression suffix, see get_lyrics_format
+    :return: Binary file object of the uncompressed content
+    """
+    if compression == GZIP_SUFFIX:
+        return cast(IO[bytes], gzip.open(abs_path, 'rb'))
+    if compression == ZSTD_SUFFIX:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(f"Install zstandard to read {abs_path.name}") from e
+        return zstandard.ZstdDecompressor().stream_reader(open(abs_path, 'rb'), closefd=True)  # type: ignore[no-any-return]
+    return open(abs_path, 'rb')
+
+
+def get_lyrics_path(file_path: str) -> pathlib.Path:
+    """
+    Resolve the path of a lyrics file securely.
+    Only .json and .jsonl files, optionally compressed as .gz or .zst,
+    in the lyrics directory are allowed.
+    :param file_path: Path to the lyrics file
+    :return: Resolved path
+    """
+    abs_path = pathlib.Path(file_path).resolve()
+    if not abs_path.is_file() or not is_lyrics_file(abs_path.name) or LYRICS_DIR not in abs_path.parents:
+        raise ValueError(f"Invalid or unauthorized file path: {file_path}")
+    return abs_path
+
+
+class JSONStream:
+    """
+    Decode JSON values one at a time from a text stream,
+    holding only the undecoded rest of the current chunk in memory.
+    """
+
+    def __init__(self, file: IO[str], chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read_chunk(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and get the next character.
+        :return: Next character, or an empty string at the end of the stream
+        """
+        while True:
+            self._pos = _whitespace.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_chunk():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """
+        Skip whitespace and consume a character.
+        :param char: Expected character
+        :return: None
+        """
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def decode(self) -> Any:
+        """
+        Skip whitespace and decode the next JSON value.
+        :return: Decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if self._read_chunk():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._read_chunk():
+                continue
+            self._pos = end
+            return value
+
+    def expect_end(self) -> None:
+        """
+        Skip whitespace and check that the stream has ended.
+        :return: None
+        """
+        if self.peek():
+            raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+
+
+def iter_json_songs(file: IO[str], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[dict[str, str]]:
+    """
+    Stream the songs of a {"songs": [...]} document one at a time.
+    Other keys are decoded and skipped; a document without songs has none.
+    :param file: Text stream of the document
+    :param chunk_size: Characters read at a time
+    :return: Iterator of songs
+    """
+    stream = JSONStream(file, chunk_size)
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        key = stream.decode()
+        stream.expect(':')
+        if key == SONGS_KEY and stream.peek() == '[':
+            stream.expect('[')
+            if stream.peek() != ']':
+                while True:
+                    yield stream.decode()
+                    if stream.peek() != ',':
+                        break
+                    stream.expect(',')
+            stream.expect(']')
+        else:
+            stream.decode()
+        if stream.peek() != ',':
+            break
+        stream.expect(',')
+    stream.expect('}')
+    stream.expect_end()
+
+
+def iter_jsonl_songs(file: IO[str]) -> Iterator[dict[str, str]]:
+    """
+    Stream the songs of a JSON Lines file of one song per line.
+    Blank lines are skipped.
+    :param file: Text stream of the file
+    :return: Iterator of songs
+    """
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_file_songs(file_path: str) -> Iterator[dict[str, str]]:
+    """
+    Stream the songs of a lyrics file securely, one song at a time.
+    Only .json and .jsonl files, optionally compressed as .gz or .zst,
+    in the lyrics directory are allowed.
+    :param file_path: Path to the lyrics file
+    :return: Iterator of songs
+    """
+    abs_path = get_lyrics_path(file_path)
+    lyrics_format, compression = get_lyrics_format(abs_path.name)
+    with open_lyrics_file(abs_path, compression) as binary_file:
+        with io.TextIOWrapper(binary_file, encoding='utf-8') as file:
+            if lyrics_format == JSONL_SUFFIX:
+                yield from iter_jsonl_songs(file)
+            else:
+                yield from iter_json_songs(file)
+
+
+def read_file_songs(file_path: str) -> list[dict[str, str]]:
+    """
+    Read all songs of a lyrics file securely, decoding it at once
+    with the decoder of get_json_decoder.
+    :param file_path: Path to the lyrics file, see get_lyrics_path
+    :return: List of songs
+    """
+    abs_path = get_lyrics_path(file_path)
+    lyrics_format, compression = get_lyrics_format(abs_path.name)
+    decoder = get_json_decoder()
+    with open_lyrics_file(abs_path, compression) as file:
+        data = file.read()
+    if lyrics_format == JSONL_SUFFIX:
+        return [decode_json(line, decoder) for line in data.splitlines() if line.strip()]
+    songs: list[dict[str, str]] = decode_json(data, decoder).get(SONGS_KEY, [])
+    return songs
+
+
+def load_songs(file_path_list: list[str], workers: int | None = None) -> list[dict[str, str]]:
+    """
+    Read all songs of lyrics files concurrently.
+    Faster than iter_songs when all songs are needed at once, at the cost of memory.
+    :param file_path_list: Paths to lyrics files, see get_lyrics_path
+    :param workers: Number of threads, see get_json_load_workers
+    :return: List of songs, in file order whatever the number of threads
+    """
+    songs_per_file = map_in_threads(read_file_songs, file_path_list, workers)
+    return list(itertools.chain.from_iterable(songs_per_file))
+
+
+def iter_songs(file_path_list: Iterable[str]) -> Iterator[dict[str, str]]:
+    """
+    Stream the songs of lyrics files one at a time, in file order.
+    :param file_path_list: Paths to lyrics files, see iter_file_songs
+    :return: Iterator of songs
+    """
+    for file_path in file_path_list:
+        yield from iter_file_songs(file_path)
+
+
 def find_json_files(json_dir: str) -> list[str]:
     """
-    Find all JSON files in the specified directory securely.
-    :param json_dir: Path to the directory containing JSON files.
-    :return: List of full paths to JSON files in the directory.
+    Find all lyrics files in the specified directory securely:
+    .json and .jsonl files, optionally compressed as .gz or .zst.
+    :param json_dir: Path to the directory containing lyrics files.
+    :return: List of full paths to lyrics files in the directory.
     """
-    base_dir = pathlib.Path(__file__).parent.parent / 'lyrics'
+    base_dir = LYRICS_DIR
     abs_dir = pathlib.Path(json_dir).resolve()
     # Ensure the resolved path is strictly within the base directory
     if not abs_dir.is_dir() or os.path.commonpath([str(base_dir), str(abs_dir)]) != str(base_dir):
         raise ValueError(f"Invalid or unauthorized directory: {json_dir}")
     json_file_path_list = []
     for json_file in os.listdir(abs_dir):
-        if json_file.endswith('.json'):
+        if is_lyrics_file(json_file):
             file_path = abs_dir / json_file
             if file_path.is_file():
                 json_file_path_list.append(str(file_path))
@@ -0,0 +1,127 @@
+"""
+Romanize Sudachi katakana readings into Hepburn with a precomputed kana table.
+
+This avoids running Cutlet's second morphological analysis (fugashi + UniDic)
+on text Sudachi has already analyzed. The output follows Cutlet's conventions
+(long vowels spelled out, "wo" for ヲ, "n'" before vowels and "y", capitalized
+first letter) so both engines produce the same romanji for native words.
+Cutlet still differs on loanwords, which it spells in their original language.
+"""
+
+# Basic katakana
+KANA_ROMAJI_TABLE: dict[str, str] = {
+    "ア": "a", "イ": "i", "ウ": "u", "エ": "e", "オ": "o",
+    "カ": "ka", "キ": "ki", "ク": "ku", "ケ": "ke", "コ": "ko",
+    "サ": "sa", "シ": "shi", "ス": "su", "セ": "se", "ソ": "so",
+    "タ": "ta", "チ": "chi", "ツ": "tsu", "テ": "te", "ト": "to",
+    "ナ": "na", "ニ": "ni", "ヌ": "nu", "ネ": "ne", "ノ": "no",
+    "ハ": "ha", "ヒ": "hi", "フ": "fu", "ヘ": "he", "ホ": "ho",
+    "マ": "ma", "ミ": "mi", "ム": "mu", "メ": "me", "モ": "mo",
+    "ヤ": "ya", "ユ": "yu", "ヨ": "yo",
+    "ラ": "ra", "リ": "ri", "ル": "ru", "レ": "re", "ロ": "ro",
+    "ワ": "wa", "ヰ": "wi", "ヱ": "we", "ヲ": "wo", "ン": "n",
+    "ガ": "ga", "ギ": "gi", "グ": "gu", "ゲ": "ge", "ゴ": "go",
+    "ザ": "za", "ジ": "ji", "ズ": "zu", "ゼ": "ze", "ゾ": "zo",
+    "ダ": "da", "ヂ": "ji", "ヅ": "zu", "デ": "de", "ド": "do",
+    "バ": "ba", "ビ": "bi", "ブ": "bu", "ベ": "be", "ボ": "bo",
+    "パ": "pa", "ピ": "pi", "プ": "pu", "ペ": "pe", "ポ": "po",
+    "ヴ": "vu", "ヶ": "ke", "ヵ": "ka",
+    "ァ": "a", "ィ": "i", "ゥ": "u", "ェ": "e", "ォ": "o",
+    "ャ": "ya", "ュ": "yu", "ョ": "yo", "ヮ": "wa",
+}  # fmt: skip
+
+# Two-kana combinations, matched before single kana
+KANA_DIGRAPH_ROMAJI_TABLE: dict[str, str] = {
+    "キャ": "kya", "キュ": "kyu", "キョ": "kyo",
+    "シャ": "sha", "シュ": "shu", "ショ": "sho", "シェ": "she",
+    "チャ": "cha", "チュ": "chu", "チョ": "cho", "チェ": "che",
+    "ニャ": "nya", "ニュ": "nyu", "ニョ": "nyo",
+    "ヒャ": "hya", "ヒュ": "hyu", "ヒョ": "hyo",
+    "ミャ": "mya", "ミュ": "myu", "ミョ": "myo",
+    "リャ": "rya", "リュ": "ryu", "リョ": "ryo",
+    "ギャ": "gya", "ギュ": "gyu", "ギョ": "gyo",
+    "ジャ": "ja", "ジュ": "ju", "ジョ": "jo", "ジェ": "je",
+    "ヂャ": "ja", "ヂュ": "ju", "ヂョ": "jo",
+    "ビャ": "bya", "ビュ": "byu", "ビョ": "byo",
+    "ピャ": "pya", "ピュ": "pyu", "ピョ": "pyo",
+    "ファ": "fa", "フィ": "fi", "フェ": "fe", "フォ": "fo",
+    "ティ": "ti", "ディ": "di", "トゥ": "tu", "ドゥ": "du",
+    "デュ": "dyu", "テュ": "tyu",
+    "ウィ": "wi", "ウェ": "we", "ウォ": "wo",
+    "ヴァ": "va", "ヴィ": "vi", "ヴェ": "ve", "ヴォ": "vo",
+    "ツァ": "tsa", "ツィ": "tsi", "ツェ": "tse", "ツォ": "tso",
+}  # fmt: skip
+
+# Particles pronounced differently from their kana
+PARTICLE_ROMAJI_TABLE: dict[str, str] = {
+    "ハ": "wa",
+    "ヘ": "e",
+}
+
+PARTICLE_POS = "Particle"
+SOKUON = "ッ"
+CHOONPU = "ー"
+VOWELS = "aeiou"
+
+# Offset between hiragana and katakana code points
+HIRAGANA_TO_KATAKANA_OFFSET = ord("ァ") - ord("ぁ")
+
+
+def to_katakana(text: str) -> str:
+    """
+    Convert hiragana characters to katakana and leave other characters as they are.
+    :param text: Text.
+    :return: Text with hiragana converted to katakana.
+    """
+    return "".join(
+        chr(ord(char) + HIRAGANA_TO_KATAKANA_OFFSET) if "ぁ" <= char <= "ゖ" else char
+        for char in text
+    )
+
+
+def katakana_to_romaji(reading: str, part_of_speech: str | None = None) -> str:
+    """
+    Convert a katakana reading into Hepburn romanji.
+    :param reading: Katakana reading, e.g. from Sudachi's reading_form().
+    :param part_of_speech: English part of speech of the morpheme.
+    Particles ハ and ヘ are romanized as "wa" and "e".
+    :return: Romanji with the first letter capitalized.
+    """
+    reading = to_katakana(reading)
+    if part_of_speech == PARTICLE_POS and reading in PARTICLE_ROMAJI_TABLE:
+        romaji = PARTICLE_ROMAJI_TABLE[reading]
+        return romaji[:1].upper() + romaji[1:]
+
+    syllables: list[str] = []
+    geminate_next = False
+    i = 0
+    while i < len(reading):
+        digraph = reading[i : i + 2]
+        if digraph in KANA_DIGRAPH_ROMAJI_TABLE:
+            syllable = KANA_DIGRAPH_ROMAJI_TABLE[digraph]
+            i += 2
+        else:
+            char = reading[i]
+            i += 1
+            if char == SOKUON:
+                geminate_next = True
+                continue
+            if char == CHOONPU:
+                # Repeat the previous vowel; a lone mark stays as "-" like Cutlet
+                last_vowel = syllables[-1][-1:] if syllables else ""
+                syllable = last_vowel if last_vowel and last_vowel in VOWELS else "-"
+            else:
+                syllable = KANA_ROMAJI_TABLE.get(char, char)
+
+        if geminate_next:
+            # ッチ is written "tchi" in Hepburn
+            consonant = "t" if syllable.startswith("ch") else syllable[:1]
+            syllable = consonant + syllable if consonant not in VOWELS else syllable
+            geminate_next = False
+
+        if syllables and syllables[-1] == "n" and syllable[:1] in VOWELS + "y":
+            syllables[-1] = "n'"
+        syllables.append(syllable)
+
+    romaji = "".join(syllables)
+    return romaji[:1].upper() + romaji[1:]
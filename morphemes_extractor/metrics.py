@@ -0,0 +1,300 @@
+"""
+Count and time the pipeline stages and expose them in the Prometheus text format.
+
+The pipeline records songs and tokens processed, per-song tokenization and
+romanization time, database batch write time, rows written, and romanization
+and render cache lookups in the REGISTRY of prometheus_client metrics.
+GET /metrics serves expose(), and the extraction and visualization responses
+include summarize() of the metrics recorded while they ran. Songs extracted in
+worker processes are timed there and recorded in the parent by
+iter_extracted_songs.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.metrics import MetricWrapperBase
+
+from morphemes_extractor.jp_data import CacheStats
+
+# Namespace prefixed to every exposed metric name
+METRIC_NAMESPACE = "morphemes"
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+# Histogram bucket upper bounds in seconds, from one tokenized song to a chart
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def get_value(metric: MetricWrapperBase, suffix: str) -> float:
+    """
+    Read a sample of an unlabelled metric.
+    :param metric: Counter, gauge or histogram.
+    :param suffix: Sample name suffix, e.g. "_total" of a counter or "_count"
+    and "_sum" of a histogram.
+    :return: Sample value, 0 if the metric has no such sample.
+    """
+    for family in metric.collect():
+        for sample in family.samples:
+            if sample.name.endswith(suffix):
+                return float(sample.value)
+    return 0.0
+
+
+def get_ratio(numerator: Counter, denominator: Counter) -> Callable[[], float]:
+    """
+    Get a function computing the ratio of two counters, 0 without any denominator.
+    """
+
+    def ratio() -> float:
+        lookups = get_value(denominator, "_total")
+        return get_value(numerator, "_total") / lookups if lookups else 0.0
+
+    return ratio
+
+
+def get_rows_per_second() -> float:
+    """
+    Compute the rows written per second of database write time.
+    """
+    seconds = get_value(DB_WRITE_SECONDS, "_sum")
+    return get_value(DB_ROWS_WRITTEN, "_total") / seconds if seconds else 0.0
+
+
+def expose() -> bytes:
+    """
+    Expose the REGISTRY metrics in the Prometheus text format.
+    """
+    return generate_latest(REGISTRY)
+
+
+REGISTRY = CollectorRegistry()
+
+SONGS_PROCESSED = Counter(
+    "songs_processed",
+    "Songs extracted.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+TOKENS_PROCESSED = Counter(
+    "tokens_processed",
+    "Morphemes kept from the extracted songs.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+TOKENIZE_SECONDS = Histogram(
+    "tokenize_seconds",
+    "Tokenization time of a song in seconds.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+    buckets=DEFAULT_BUCKETS,
+)
+ROMANIZE_SECONDS = Histogram(
+    "romanize_seconds",
+    "Romanization time of a song in seconds.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+    buckets=DEFAULT_BUCKETS,
+)
+DB_WRITE_SECONDS = Histogram(
+    "db_write_seconds",
+    "Database write time of a row batch in seconds.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+    buckets=DEFAULT_BUCKETS,
+)
+DB_ROWS_WRITTEN = Counter(
+    "db_rows_written",
+    "Morpheme rows written to the database.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+DB_ROWS_PER_SECOND = Gauge(
+    "db_rows_per_second",
+    "Morpheme rows written per second of database write time.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+DB_ROWS_PER_SECOND.set_function(get_rows_per_second)
+ROMANIZATION_CACHE_HITS = Counter(
+    "romanization_cache_hits",
+    "Romanization cache hits.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+ROMANIZATION_CACHE_LOOKUPS = Counter(
+    "romanization_cache_lookups",
+    "Romanization cache lookups.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+ROMANIZATION_CACHE_HIT_RATIO = Gauge(
+    "romanization_cache_hit_ratio",
+    "Share of romanization cache lookups that hit.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+ROMANIZATION_CACHE_HIT_RATIO.set_function(
+    get_ratio(ROMANIZATION_CACHE_HITS, ROMANIZATION_CACHE_LOOKUPS)
+)
+RENDER_SECONDS = Histogram(
+    "render_seconds",
+    "Render or cache restore time of a chart in seconds.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+    buckets=DEFAULT_BUCKETS,
+)
+RENDER_CACHE_HITS = Counter(
+    "render_cache_hits",
+    "Charts restored from the render cache.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+RENDER_CACHE_LOOKUPS = Counter(
+    "render_cache_lookups",
+    "Render cache lookups.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+RENDER_CACHE_HIT_RATIO = Gauge(
+    "render_cache_hit_ratio",
+    "Share of render cache lookups that hit.",
+    namespace=METRIC_NAMESPACE,
+    registry=REGISTRY,
+)
+RENDER_CACHE_HIT_RATIO.set_function(get_ratio(RENDER_CACHE_HITS, RENDER_CACHE_LOOKUPS))
+
+# Counters and histograms compared by summarize
+SUMMARY_COUNTERS = {
+    "songs_processed": SONGS_PROCESSED,
+    "tokens_processed": TOKENS_PROCESSED,
+    "rows_written": DB_ROWS_WRITTEN,
+    "romanization_cache_hits": ROMANIZATION_CACHE_HITS,
+    "romanization_cache_lookups": ROMANIZATION_CACHE_LOOKUPS,
+    "render_cache_hits": RENDER_CACHE_HITS,
+    "render_cache_lookups": RENDER_CACHE_LOOKUPS,
+}
+SUMMARY_HISTOGRAMS = {
+    "tokenize": TOKENIZE_SECONDS,
+    "romanize": ROMANIZE_SECONDS,
+    "db_write": DB_WRITE_SECONDS,
+    "render": RENDER_SECONDS,
+}
+
+
+def record_song(
+    tokens: int,
+    tokenize_seconds: float,
+    romanize_seconds: float,
+    cache_stats: CacheStats,
+) -> None:
+    """
+    Record an extracted song.
+    :param tokens: Number of morphemes kept from the song.
+    :param tokenize_seconds: Tokenization time.
+    :param romanize_seconds: Romanization time.
+    :param cache_stats: Romanization cache stats of the song.
+    :return: None
+    """
+    SONGS_PROCESSED.inc()
+    TOKENS_PROCESSED.inc(tokens)
+    TOKENIZE_SECONDS.observe(tokenize_seconds)
+    ROMANIZE_SECONDS.observe(romanize_seconds)
+    ROMANIZATION_CACHE_HITS.inc(cache_stats.hits)
+    ROMANIZATION_CACHE_LOOKUPS.inc(cache_stats.hits + cache_stats.misses)
+
+
+def record_db_write(rows: int, seconds: float) -> None:
+    """
+    Record a row batch written to the database.
+    :param rows: Number of rows.
+    :param seconds: Write time.
+    :return: None
+    """
+    DB_ROWS_WRITTEN.inc(rows)
+    DB_WRITE_SECONDS.observe(seconds)
+
+
+def record_render(seconds: float, cache_hit: bool | None) -> None:
+    """
+    Record a rendered chart.
+    :param seconds: Render or cache restore time.
+    :param cache_hit: Whether the chart was restored from the render cache,
+    or None if the cache is disabled.
+    :return: None
+    """
+    RENDER_SECONDS.observe(seconds)
+    if cache_hit is not None:
+        RENDER_CACHE_LOOKUPS.inc()
+        if cache_hit:
+            RENDER_CACHE_HITS.inc()
+
+
+def snapshot() -> dict[str, float]:
+    """
+    Read the counters and histogram totals compared by summarize.
+    :return: Values by summary name.
+    """
+    values = {
+        name: get_value(counter, "_total") for name, counter in SUMMARY_COUNTERS.items()
+    }
+    for name, histogram in SUMMARY_HISTOGRAMS.items():
+        values[f"{name}_count"] = get_value(histogram, "_count")
+        values[f"{name}_seconds"] = get_value(histogram, "_sum")
+    return values
+
+
+def summarize(before: dict[str, float]) -> dict[str, Any]:
+    """
+    Summarize the metrics recorded since a snapshot.
+    Runs overlapping in time, e.g. concurrent jobs, are counted in each other's summary.
+    :param before: snapshot() taken before the run.
+    :return: Counts, mean and total stage times in milliseconds, rows per second
+    of database write time and cache hit ratios. Stages that did not run are left out.
+    """
+    after = snapshot()
+    delta = {name: after[name] - before.get(name, 0.0) for name in after}
+    summary: dict[str, Any] = {
+        name: int(delta[name])
+        for name in ("songs_processed", "tokens_processed", "rows_written")
+    }
+    for name in SUMMARY_HISTOGRAMS:
+        count = delta[f"{name}_count"]
+        if count:
+            seconds = delta[f"{name}_seconds"]
+            summary[f"{name}_ms"] = {
+                "count": int(count),
+                "total": round(seconds * 1000, 1),
+                "mean": round(seconds * 1000 / count, 3),
+            }
+    if delta["db_write_seconds"]:
+        summary["rows_per_second"] = round(
+            delta["rows_written"] / delta["db_write_seconds"], 1
+        )
+    for cache in ("romanization_cache", "render_cache"):
+        lookups = delta[f"{cache}_lookups"]
+        if lookups:
+            summary[f"{cache}_hit_ratio"] = round(delta[f"{cache}_hits"] / lookups, 4)
+    return summary
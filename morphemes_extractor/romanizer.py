@@ -0,0 +1,125 @@
+"""
+Romanize Japanese morphemes with a bounded LRU cache.
+
+Two engines are available:
+- "cutlet" romanizes the morpheme text with Cutlet. Cutlet loads its own
+  MeCab/UniDic tagger, so each thread keeps one instance.
+- "sudachi" converts the Sudachi reading with the kana table in kana_romanizer,
+  without a second morphological analysis.
+
+Romanizations are memoized since lyrics repeat the same particles and
+auxiliaries thousands of times.
+
+Cutlet (and through it fugashi and UniDic) is imported on first use, so
+processes that only use the "sudachi" engine never load it.
+"""
+
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from morphemes_extractor.jp_data import CacheStats
+from morphemes_extractor.kana_romanizer import katakana_to_romaji
+from morphemes_extractor.logger_config import setup_logger
+
+if TYPE_CHECKING:
+    from cutlet import cutlet
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+# Environment variable and default for the cache size
+ROMANIZATION_CACHE_SIZE_ENV = "ROMANIZATION_CACHE_SIZE"
+DEFAULT_ROMANIZATION_CACHE_SIZE = 8192
+
+# Environment variable, names and default for the romanization engine
+ROMANIZER_ENV = "ROMANIZER"
+CUTLET_ENGINE = "cutlet"
+SUDACHI_ENGINE = "sudachi"
+ROMANIZER_ENGINES = (CUTLET_ENGINE, SUDACHI_ENGINE)
+DEFAULT_ROMANIZER = CUTLET_ENGINE
+
+_thread_local = threading.local()
+
+
+def get_cache_size() -> int:
+    """
+    Get the maximum number of cached romanizations.
+    :return: Cache size from the ROMANIZATION_CACHE_SIZE environment variable, or the default.
+    """
+    return int(os.getenv(ROMANIZATION_CACHE_SIZE_ENV, DEFAULT_ROMANIZATION_CACHE_SIZE))
+
+
+def get_romanizer_engine(engine: str | None = None) -> str:
+    """
+    Get the romanization engine name.
+    :param engine: Engine name ("cutlet" or "sudachi").
+    If not given, the ROMANIZER environment variable is used, then "cutlet".
+    :return: Engine name.
+    """
+    name = (engine or os.getenv(ROMANIZER_ENV) or DEFAULT_ROMANIZER).lower()
+    if name not in ROMANIZER_ENGINES:
+        raise ValueError(f"Invalid romanizer engine: {name}")
+    return name
+
+
+def get_cutlet() -> "cutlet.Cutlet":
+    """
+    Get the Cutlet instance of the current thread.
+    :return: Cutlet instance.
+    """
+    cutlet_obj: "cutlet.Cutlet | None" = getattr(_thread_local, "cutlet", None)
+    if cutlet_obj is None:
+        from cutlet import cutlet
+
+        logger.info("Create Cutlet")
+        cutlet_obj = cutlet.Cutlet()
+        _thread_local.cutlet = cutlet_obj
+    return cutlet_obj
+
+
+@lru_cache(maxsize=get_cache_size())
+def romanize(word: str) -> str:
+    """
+    Romanize a Japanese word with Cutlet.
+    Results are cached by word.
+    :param word: Japanese word, usually a morpheme's dictionary form.
+    :return: Romanji.
+    """
+    romanji: str = get_cutlet().romaji(word)
+    return romanji
+
+
+@lru_cache(maxsize=get_cache_size())
+def romanize_reading(reading: str, part_of_speech: str | None = None) -> str:
+    """
+    Romanize a Sudachi katakana reading with the kana table.
+    Results are cached by reading and part of speech.
+    :param reading: Katakana reading of the morpheme's dictionary form.
+    :param part_of_speech: English part of speech of the morpheme.
+    :return: Romanji.
+    """
+    return katakana_to_romaji(reading, part_of_speech)
+
+
+def get_cache_stats() -> CacheStats:
+    """
+    Get the romanization cache hit and miss counters of the current process,
+    summed over both engines.
+    :return: CacheStats
+    """
+    cache_stats = CacheStats()
+    for cache_info in (romanize.cache_info(), romanize_reading.cache_info()):
+        cache_stats += CacheStats(hits=cache_info.hits, misses=cache_info.misses)
+    return cache_stats
+
+
+def clear_romanization_cache() -> None:
+    """
+    Clear the romanization caches and reset their counters.
+    :return: None
+    """
+    romanize.cache_clear()
+    romanize_reading.cache_clear()
@@ -2,22 +2,65 @@
 For storing and returning SQL queries.
 """
 
+from collections.abc import Sequence
 from morphemes_extractor.logger_config import setup_logger
 import logging
 
 # Set up logger
 logger: logging.Logger = setup_logger(__name__)
 
+# Columns of the Morpheme table, in DataFrame order
+MORPHEME_COLUMNS = (
+    "Morpheme",
+    "Romanji",
+    "Part_of_Speech",
+    "Song",
+    "Song_Romanji",
+    "Timestamp",
+)
 
-def insert_data_query() -> str:
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a table or column name for PostgreSQL and SQLite.
+    :param name: Identifier
+    :return: Quoted identifier
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def insert_data_query(
+    columns: Sequence[str] = MORPHEME_COLUMNS, table: str = "Morpheme"
+) -> str:
     """
-    Return insert data into Words table SQL query.
+    Return insert data into Morpheme table SQL query.
+    :param columns: Columns to insert, also used as bind parameter names
+    :param table: Table to insert into
     :return: SQL query
     """
     logger.debug("Insert data SQL query...")
-    return """
-    INSERT INTO Morpheme (Morpheme, Romanji, Part_of_Speech, Song, Song_Romanji, Timestamp) 
-    VALUES (:Morpheme, :Romanji, :Part_of_Speech, :Song, :Song_Romanji, :Timestamp)
+    column_list = ", ".join(quote_identifier(column) for column in columns)
+    value_list = ", ".join(f":{column}" for column in columns)
+    return f"""
+    INSERT INTO {quote_identifier(table)} ({column_list})
+    VALUES ({value_list})
+    """
+
+
+def copy_data_query(
+    columns: Sequence[str] = MORPHEME_COLUMNS, table: str = "Morpheme"
+) -> str:
+    """
+    Return PostgreSQL COPY data into Morpheme table from CSV on STDIN SQL query.
+    Unquoted \\N is read as NULL, so empty strings stay empty strings.
+    :param columns: Columns in CSV order
+    :param table: Table to copy into
+    :return: SQL query
+    """
+    logger.debug("Copy data SQL query...")
+    column_list = ", ".join(quote_identifier(column) for column in columns)
+    return f"""
+    COPY {quote_identifier(table)} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')
     """
 
 
@@ -32,6 +75,312 @@ def delete_all_rows() -> str:
     """
 
 
+def delete_song_rows_query() -> str:
+    """
+    Return deleting all rows of a song from Morpheme table SQL query.
+    :return: SQL query
+    """
+    logger.debug("Return delete song rows SQL query...")
+    return """
+    DELETE FROM "Morpheme" WHERE "Song" = :song
+    """
+
+
+def drop_song_hash_table_query() -> str:
+    """
+    Return dropping Song_Hash table SQL query.
+    :return: SQL query
+    """
+    logger.debug("Return drop Song_Hash table SQL query...")
+    return """
+    DROP TABLE IF EXISTS "Song_Hash"
+    """
+
+
+def create_normalized_tables_queries() -> list[str]:
+    """
+    Return create Song, Lexeme and Occurrence tables SQL queries.
+    Each lexeme (morpheme, romanji and part of speech) and each song is stored once;
+    Occurrence holds one row of integer keys per morpheme occurrence.
+    :return: SQL queries
+    """
+    logger.debug("Return create normalized tables SQL queries...")
+    return [
+        """
+        CREATE TABLE IF NOT EXISTS "Song" (
+            "Song_ID" INTEGER PRIMARY KEY,
+            "Song" TEXT,
+            "Song_Romanji" TEXT,
+            "Timestamp" TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS "Lexeme" (
+            "Lexeme_ID" INTEGER PRIMARY KEY,
+            "Morpheme" TEXT,
+            "Romanji" TEXT,
+            "Part_of_Speech" TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS "Occurrence" (
+            "Occurrence_ID" INTEGER PRIMARY KEY,
+            "Song_ID" INTEGER NOT NULL REFERENCES "Song" ("Song_ID"),
+            "Lexeme_ID" INTEGER NOT NULL REFERENCES "Lexeme" ("Lexeme_ID")
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS "Occurrence_Song_ID_Index"
+        ON "Occurrence" ("Song_ID")
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS "Occurrence_Lexeme_ID_Index"
+        ON "Occurrence" ("Lexeme_ID")
+        """,
+    ]
+
+
+def drop_normalized_tables_queries() -> list[str]:
+    """
+    Return drop Occurrence, Lexeme and Song tables SQL queries.
+    :return: SQL queries
+    """
+    logger.debug("Return drop normalized tables SQL queries...")
+    return [
+        'DROP TABLE IF EXISTS "Occurrence"',
+        'DROP TABLE IF EXISTS "Lexeme"',
+        'DROP TABLE IF EXISTS "Song"',
+    ]
+
+
+def create_morpheme_view_query() -> str:
+    """
+    Return create Morpheme view SQL query.
+    The view has the columns of the flat Morpheme table, so readers work with either schema.
+    :return: SQL query
+    """
+    logger.debug("Return create Morpheme view SQL query...")
+    return """
+    CREATE VIEW "Morpheme" AS
+    SELECT
+        l."Morpheme",
+        l."Romanji",
+        l."Part_of_Speech",
+        s."Song",
+        s."Song_Romanji",
+        s."Timestamp"
+    FROM "Occurrence" o
+    JOIN "Song" s ON s."Song_ID" = o."Song_ID"
+    JOIN "Lexeme" l ON l."Lexeme_ID" = o."Lexeme_ID"
+    """
+
+
+def drop_morpheme_view_query() -> str:
+    """
+    Return drop Morpheme view SQL query.
+    :return: SQL query
+    """
+    logger.debug("Return drop Morpheme view SQL query...")
+    return """
+    DROP VIEW IF EXISTS "Morpheme"
+    """
+
+
+def drop_morpheme_table_query() -> str:
+    """
+    Return drop Morpheme table SQL query.
+    :return: SQL query
+    """
+    logger.debug("Return drop Morpheme table SQL query...")
+    return """
+    DROP TABLE IF EXISTS "Morpheme"
+    """
+
+
+def select_songs_query() -> str:
+    """
+    Return select song keys from Song table SQL query.
+    :return: SQL query
+    """
+    return """
+    SELECT "Song_ID", "Song", "Song_Romanji" FROM "Song"
+    """
+
+
+def select_lexemes_query() -> str:
+    """
+    Return select lexeme keys from Lexeme table SQL query.
+    :return: SQL query
+    """
+    return """
+    SELECT "Lexeme_ID", "Morpheme", "Romanji", "Part_of_Speech" FROM "Lexeme"
+    """
+
+
+def select_max_occurrence_id_query() -> str:
+    """
+    Return select the largest Occurrence_ID SQL query.
+    :return: SQL query
+    """
+    return """
+    SELECT COALESCE(MAX("Occurrence_ID"), 0) FROM "Occurrence"
+    """
+
+
+def delete_song_occurrences_query() -> str:
+    """
+    Return deleting the occurrences of a song SQL query.
+    :return: SQL query
+    """
+    logger.debug("Return delete song occurrences SQL query...")
+    return """
+    DELETE FROM "Occurrence"
+    WHERE "Song_ID" IN (SELECT "Song_ID" FROM "Song" WHERE "Song" = :song)
+    """
+
+
+def delete_normalized_song_query() -> str:
+    """
+    Return deleting a song from Song table SQL query.
+    :return: SQL query
+    """
+    logger.debug("Return delete normalized song SQL query...")
+    return """
+    DELETE FROM "Song" WHERE "Song" = :song
+    """
+
+
+def delete_orphan_lexemes_query() -> str:
+    """
+    Return deleting lexemes without any occurrence SQL query.
+    :return: SQL query
+    """
+    logger.debug("Return delete orphan lexemes SQL query...")
+    return """
+    DELETE FROM "Lexeme"
+    WHERE "Lexeme_ID" NOT IN (SELECT "Lexeme_ID" FROM "Occurrence")
+    """
+
+
+def morpheme_count_select_query() -> str:
+    """
+    Return count occurrences per morpheme SQL query.
+    :return: SQL query
+    """
+    return """
+    SELECT "Morpheme", COUNT(*) AS "Count"
+    FROM "Morpheme"
+    GROUP BY "Morpheme"
+    """
+
+
+def pos_count_select_query() -> str:
+    """
+    Return count occurrences per part of speech SQL query.
+    :return: SQL query
+    """
+    return """
+    SELECT "Part_of_Speech", COUNT(*) AS "Count"
+    FROM "Morpheme"
+    GROUP BY "Part_of_Speech"
+    """
+
+
+def morpheme_song_count_select_query() -> str:
+    """
+    Return count occurrences per morpheme and song SQL query.
+    :return: SQL query
+    """
+    return """
+    SELECT "Morpheme", "Song", COUNT(*) AS "Count"
+    FROM "Morpheme"
+    GROUP BY "Morpheme", "Song"
+    """
+
+
+def create_table_as_query(table: str, select_query: str) -> str:
+    """
+    Return create a table from a SELECT SQL query.
+    :param table: Table name
+    :param select_query: SELECT SQL query
+    :return: SQL query
+    """
+    logger.debug(f"Return create {table} table as SQL query...")
+    return f"""
+    CREATE TABLE {quote_identifier(table)} AS {select_query}
+    """
+
+
+def drop_table_query(table: str) -> str:
+    """
+    Return drop table SQL query.
+    :param table: Table name
+    :return: SQL query
+    """
+    logger.debug(f"Return drop {table} table SQL query...")
+    return f"""
+    DROP TABLE IF EXISTS {quote_identifier(table)}
+    """
+
+
+def select_table_query(table: str) -> str:
+    """
+    Return select all rows of a table SQL query.
+    :param table: Table name
+    :return: SQL query
+    """
+    return f"""
+    SELECT * FROM {quote_identifier(table)}
+    """
+
+
+def top_counts_query(
+    source_query: str, column: str, collation: str = "", limit: bool = True
+) -> str:
+    """
+    Return the most frequent values of a count query SQL query.
+    Ties are ordered by value. The limit is bound to the :limit parameter.
+    :param source_query: SELECT SQL query with the column and a Count column
+    :param column: Grouping column
+    :param collation: COLLATE clause for ordering values, or an empty string
+    :param limit: Limit the number of rows to :limit
+    :return: SQL query
+    """
+    logger.debug(f"Return top {column} counts SQL query...")
+    quoted_column = quote_identifier(column)
+    limit_clause = "LIMIT :limit" if limit else ""
+    return f"""
+    SELECT {quoted_column}, "Count"
+    FROM ({source_query}) AS counts
+    ORDER BY "Count" DESC, {quoted_column}{collation}
+    {limit_clause}
+    """
+
+
+def top_morpheme_song_counts_query(
+    song_count_query: str, morpheme_count_query: str, collation: str = ""
+) -> str:
+    """
+    Return the per-song counts of the :limit most frequent morphemes SQL query.
+    :param song_count_query: SELECT SQL query with Morpheme, Song and Count columns
+    :param morpheme_count_query: SELECT SQL query with Morpheme and Count columns
+    :param collation: COLLATE clause for ordering values, or an empty string
+    :return: SQL query
+    """
+    logger.debug("Return top morpheme song counts SQL query...")
+    return f"""
+    SELECT "Morpheme", "Song", "Count"
+    FROM ({song_count_query}) AS song_counts
+    WHERE "Morpheme" IN (
+        SELECT "Morpheme"
+        FROM ({morpheme_count_query}) AS counts
+        ORDER BY "Count" DESC, "Morpheme"{collation}
+        LIMIT :limit
+    )
+    ORDER BY "Morpheme"{collation}, "Song"{collation}
+    """
+
+
 def create_morpheme_table_query() -> str:
     """
     Return create Morpheme table SQL query.
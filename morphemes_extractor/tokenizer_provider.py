@@ -0,0 +1,91 @@
+"""
+Provide a shared SudachiPy tokenizer.
+
+Loading the Sudachi system dictionary is far more expensive than tokenizing a song,
+so the dictionary is created once per process and each thread reuses its own tokenizer.
+"""
+
+import logging
+import os
+import threading
+
+from sudachipy import Tokenizer, dictionary, tokenizer
+
+from morphemes_extractor.logger_config import setup_logger
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+# Environment variable and default for the split mode
+SPLIT_MODE_ENV = "SUDACHI_SPLIT_MODE"
+DEFAULT_SPLIT_MODE = "C"
+
+SPLIT_MODES: dict[str, tokenizer.Tokenizer.SplitMode] = {
+    "A": tokenizer.Tokenizer.SplitMode.A,
+    "B": tokenizer.Tokenizer.SplitMode.B,
+    "C": tokenizer.Tokenizer.SplitMode.C,
+}
+
+_dictionary: dictionary.Dictionary | None = None
+_dictionary_pid: int | None = None
+_dictionary_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def get_split_mode(mode_name: str | None = None) -> tokenizer.Tokenizer.SplitMode:
+    """
+    Get the Sudachi split mode.
+    :param mode_name: Split mode name ("A", "B" or "C").
+    If not given, the SUDACHI_SPLIT_MODE environment variable is used, then "C".
+    :return: Sudachi split mode.
+    """
+    name = (mode_name or os.getenv(SPLIT_MODE_ENV) or DEFAULT_SPLIT_MODE).upper()
+    if name not in SPLIT_MODES:
+        raise ValueError(f"Invalid Sudachi split mode: {name}")
+    return SPLIT_MODES[name]
+
+
+def get_dictionary() -> dictionary.Dictionary:
+    """
+    Get the Sudachi dictionary shared by the current process.
+    The dictionary is created on first use and recreated after a fork.
+    :return: Sudachi dictionary.
+    """
+    global _dictionary, _dictionary_pid
+    pid = os.getpid()
+    if _dictionary is None or _dictionary_pid != pid:
+        with _dictionary_lock:
+            if _dictionary is None or _dictionary_pid != pid:
+                logger.info("Create Sudachi dictionary")
+                _dictionary = dictionary.Dictionary()
+                _dictionary_pid = pid
+    return _dictionary
+
+
+def get_tokenizer() -> Tokenizer:
+    """
+    Get the Sudachi tokenizer of the current thread.
+    Tokenizers are not thread-safe, so each thread gets its own tokenizer
+    backed by the shared dictionary.
+    :return: Sudachi tokenizer.
+    """
+    tokenizer_obj: Tokenizer | None = getattr(_thread_local, "tokenizer", None)
+    if tokenizer_obj is None or _thread_local.pid != os.getpid():
+        logger.info("Create tokenizer")
+        tokenizer_obj = get_dictionary().create()
+        _thread_local.tokenizer = tokenizer_obj
+        _thread_local.pid = os.getpid()
+    return tokenizer_obj
+
+
+def reset_tokenizer() -> None:
+    """
+    Drop the shared dictionary and the tokenizer of the current thread.
+    The next call to get_tokenizer creates them again.
+    :return: None
+    """
+    global _dictionary, _dictionary_pid
+    with _dictionary_lock:
+        _dictionary = None
+        _dictionary_pid = None
+    _thread_local.tokenizer = None
@@ -0,0 +1,184 @@
+"""
+Warm up a long-running API process before it serves its first request.
+
+The API imports pandas, Sudachi, Cutlet and matplotlib lazily, so a fresh
+container pays for them, plus the Sudachi dictionary, the Cutlet tagger, the
+first database connection and matplotlib's font discovery, on its first
+requests. WarmUp runs these steps in a background thread started by the
+lifespan, and the health endpoint reports ready once they have finished.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from morphemes_extractor.logger_config import setup_logger
+
+# Set up logger
+logger: logging.Logger = setup_logger(__name__)
+
+# Environment variable, names and default for the warm-up steps
+WARMUP_STEPS_ENV = "WARMUP_STEPS"
+TOKENIZER_STEP = "tokenizer"
+ROMANIZER_STEP = "romanizer"
+DB_ENGINE_STEP = "db_engine"
+FONTS_STEP = "fonts"
+CANARY_STEP = "canary"
+WARMUP_STEPS = (TOKENIZER_STEP, ROMANIZER_STEP, DB_ENGINE_STEP, FONTS_STEP, CANARY_STEP)
+DEFAULT_WARMUP_STEPS = ",".join(WARMUP_STEPS)
+NO_WARMUP = "none"
+
+# A tiny song run through extract_data; it exercises every extraction stage
+CANARY_SONG = {
+    "title": "夜に駆ける",
+    "romanji_title": "Yoru ni Kakeru",
+    "lyrics": "沈むように溶けてゆくように\n二人だけの空が広がる夜に",
+}
+
+
+def get_warmup_steps(steps: str | None = None) -> list[str]:
+    """
+    Get the warm-up steps to run.
+    :param steps: Comma-separated step names, or "none".
+    If not given, the WARMUP_STEPS environment variable is used, then all steps.
+    :return: Step names in the order given.
+    """
+    if steps is None:
+        steps = os.getenv(WARMUP_STEPS_ENV, DEFAULT_WARMUP_STEPS)
+    names = [name.strip().lower() for name in steps.split(",") if name.strip()]
+    if names == [NO_WARMUP]:
+        return []
+    for name in names:
+        if name not in WARMUP_STEPS:
+            raise ValueError(f"Invalid warm-up step: {name}")
+    return names
+
+
+def warm_up_tokenizer() -> None:
+    """
+    Load the Sudachi dictionary shared by the process.
+    :return: None
+    """
+    from morphemes_extractor.tokenizer_provider import get_tokenizer
+
+    get_tokenizer()
+
+
+def warm_up_romanizer() -> None:
+    """
+    Load the configured romanization engine.
+    :return: None
+    """
+    from morphemes_extractor.romanizer import (
+        CUTLET_ENGINE,
+        get_cutlet,
+        get_romanizer_engine,
+    )
+
+    if get_romanizer_engine() == CUTLET_ENGINE:
+        get_cutlet()
+
+
+def warm_up_db_engine(db_url: str) -> None:
+    """
+    Create the shared engine and open its first pooled connection.
+    :param db_url: SQLAlchemy database URL
+    :return: None
+    """
+    from morphemes_extractor.db_engine import connect
+
+    with connect(db_url):
+        pass
+
+
+def warm_up_canary() -> None:
+    """
+    Run the canary song through extract_data and the DataFrame conversion.
+    :return: None
+    """
+    from morphemes_extractor.data_extractor import extract_data
+    from morphemes_extractor.data_transformer import transform_data_to_df
+
+    extracted_song = extract_data(CANARY_SONG)
+    transform_data_to_df(*extracted_song)
+
+
+@dataclass
+class WarmUp:
+    """
+    Run warm-up steps once and report their progress.
+    A failed step is logged and reported; the remaining steps still run.
+    """
+
+    pending_steps: list[str] = field(default_factory=list)
+    step_seconds: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    finished: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def ready(self) -> bool:
+        return self.finished.is_set()
+
+    def reset(self, steps: dict[str, Callable[[], Any]]) -> None:
+        """
+        Forget a previous run, e.g. of an earlier lifespan in the same process.
+        :param steps: Step functions by step name.
+        :return: None
+        """
+        self.finished.clear()
+        self.pending_steps = list(steps)
+        self.step_seconds.clear()
+        self.errors.clear()
+
+    def run(self, steps: dict[str, Callable[[], Any]]) -> None:
+        """
+        Run the steps in order in the current thread.
+        :param steps: Step functions by step name.
+        :return: None
+        """
+        self.reset(steps)
+        for name, step in steps.items():
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                # The steps touch the dictionary, fonts and the database, so any
+                # error is reported by /health/; the traceback is logged
+                logger.exception(f"Warm-up step {name} failed: {e}")
+                self.errors[name] = str(e)
+            self.step_seconds[name] = time.perf_counter() - start
+            self.pending_steps.remove(name)
+            logger.info(f"Warm-up step {name}: {self.step_seconds[name]:.3f} s")
+        self.finished.set()
+
+    def start(self, steps: dict[str, Callable[[], Any]]) -> threading.Thread:
+        """
+        Run the steps in a background thread.
+        :param steps: Step functions by step name.
+        :return: The started thread.
+        """
+        self.reset(steps)
+        thread = threading.Thread(
+            target=self.run, args=(steps,), name="warm-up", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the warm-up progress into a JSON-serializable dict.
+        :return: Readiness, pending steps, step times and errors.
+        """
+        return {
+            "ready": self.ready,
+            "pending_steps": list(self.pending_steps),
+            "step_ms": {
+                name: round(seconds * 1000, 1)
+                for name, seconds in self.step_seconds.items()
+            },
+            "errors": dict(self.errors),
+        }
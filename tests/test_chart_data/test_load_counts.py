@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from morphemes_extractor.chart_data import (
+    load_pos_counts,
+    load_top_morpheme_song_counts,
+    load_top_morphemes,
+)
+from morphemes_extractor.db_func import save_to_db
+from visualize import count_values
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "Morpheme": ["夜", "に", "夜", "君", "空", "君", "夜", "に"],
+            "Part_of_Speech": [
+                "Noun",
+                "Particle",
+                "Noun",
+                "Pronoun",
+                "Noun",
+                "Pronoun",
+                "Noun",
+                "Particle",
+            ],
+            "Song": ["A", "A", "A", "A", "B", "B", "B", "B"],
+        }
+    )
+
+
+@pytest.fixture(params=["aggregate tables", "morpheme table"])
+def db_url(request, tmp_path, sample_df):
+    db_url = f"sqlite:///{tmp_path / 'test.db'}"
+    if request.param == "aggregate tables":
+        save_to_db(sample_df, db_url)
+    else:
+        with create_engine(db_url).connect() as conn:
+            sample_df.to_sql("Morpheme", conn, index=False)
+            conn.commit()
+    return db_url
+
+
+def test_load_top_morphemes(db_url):
+    top = load_top_morphemes(db_url, top_n=3)
+    # に and 君 tie, so they are ordered by code point
+    assert top.to_dict("list") == {
+        "Morpheme": ["夜", "に", "君"],
+        "Count": [3, 2, 2],
+    }
+
+
+def test_load_pos_counts(db_url):
+    counts = load_pos_counts(db_url)
+    assert counts.to_dict("list") == {
+        "Part_of_Speech": ["Noun", "Particle", "Pronoun"],
+        "Count": [4, 2, 2],
+    }
+
+
+def test_load_top_morpheme_song_counts(db_url):
+    counts = load_top_morpheme_song_counts(db_url, top_n=2)
+    assert counts.to_dict("list") == {
+        "Morpheme": ["に", "に", "夜", "夜"],
+        "Song": ["A", "B", "A", "B"],
+        "Count": [1, 1, 2, 1],
+    }
+
+
+def test_counts_match_morpheme_rows(db_url, sample_df):
+    pd.testing.assert_series_equal(
+        count_values(load_top_morphemes(db_url, top_n=3), "Morpheme"),
+        count_values(sample_df, "Morpheme").head(3),
+    )
+    pd.testing.assert_series_equal(
+        count_values(load_pos_counts(db_url), "Part_of_Speech"),
+        count_values(sample_df, "Part_of_Speech"),
+    )
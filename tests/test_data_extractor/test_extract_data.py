@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import pytest
 from morphemes_extractor.data_extractor import extract_data
+from morphemes_extractor.jp_data import TokenizedLyrics
 
 
 def test_extract_data_valid_input():
@@ -42,17 +43,13 @@ def test_extract_data_unequal_list_lengths():
     # Mock the extract functions to return lists of different lengths
     with (
         patch(
-            "morphemes_extractor.data_extractor.extract_morphemes_from_lyrics",
-            return_value=["テスト"],
+            "morphemes_extractor.data_extractor.tokenize_lyrics",
+            return_value=TokenizedLyrics(["テスト"], ["Noun"], ["テスト"]),
         ),
         patch(
             "morphemes_extractor.data_extractor.extract_romanji_from_jp_characters",
             return_value=["Test", "Extra"],
         ),
-        patch(
-            "morphemes_extractor.data_extractor.extract_part_of_speech_from_morphemes",
-            return_value=["Noun"],
-        ),
     ):
         with pytest.raises(Exception) as exc_info:
             extract_data(song)
@@ -61,3 +58,46 @@ def test_extract_data_unequal_list_lengths():
             str(exc_info.value)
             == "The length of words, romanized_morphemes, and part_of_speech_list are not equal."
         )
+
+
+def test_extract_data_tokenizes_lyrics_once():
+    song = {
+        "title": "テスト曲",
+        "romanji_title": "Test Song",
+        "lyrics": "世界は美しい",
+    }
+
+    with patch(
+        "morphemes_extractor.data_extractor.get_tokenizer",
+    ) as mock_get_tokenizer:
+        mock_get_tokenizer.return_value.tokenize.return_value = []
+        extract_data(song)
+
+    mock_get_tokenizer.return_value.tokenize.assert_called_once()
+
+
+def test_extract_data_with_sudachi_romanizer():
+    song = {
+        "title": "テスト曲",
+        "romanji_title": "Test Song",
+        "lyrics": "世界は美しい",
+    }
+
+    with patch("morphemes_extractor.data_extractor.romanize") as mock_romanize:
+        morphemes, romanized, pos, _, _ = extract_data(song, romanizer="sudachi")
+
+    mock_romanize.assert_not_called()
+    assert morphemes == ["世界", "は", "美しい"]
+    assert romanized == ["Sekai", "Wa", "Utsukushii"]
+    assert pos == ["Noun", "Particle", "Adjective"]
+
+
+def test_extract_data_romanizer_from_env(monkeypatch):
+    monkeypatch.setenv("ROMANIZER", "sudachi")
+    song = {"title": "テスト曲", "romanji_title": "Test Song", "lyrics": "世界"}
+
+    with patch("morphemes_extractor.data_extractor.romanize") as mock_romanize:
+        _, romanized, _, _, _ = extract_data(song)
+
+    mock_romanize.assert_not_called()
+    assert romanized == ["Sekai"]
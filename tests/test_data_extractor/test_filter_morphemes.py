@@ -0,0 +1,55 @@
+import pytest
+
+from morphemes_extractor.data_extractor import (
+    classify_word,
+    filter_morphemes,
+    get_pos_table,
+)
+from morphemes_extractor.tokenizer_provider import get_split_mode, get_tokenizer
+
+
+def tokenize(lyrics):
+    return get_tokenizer().tokenize(lyrics, get_split_mode())
+
+
+@pytest.mark.parametrize(
+    "dictionary_form, expected",
+    [
+        ("夜", "夜"),
+        (" 夜 ", "夜"),
+        ("", None),
+        ("  ", None),
+        ("Hello", None),
+        ("夜x", None),
+        ("123", None),
+        (" 123 ", None),
+        ("１２３", None),
+        ("²", None),
+        ("①", None),
+        ("3時", "3時"),
+    ],
+)
+def test_classify_word(dictionary_form, expected):
+    assert classify_word(dictionary_form) == expected
+
+
+def test_get_pos_table_excludes_parts_of_speech():
+    pos_table = get_pos_table()
+    morphemes = tokenize("夜 に。")
+
+    assert [pos_table[m.part_of_speech_id()] for m in morphemes] == [
+        "Noun",
+        None,
+        "Particle",
+        None,
+    ]
+
+
+def test_filter_morphemes_matches_pos_and_word_checks():
+    morphemes = tokenize("Hello 123 夜に駆ける！")
+
+    assert [(word, pos) for _, word, pos in filter_morphemes(morphemes)] == [
+        ("夜", "Noun"),
+        ("に", "Particle"),
+        ("駆ける", "Verb"),
+    ]
@@ -2,33 +2,29 @@ import pytest
 import pandas as pd
 from unittest.mock import patch
 from morphemes_extractor.data_extractor import get_morphemes_from_songs
+from morphemes_extractor.jp_data import CacheStats
 
 
 @pytest.fixture
 def mock_dependencies():
     with (
-        patch("morphemes_extractor.data_extractor.load_json") as mock_load_json,
-        patch("morphemes_extractor.data_extractor.get_song_list") as mock_get_song_list,
+        patch("morphemes_extractor.data_extractor.iter_songs") as mock_iter_songs,
         patch("morphemes_extractor.data_extractor.extract_data") as mock_extract_data,
         patch(
             "morphemes_extractor.data_extractor.transform_data_to_df"
         ) as mock_transform_data_to_df,
     ):
         yield (
-            mock_load_json,
-            mock_get_song_list,
+            mock_iter_songs,
             mock_extract_data,
             mock_transform_data_to_df,
         )
 
 
 def test_get_morphemes_from_songs_valid_data(mock_dependencies):
-    mock_load_json, mock_get_song_list, mock_extract_data, mock_transform_data_to_df = (
-        mock_dependencies
-    )
+    mock_iter_songs, mock_extract_data, mock_transform_data_to_df = mock_dependencies
 
-    mock_load_json.return_value = {"songs": [{"title": "Song 1"}]}
-    mock_get_song_list.return_value = [{"title": "Song 1"}]
+    mock_iter_songs.return_value = iter([{"title": "Song 1"}])
     mock_extract_data.return_value = (
         ["word1"],
         ["romanized1"],
@@ -49,12 +45,9 @@ def test_get_morphemes_from_songs_valid_data(mock_dependencies):
 
 
 def test_get_morphemes_from_songs_empty_data(mock_dependencies):
-    mock_load_json, mock_get_song_list, mock_extract_data, mock_transform_data_to_df = (
-        mock_dependencies
-    )
+    mock_iter_songs, mock_extract_data, mock_transform_data_to_df = mock_dependencies
 
-    mock_load_json.return_value = {"songs": []}
-    mock_get_song_list.return_value = []
+    mock_iter_songs.return_value = iter([])
 
     result = get_morphemes_from_songs(["path/to/json"])
 
@@ -63,12 +56,9 @@ def test_get_morphemes_from_songs_empty_data(mock_dependencies):
 
 
 def test_get_morphemes_from_songs_invalid_data(mock_dependencies):
-    mock_load_json, mock_get_song_list, mock_extract_data, mock_transform_data_to_df = (
-        mock_dependencies
-    )
+    mock_iter_songs, mock_extract_data, mock_transform_data_to_df = mock_dependencies
 
-    mock_load_json.return_value = {"songs": [{"title": "Song 1"}]}
-    mock_get_song_list.return_value = [{"title": "Song 1"}]
+    mock_iter_songs.return_value = iter([{"title": "Song 1"}])
     mock_extract_data.return_value = (
         ["word1"],
         ["romanized1"],
@@ -82,3 +72,45 @@ def test_get_morphemes_from_songs_invalid_data(mock_dependencies):
 
     assert isinstance(result, pd.DataFrame)
     assert result.empty
+
+
+def test_get_morphemes_from_songs_reports_romanization_cache_stats(
+    mock_dependencies,
+):
+    mock_iter_songs, mock_extract_data, mock_transform_data_to_df = mock_dependencies
+
+    mock_iter_songs.return_value = iter([{"title": "Song 1"}])
+    mock_extract_data.return_value = (
+        ["word1"],
+        ["romanized1"],
+        ["pos1"],
+        "Song 1",
+        "Song One",
+    )
+    mock_transform_data_to_df.return_value = pd.DataFrame({"morphemes": ["word1"]})
+
+    with patch(
+        "morphemes_extractor.data_extractor.get_cache_stats",
+        side_effect=[CacheStats(hits=2, misses=3), CacheStats(hits=10, misses=5)],
+    ):
+        result = get_morphemes_from_songs(["path/to/json"])
+
+    assert result.attrs["romanization_cache"] == {"hits": 8, "misses": 2}
+
+
+def test_get_morphemes_from_songs_parallel_matches_serial():
+    songs = [
+        {"title": "夜", "romanji_title": "Yoru", "lyrics": "夜に駆ける"},
+        {"title": "群青", "romanji_title": "Gunjou", "lyrics": "嗚呼いつもの様に"},
+        {"title": "空", "romanji_title": "Sora", "lyrics": "空は青い"},
+    ]
+    with patch(
+        "morphemes_extractor.data_extractor.iter_songs",
+        side_effect=lambda paths: iter(songs),
+    ):
+        serial = get_morphemes_from_songs(["path/to/json"], workers=1)
+        parallel = get_morphemes_from_songs(["path/to/json"], workers=2)
+
+    pd.testing.assert_frame_equal(
+        serial.drop(columns="Timestamp"), parallel.drop(columns="Timestamp")
+    )
@@ -0,0 +1,99 @@
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+
+from morphemes_extractor.data_extractor import (
+    get_extraction_workers,
+    iter_extracted_songs,
+)
+
+
+@pytest.fixture
+def songs():
+    return [
+        {"title": "短い", "romanji_title": "Mijikai", "lyrics": "夜"},
+        {
+            "title": "長い",
+            "romanji_title": "Nagai",
+            "lyrics": "ふざけあっても 分かり合えた気がした\n夜に駆ける",
+        },
+        {"title": "中くらい", "romanji_title": "Chuukurai", "lyrics": "世界は美しい"},
+    ]
+
+
+class FakeExecutor:
+    """Run submitted calls immediately and record their order."""
+
+    def __init__(self, *args, **kwargs):
+        self.submitted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, func, song, romanizer):
+        self.submitted.append(song["title"])
+        future = Future()
+        future.set_result(func(song, romanizer))
+        return future
+
+
+def test_iter_extracted_songs_serial_order(songs):
+    results = list(iter_extracted_songs(songs, workers=1))
+
+    assert [extracted[3] for extracted, _ in results] == ["短い", "長い", "中くらい"]
+
+
+def test_iter_extracted_songs_schedules_longest_first(songs):
+    executor = FakeExecutor()
+    with patch(
+        "morphemes_extractor.data_extractor.ProcessPoolExecutor",
+        return_value=executor,
+    ):
+        results = list(iter_extracted_songs(songs, workers=2))
+
+    assert executor.submitted == ["長い", "中くらい", "短い"]
+    assert [extracted[3] for extracted, _ in results] == ["短い", "長い", "中くらい"]
+
+
+def test_iter_extracted_songs_parallel_matches_serial(songs):
+    serial = [extracted for extracted, _ in iter_extracted_songs(songs, workers=1)]
+    parallel = [extracted for extracted, _ in iter_extracted_songs(songs, workers=2)]
+
+    assert parallel == serial
+
+
+def test_iter_extracted_songs_reports_worker_cache_stats(songs):
+    results = list(iter_extracted_songs(songs, workers=2, romanizer="sudachi"))
+
+    total_lookups = sum(stats.hits + stats.misses for _, stats in results)
+    total_morphemes = sum(len(extracted[0]) for extracted, _ in results)
+    assert total_lookups == total_morphemes
+
+
+def test_get_extraction_workers_default(monkeypatch):
+    monkeypatch.delenv("EXTRACTION_WORKERS", raising=False)
+    assert get_extraction_workers() == 1
+
+
+def test_get_extraction_workers_from_env(monkeypatch):
+    monkeypatch.setenv("EXTRACTION_WORKERS", "4")
+    assert get_extraction_workers() == 4
+
+
+def test_get_extraction_workers_argument_overrides_env(monkeypatch):
+    monkeypatch.setenv("EXTRACTION_WORKERS", "4")
+    assert get_extraction_workers(2) == 2
+
+
+def test_get_extraction_workers_zero_uses_cpu_count():
+    with patch("morphemes_extractor.data_extractor.os.cpu_count", return_value=8):
+        assert get_extraction_workers(0) == 8
+
+
+def test_get_extraction_workers_invalid():
+    with pytest.raises(ValueError):
+        get_extraction_workers(-1)
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from morphemes_extractor.data_extractor import (
+    get_morpheme_batch_size,
+    iter_morpheme_batches,
+    iter_song_batches,
+)
+from morphemes_extractor.jp_data import CacheStats
+
+
+@pytest.fixture
+def songs():
+    return [
+        {"title": "夜", "romanji_title": "Yoru", "lyrics": "夜に駆ける"},
+        {"title": "群青", "romanji_title": "Gunjou", "lyrics": "嗚呼いつもの様に"},
+        {"title": "空", "romanji_title": "Sora", "lyrics": "空は青い"},
+    ]
+
+
+def test_iter_song_batches_fixed_size(songs):
+    batches = list(iter_song_batches(songs, batch_size=2))
+
+    total_rows = sum(len(batch) for batch in batches)
+    assert all(len(batch) == 2 for batch in batches[:-1])
+    assert 1 <= len(batches[-1]) <= 2
+    assert len(batches) == -(-total_rows // 2)
+
+
+def test_iter_song_batches_matches_single_dataframe(songs):
+    batched = pd.concat(iter_song_batches(songs, batch_size=3), ignore_index=True)
+    single = pd.concat(iter_song_batches(songs, batch_size=1000), ignore_index=True)
+
+    # Categories are merged in a different order, so compare the values
+    pd.testing.assert_frame_equal(
+        batched.drop(columns="Timestamp").astype(object),
+        single.drop(columns="Timestamp").astype(object),
+    )
+
+
+def test_iter_song_batches_are_categorical(songs):
+    for batch in iter_song_batches(songs, batch_size=2):
+        assert all(isinstance(dtype, pd.CategoricalDtype) for dtype in batch.dtypes)
+
+
+def test_iter_song_batches_each_batch_has_fresh_index(songs):
+    for batch in iter_song_batches(songs, batch_size=2):
+        assert batch.index.tolist() == list(range(len(batch)))
+
+
+def test_iter_song_batches_empty_song_list():
+    assert list(iter_song_batches([], batch_size=2)) == []
+
+
+def test_iter_song_batches_adds_cache_stats(songs):
+    cache_stats = CacheStats()
+    rows = sum(
+        len(batch)
+        for batch in iter_song_batches(
+            songs, batch_size=2, romanizer="sudachi", cache_stats=cache_stats
+        )
+    )
+
+    assert cache_stats.hits + cache_stats.misses == rows
+
+
+def test_iter_morpheme_batches_streams_songs(songs):
+    with patch(
+        "morphemes_extractor.data_extractor.iter_songs",
+        return_value=iter(songs),
+    ) as mock_iter_songs:
+        batches = list(iter_morpheme_batches(["path/to/json"], batch_size=1000))
+
+    mock_iter_songs.assert_called_once_with(["path/to/json"])
+    assert len(batches) == 1
+    assert set(batches[0]["Song"]) == {"夜", "群青", "空"}
+
+
+def test_get_morpheme_batch_size_from_env(monkeypatch):
+    monkeypatch.setenv("MORPHEME_BATCH_SIZE", "500")
+    assert get_morpheme_batch_size() == 500
+
+
+def test_get_morpheme_batch_size_invalid():
+    with pytest.raises(ValueError):
+        get_morpheme_batch_size(0)
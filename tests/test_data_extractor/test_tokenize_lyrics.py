@@ -0,0 +1,40 @@
+from morphemes_extractor.data_extractor import tokenize_lyrics
+
+
+def test_tokenize_lyrics_collects_morphemes_pos_and_readings():
+    result = tokenize_lyrics("世界は美しい")
+
+    assert result.morphemes == ["世界", "は", "美しい"]
+    assert result.part_of_speech_list == ["Noun", "Particle", "Adjective"]
+    assert result.readings == ["セカイ", "ハ", "ウツクシイ"]
+
+
+def test_tokenize_lyrics_uses_dictionary_form_reading():
+    result = tokenize_lyrics("食べた")
+
+    assert result.morphemes == ["食べる", "た"]
+    assert result.readings == ["タベル", "タ"]
+
+
+def test_tokenize_lyrics_excludes_english_numbers_and_symbols():
+    result = tokenize_lyrics("Hello 123 こんにちは！")
+
+    assert result.morphemes == ["こんにちは"]
+    assert result.part_of_speech_list == ["Interjection"]
+    assert result.readings == ["コンニチハ"]
+
+
+def test_tokenize_lyrics_lists_have_equal_length():
+    result = tokenize_lyrics("ふざけあっても 分かり合えた気がした\n夜に駆ける")
+
+    assert (
+        len(result.morphemes) == len(result.part_of_speech_list) == len(result.readings)
+    )
+
+
+def test_tokenize_lyrics_empty_string():
+    result = tokenize_lyrics("")
+
+    assert result.morphemes == []
+    assert result.part_of_speech_list == []
+    assert result.readings == []
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from morphemes_extractor.data_transformer import concat_dataframes, to_categorical
+
+
+def test_concat_keeps_categorical_columns():
+    first = to_categorical(pd.DataFrame({"Morpheme": ["夜", "に"], "Song": ["A", "A"]}))
+    second = to_categorical(
+        pd.DataFrame({"Morpheme": ["空", "夜"], "Song": ["B", "B"]})
+    )
+
+    df = concat_dataframes([first, second])
+
+    assert isinstance(df["Morpheme"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Song"].dtype, pd.CategoricalDtype)
+    assert df["Morpheme"].tolist() == ["夜", "に", "空", "夜"]
+    assert df["Song"].tolist() == ["A", "A", "B", "B"]
+    assert df.index.tolist() == [0, 1, 2, 3]
+
+
+def test_concat_mixed_dtypes():
+    first = to_categorical(pd.DataFrame({"Morpheme": ["夜"], "Count": [1]}))
+    second = pd.DataFrame({"Morpheme": ["空"], "Count": [2]})
+
+    df = concat_dataframes([first, second])
+
+    assert df["Morpheme"].tolist() == ["夜", "空"]
+    assert df["Count"].tolist() == [1, 2]
+
+
+def test_concat_nothing():
+    assert concat_dataframes([]).empty
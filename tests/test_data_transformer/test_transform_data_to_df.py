@@ -61,3 +61,9 @@ def test_empty_input():
 
 if __name__ == "__main__":
     pytest.main()
+
+
+def test_categorical_columns(sample_data):
+    df = transform_data_to_df(**sample_data)
+    assert all(isinstance(dtype, pd.CategoricalDtype) for dtype in df.dtypes)
+    assert df["Song"].cat.categories.tolist() == [sample_data["song_name"]]
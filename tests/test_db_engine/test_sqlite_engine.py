@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import inspect, text
+
+from morphemes_extractor.db_engine import connect, dispose_engines, get_engine
+from morphemes_extractor.db_func import save_to_db
+
+
+@pytest.fixture(autouse=True)
+def clean_engines():
+    dispose_engines()
+    yield
+    dispose_engines()
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+def test_sqlite_engine_uses_wal(db_url):
+    with connect(db_url) as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        # NORMAL
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+
+def test_sqlite_transaction_rolls_back_ddl(db_url):
+    with connect(db_url) as conn:
+        conn.execute(text('CREATE TABLE "Kept" ("Morpheme" TEXT)'))
+        conn.commit()
+        conn.execute(text('DROP TABLE "Kept"'))
+        conn.execute(text('CREATE TABLE "Dropped" ("Morpheme" TEXT)'))
+        conn.rollback()
+
+    assert inspect(get_engine(db_url)).get_table_names() == ["Kept"]
+
+
+def test_save_to_db_failure_keeps_previous_data(db_url):
+    df = pd.DataFrame({"Morpheme": ["夜", "に"], "Song": ["A", "A"]})
+    save_to_db(df, db_url)
+
+    with patch(
+        "morphemes_extractor.db_func.refresh_aggregate_tables",
+        side_effect=RuntimeError("refresh failed"),
+    ):
+        with pytest.raises(RuntimeError):
+            save_to_db(df.iloc[:1], db_url)
+
+    with connect(db_url) as conn:
+        stored = pd.read_sql_table("Morpheme", conn)
+    pd.testing.assert_frame_equal(stored, df)
@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from morphemes_extractor.db_func import (
+    load_aggregate_table,
+    save_incremental_to_db,
+    save_to_db,
+)
+from morphemes_extractor.incremental import plan_incremental_update
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "Morpheme": ["夜", "に", "夜", "夜"],
+            "Part_of_Speech": ["Noun", "Particle", "Noun", "Noun"],
+            "Song": ["夜に駆ける", "夜に駆ける", "夜に駆ける", "群青"],
+        }
+    )
+
+
+def sorted_counts(df, columns):
+    return df.sort_values(columns).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("schema", ["flat", "normalized"])
+def test_aggregate_tables_after_save(db_url, sample_df, schema):
+    save_to_db(sample_df, db_url, schema=schema)
+
+    morpheme_counts = load_aggregate_table(db_url, "Morpheme_Count")
+    assert dict(zip(morpheme_counts["Morpheme"], morpheme_counts["Count"])) == {
+        "夜": 3,
+        "に": 1,
+    }
+    pos_counts = load_aggregate_table(db_url, "POS_Count")
+    assert dict(zip(pos_counts["Part_of_Speech"], pos_counts["Count"])) == {
+        "Noun": 3,
+        "Particle": 1,
+    }
+    song_counts = load_aggregate_table(db_url, "Morpheme_Song_Count")
+    pd.testing.assert_frame_equal(
+        sorted_counts(song_counts, ["Morpheme", "Song"]),
+        pd.DataFrame(
+            {
+                "Morpheme": ["に", "夜", "夜"],
+                "Song": ["夜に駆ける", "夜に駆ける", "群青"],
+                "Count": [1, 2, 1],
+            }
+        ),
+    )
+
+
+def test_aggregate_tables_after_incremental_save(db_url, sample_df):
+    songs = [{"title": "群青", "romanji_title": "Gunjou", "lyrics": "夜"}]
+    save_incremental_to_db(
+        sample_df[sample_df["Song"] == "群青"],
+        plan_incremental_update(songs, {}),
+        db_url,
+    )
+
+    morpheme_counts = load_aggregate_table(db_url, "Morpheme_Count")
+    assert morpheme_counts.to_dict("list") == {"Morpheme": ["夜"], "Count": [1]}
+
+
+def test_load_aggregate_without_table(db_url, sample_df):
+    with create_engine(db_url).connect() as conn:
+        sample_df.to_sql("Morpheme", conn, index=False)
+        conn.commit()
+        assert not inspect(conn).has_table("POS_Count")
+
+    pos_counts = load_aggregate_table(db_url, "POS_Count")
+    assert sorted_counts(pos_counts, ["Part_of_Speech"]).to_dict("list") == {
+        "Part_of_Speech": ["Noun", "Particle"],
+        "Count": [3, 1],
+    }
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from morphemes_extractor.db_func import (
+    load_song_hashes,
+    save_incremental_to_db,
+    save_to_db,
+)
+from morphemes_extractor.incremental import plan_incremental_update
+
+
+def rows_for(songs):
+    return pd.DataFrame(
+        {
+            "Morpheme": [song["lyrics"] for song in songs],
+            "Song": [song["title"] for song in songs],
+        }
+    )
+
+
+def run_incremental(songs, db_url):
+    plan = plan_incremental_update(songs, load_song_hashes(db_url))
+    save_incremental_to_db(rows_for(plan.songs_to_process), plan, db_url)
+    return plan
+
+
+def read_morphemes(db_url):
+    with create_engine(db_url).connect() as conn:
+        return pd.read_sql_table("Morpheme", conn)
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def songs():
+    return [
+        {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "夜"},
+        {"title": "群青", "romanji_title": "Gunjou", "lyrics": "嗚呼"},
+    ]
+
+
+def test_load_song_hashes_without_table(db_url):
+    assert load_song_hashes(db_url) == {}
+
+
+def test_first_incremental_run_saves_everything(db_url, songs):
+    plan = run_incremental(songs, db_url)
+
+    assert plan.added == ["夜に駆ける", "群青"]
+    assert read_morphemes(db_url)["Song"].tolist() == ["夜に駆ける", "群青"]
+    assert set(load_song_hashes(db_url)) == {"夜に駆ける", "群青"}
+
+
+def test_unchanged_songs_are_skipped(db_url, songs):
+    run_incremental(songs, db_url)
+
+    plan = run_incremental(songs, db_url)
+
+    assert plan.skipped == ["夜に駆ける", "群青"]
+    assert plan.songs_to_process == []
+    assert read_morphemes(db_url)["Morpheme"].tolist() == ["夜", "嗚呼"]
+
+
+def test_changed_added_and_removed_songs(db_url, songs):
+    run_incremental(songs, db_url)
+    new_songs = [
+        {**songs[0], "lyrics": "朝"},
+        {"title": "アイドル", "romanji_title": "Idol", "lyrics": "笑顔"},
+    ]
+
+    plan = run_incremental(new_songs, db_url)
+
+    assert plan.changed == ["夜に駆ける"]
+    assert plan.added == ["アイドル"]
+    assert plan.deleted == ["群青"]
+    saved = read_morphemes(db_url).sort_values("Song").reset_index(drop=True)
+    assert saved["Song"].tolist() == ["アイドル", "夜に駆ける"]
+    assert saved["Morpheme"].tolist() == ["笑顔", "朝"]
+    assert set(load_song_hashes(db_url)) == {"夜に駆ける", "アイドル"}
+
+
+def test_full_save_clears_song_hashes(db_url, songs):
+    run_incremental(songs, db_url)
+
+    save_to_db(rows_for(songs), db_url)
+
+    with create_engine(db_url).connect() as conn:
+        assert not inspect(conn).has_table("Song_Hash")
+    assert load_song_hashes(db_url) == {}
+
+
+def test_incremental_after_full_save_replaces_rows(db_url, songs):
+    save_to_db(rows_for(songs + [{"title": "古い", "lyrics": "昔"}]), db_url)
+
+    run_incremental(songs, db_url)
+
+    assert read_morphemes(db_url)["Song"].tolist() == ["夜に駆ける", "群青"]
@@ -5,6 +5,7 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.exc import OperationalError
 
+from morphemes_extractor.db_engine import get_pool_settings
 from morphemes_extractor.db_func import save_to_db
 
 
@@ -61,7 +62,7 @@ def test_overwrite_existing_table(tmp_path, sample_df):
     pd.testing.assert_frame_equal(new_df, saved_df)
 
 
-@patch("morphemes_extractor.db_func.create_engine")
+@patch("morphemes_extractor.db_engine.create_engine")
 def test_error_handling_operational_error(mock_create_engine, tmp_path, sample_df):
     db_path = tmp_path / "nonexistent_db.sqlite"
     invalid_url = f"sqlite:///{db_path}"
@@ -73,4 +74,34 @@ def test_error_handling_operational_error(mock_create_engine, tmp_path, sample_d
         save_to_db(sample_df, invalid_url)
 
     # Verify that create_engine was called with the correct URL
-    mock_create_engine.assert_called_once_with(invalid_url)
+    mock_create_engine.assert_called_once_with(
+        invalid_url, **get_pool_settings(invalid_url)
+    )
+
+
+def test_save_batches(tmp_path, sample_df):
+    db_url = f"sqlite:///{tmp_path / 'test.db'}"
+    batches = (sample_df.iloc[[i]].reset_index(drop=True) for i in range(2))
+
+    rows_saved = save_to_db(batches, db_url)
+
+    engine = create_engine(db_url)
+    with engine.connect() as conn:
+        saved_df = pd.read_sql_table("Morpheme", conn)
+
+    assert rows_saved == 2
+    pd.testing.assert_frame_equal(sample_df, saved_df)
+
+
+def test_save_batches_replaces_existing_table(tmp_path, sample_df):
+    db_url = f"sqlite:///{tmp_path / 'test.db'}"
+    save_to_db(sample_df, db_url)
+
+    rows_saved = save_to_db(iter([sample_df.iloc[:1]]), db_url)
+
+    engine = create_engine(db_url)
+    with engine.connect() as conn:
+        saved_df = pd.read_sql_table("Morpheme", conn)
+
+    assert rows_saved == 1
+    pd.testing.assert_frame_equal(sample_df.iloc[:1], saved_df)
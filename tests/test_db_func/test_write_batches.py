@@ -0,0 +1,125 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from morphemes_extractor.db_func import get_load_method, write_batches
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "Morpheme": ["テスト", "データ"],
+            "Romanji": ["tesuto", None],
+            "Part_of_Speech": ["Noun", "Noun"],
+            "Song": ["Test Song", "Test Song"],
+            "Song_Romanji": ["Tesuto Songu", "Tesuto Songu"],
+        }
+    )
+
+
+def make_connection(dialect_name, driver="psycopg2"):
+    conn = MagicMock()
+    conn.dialect.name = dialect_name
+    conn.dialect.driver = driver
+    return conn
+
+
+def test_auto_uses_copy_on_postgresql(monkeypatch):
+    monkeypatch.delenv("DB_LOAD_METHOD", raising=False)
+    assert get_load_method(make_connection("postgresql")) == "copy"
+
+
+@pytest.mark.parametrize("driver", ["psycopg", "asyncpg", "pg8000"])
+def test_auto_uses_executemany_on_other_postgresql_drivers(monkeypatch, driver):
+    monkeypatch.delenv("DB_LOAD_METHOD", raising=False)
+    assert get_load_method(make_connection("postgresql", driver)) == "executemany"
+
+
+def test_copy_requires_psycopg2():
+    with pytest.raises(
+        ValueError, match="COPY is not supported by postgresql\+psycopg"
+    ):
+        get_load_method(make_connection("postgresql", "psycopg"), "copy")
+
+
+def test_auto_uses_executemany_on_other_databases(monkeypatch):
+    monkeypatch.delenv("DB_LOAD_METHOD", raising=False)
+    assert get_load_method(make_connection("sqlite")) == "executemany"
+
+
+def test_load_method_from_env(monkeypatch):
+    monkeypatch.setenv("DB_LOAD_METHOD", "TO_SQL")
+    assert get_load_method(make_connection("postgresql")) == "to_sql"
+
+
+def test_invalid_load_method():
+    with pytest.raises(ValueError, match="Invalid load method: bulk"):
+        get_load_method(make_connection("sqlite"), "bulk")
+
+
+def test_copy_requires_postgresql():
+    with pytest.raises(ValueError, match="COPY is not supported by sqlite"):
+        get_load_method(make_connection("sqlite"), "copy")
+
+
+@pytest.mark.parametrize("method", ["executemany", "to_sql"])
+def test_write_batches_to_sqlite(tmp_path, sample_df, method):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.connect() as conn:
+        rows_saved = write_batches(
+            conn, [sample_df, sample_df], replace=True, method=method
+        )
+        conn.commit()
+        saved_df = pd.read_sql_table("Morpheme", conn)
+
+    assert rows_saved == 4
+    expected_df = pd.concat([sample_df, sample_df], ignore_index=True)
+    pd.testing.assert_frame_equal(expected_df, saved_df)
+
+
+def test_write_batches_with_copy(sample_df):
+    conn = make_connection("postgresql")
+    cursor = conn.connection.dbapi_connection.cursor.return_value
+    copied = []
+    cursor.copy_expert.side_effect = lambda query, buffer: copied.append(
+        (query, buffer.read())
+    )
+
+    with (
+        patch("morphemes_extractor.db_func.drop_normalized_schema"),
+        patch.object(pd.DataFrame, "to_sql") as mock_to_sql,
+    ):
+        rows_saved = write_batches(conn, [sample_df], replace=True, method="copy")
+
+    assert rows_saved == 2
+    mock_to_sql.assert_called_once_with(
+        "Morpheme", conn, if_exists="replace", index=False
+    )
+    query, data = copied[0]
+    assert 'COPY "Morpheme" ("Morpheme", "Romanji"' in query
+    assert "FROM STDIN WITH (FORMAT csv, NULL '\\N')" in query
+    assert data.splitlines() == [
+        "テスト,tesuto,Noun,Test Song,Tesuto Songu",
+        "データ,\\N,Noun,Test Song,Tesuto Songu",
+    ]
+    cursor.close.assert_called_once()
+    conn.execute.assert_not_called()
+
+
+def test_executemany_with_timestamps_and_nulls(tmp_path):
+    df = pd.DataFrame(
+        {
+            "Morpheme": ["テスト", None],
+            "Timestamp": pd.to_datetime(["2024-01-01 12:00:00", None]),
+        }
+    )
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.connect() as conn:
+        write_batches(conn, [df], replace=True, method="executemany")
+        conn.commit()
+        saved_df = pd.read_sql_table("Morpheme", conn)
+
+    pd.testing.assert_frame_equal(df, saved_df)
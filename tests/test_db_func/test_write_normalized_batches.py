@@ -0,0 +1,117 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from morphemes_extractor.db_func import (
+    get_db_schema,
+    load_song_hashes,
+    save_incremental_to_db,
+    save_to_db,
+)
+from morphemes_extractor.incremental import compute_song_hash, plan_incremental_update
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "Morpheme": ["夜", "に", "夜", "嗚呼"],
+            "Romanji": ["Yoru", "Ni", "Yoru", None],
+            "Part_of_Speech": ["Noun", "Particle", "Noun", "Interjection"],
+            "Song": ["夜に駆ける", "夜に駆ける", "群青", "群青"],
+            "Song_Romanji": ["Yoru ni Kakeru", "Yoru ni Kakeru", "Gunjou", "Gunjou"],
+            "Timestamp": ["2024-01-01 00:00:00"] * 4,
+        }
+    )
+
+
+def read_table(db_url, table):
+    with create_engine(db_url).connect() as conn:
+        return pd.read_sql_table(table, conn)
+
+
+def count_rows(db_url, table):
+    with create_engine(db_url).connect() as conn:
+        return conn.execute(text(f'SELECT COUNT(*) FROM "{table}"')).scalar_one()
+
+
+def test_get_db_schema_from_env(monkeypatch):
+    monkeypatch.setenv("MORPHEME_SCHEMA", "Normalized")
+    assert get_db_schema() == "normalized"
+
+
+def test_invalid_db_schema():
+    with pytest.raises(ValueError, match="Invalid schema: star"):
+        get_db_schema("star")
+
+
+def test_view_matches_flat_table(db_url, sample_df):
+    rows_saved = save_to_db(
+        [sample_df.iloc[:2], sample_df.iloc[2:]], db_url, schema="normalized"
+    )
+
+    assert rows_saved == 4
+    pd.testing.assert_frame_equal(read_table(db_url, "Morpheme"), sample_df)
+    assert count_rows(db_url, "Song") == 2
+    assert count_rows(db_url, "Lexeme") == 3
+    assert count_rows(db_url, "Occurrence") == 4
+    with create_engine(db_url).connect() as conn:
+        assert "Morpheme" in inspect(conn).get_view_names()
+
+
+def test_switch_between_schemas(db_url, sample_df):
+    save_to_db(sample_df, db_url, schema="normalized")
+    save_to_db(sample_df, db_url, schema="flat")
+    with create_engine(db_url).connect() as conn:
+        assert "Morpheme" in inspect(conn).get_table_names()
+        assert not inspect(conn).has_table("Occurrence")
+
+    save_to_db(sample_df, db_url, schema="normalized")
+    pd.testing.assert_frame_equal(read_table(db_url, "Morpheme"), sample_df)
+
+
+def test_incremental_requires_matching_schema(db_url, sample_df):
+    save_to_db(sample_df, db_url, schema="flat")
+    songs = [
+        {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "夜に"},
+        {"title": "群青", "romanji_title": "Gunjou", "lyrics": "夜嗚呼"},
+    ]
+    plan = plan_incremental_update(songs, {"夜に駆ける": compute_song_hash(songs[0])})
+
+    with pytest.raises(ValueError, match="flat schema"):
+        save_incremental_to_db(sample_df.iloc[2:], plan, db_url, schema="normalized")
+
+
+def test_incremental_update(db_url, sample_df):
+    songs = [
+        {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "夜に"},
+        {"title": "群青", "romanji_title": "Gunjou", "lyrics": "夜嗚呼"},
+    ]
+    plan = plan_incremental_update(songs, {})
+    save_incremental_to_db(sample_df, plan, db_url, schema="normalized")
+
+    # 群青 changes to a single new morpheme, so 嗚呼 is no longer used
+    songs[1]["lyrics"] = "空"
+    plan = plan_incremental_update(songs, load_song_hashes(db_url))
+    changed_df = pd.DataFrame(
+        {
+            "Morpheme": ["空"],
+            "Romanji": ["Sora"],
+            "Part_of_Speech": ["Noun"],
+            "Song": ["群青"],
+            "Song_Romanji": ["Gunjou"],
+            "Timestamp": ["2024-01-02 00:00:00"],
+        }
+    )
+    rows_saved = save_incremental_to_db(changed_df, plan, db_url, schema="normalized")
+
+    assert rows_saved == 1
+    expected_df = pd.concat([sample_df.iloc[:2], changed_df], ignore_index=True)
+    pd.testing.assert_frame_equal(read_table(db_url, "Morpheme"), expected_df)
+    assert read_table(db_url, "Lexeme")["Morpheme"].tolist() == ["夜", "に", "空"]
+    assert count_rows(db_url, "Song") == 2
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from morphemes_extractor.exporters import save_to_csv
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "Morpheme": ["テスト", "データ", "歌"],
+            "Romanji": ["Tesuto", "Deeta", "Uta"],
+            "Part_of_Speech": ["Noun", "Noun", "Noun"],
+            "Song": ["Test Song", "Test Song", "Test Song"],
+            "Song_Romanji": ["Tesuto Songu", "Tesuto Songu", "Tesuto Songu"],
+        }
+    )
+
+
+def test_save_to_csv_dataframe(tmp_path, sample_df):
+    csv_path = tmp_path / "morphemes.csv"
+
+    rows_saved = save_to_csv(sample_df, str(csv_path))
+
+    assert rows_saved == 3
+    pd.testing.assert_frame_equal(pd.read_csv(csv_path), sample_df)
+
+
+def test_save_to_csv_batches(tmp_path, sample_df):
+    csv_path = tmp_path / "morphemes.csv"
+    batches = iter([sample_df.iloc[:2], sample_df.iloc[2:]])
+
+    rows_saved = save_to_csv(batches, str(csv_path))
+
+    assert rows_saved == 3
+    pd.testing.assert_frame_equal(pd.read_csv(csv_path), sample_df)
+
+
+def test_save_to_csv_creates_parent_directory(tmp_path, sample_df):
+    csv_path = tmp_path / "export" / "morphemes.csv"
+
+    save_to_csv(sample_df, str(csv_path))
+
+    assert csv_path.is_file()
@@ -0,0 +1,130 @@
+import pathlib
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from morphemes_extractor.data_transformer import to_categorical
+from morphemes_extractor.exporters import (
+    get_morpheme_store,
+    get_parquet_dir,
+    save_to_parquet,
+)
+
+
+@pytest.fixture
+def sample_df():
+    return to_categorical(
+        pd.DataFrame(
+            {
+                "Morpheme": ["夜", "に", "駆ける", "群青"],
+                "Romanji": ["Yoru", "Ni", "Kakeru", "Gunjou"],
+                "Part_of_Speech": ["Noun", "Particle", "Verb", "Noun"],
+                "Song": ["夜に駆ける", "夜に駆ける", "夜に駆ける", "群青"],
+                "Song_Romanji": ["Yoru ni Kakeru"] * 3 + ["Gunjou"],
+            }
+        )
+    )
+
+
+def read_dataset(dataset_dir):
+    df = (
+        ds.dataset(dataset_dir, format="parquet", partitioning="hive")
+        .to_table()
+        .to_pandas()
+    )
+    return df.astype(object).sort_values(["Song", "Morpheme"], ignore_index=True)
+
+
+def test_save_to_parquet_partitions_by_song(tmp_path, sample_df):
+    dataset_dir = tmp_path / "morphemes"
+
+    rows_saved = save_to_parquet(sample_df, str(dataset_dir))
+
+    assert rows_saved == 4
+    assert sorted(path.name for path in dataset_dir.iterdir()) == [
+        "Song=%E5%A4%9C%E3%81%AB%E9%A7%86%E3%81%91%E3%82%8B",
+        "Song=%E7%BE%A4%E9%9D%92",
+    ]
+    expected = sample_df.astype(object)[list(read_dataset(dataset_dir).columns)]
+    pd.testing.assert_frame_equal(
+        read_dataset(dataset_dir),
+        expected.sort_values(["Song", "Morpheme"], ignore_index=True),
+    )
+
+
+def test_save_to_parquet_dictionary_encodes_strings(tmp_path, sample_df):
+    dataset_dir = tmp_path / "morphemes"
+    save_to_parquet(sample_df, str(dataset_dir))
+
+    parquet_file = pq.ParquetFile(next(dataset_dir.rglob("*.parquet")))
+
+    assert pa.types.is_dictionary(parquet_file.schema_arrow.field("Morpheme").type)
+    encodings = parquet_file.metadata.row_group(0).column(0).encodings
+    assert any("DICTIONARY" in encoding for encoding in encodings)
+
+
+def test_save_to_parquet_batches(tmp_path, sample_df):
+    dataset_dir = tmp_path / "morphemes"
+    # The batches have different categories, so different dictionary index types
+    batches = iter([sample_df.iloc[:1], sample_df.iloc[1:].copy()])
+
+    rows_saved = save_to_parquet(batches, str(dataset_dir))
+
+    assert rows_saved == 4
+    assert len(read_dataset(dataset_dir)) == 4
+
+
+def test_save_to_parquet_replaces_dataset(tmp_path, sample_df):
+    dataset_dir = tmp_path / "morphemes"
+    save_to_parquet(sample_df, str(dataset_dir))
+
+    save_to_parquet(sample_df.iloc[3:], str(dataset_dir))
+
+    assert read_dataset(dataset_dir)["Song"].tolist() == ["群青"]
+    assert not (tmp_path / "morphemes.tmp").exists()
+
+
+def test_save_to_parquet_failed_swap_restores_dataset(tmp_path, sample_df):
+    dataset_dir = tmp_path / "morphemes"
+    save_to_parquet(sample_df, str(dataset_dir))
+    rename = pathlib.Path.rename
+
+    def fail_new_dataset_rename(self, target):
+        if self.name == "morphemes.tmp":
+            raise OSError("rename failed")
+        return rename(self, target)
+
+    with (
+        patch.object(pathlib.Path, "rename", fail_new_dataset_rename),
+        pytest.raises(OSError),
+    ):
+        save_to_parquet(sample_df.iloc[3:], str(dataset_dir))
+
+    assert len(read_dataset(dataset_dir)) == 4
+    assert not (tmp_path / "morphemes.old").exists()
+
+
+def test_save_to_parquet_no_rows(tmp_path, sample_df):
+    dataset_dir = tmp_path / "morphemes"
+
+    assert save_to_parquet(iter([]), str(dataset_dir)) == 0
+    assert list(dataset_dir.iterdir()) == []
+
+
+def test_get_morpheme_store_from_env(monkeypatch):
+    monkeypatch.setenv("MORPHEME_STORE", "Parquet")
+    assert get_morpheme_store() == "parquet"
+
+
+def test_get_morpheme_store_invalid():
+    with pytest.raises(ValueError):
+        get_morpheme_store("duckdb")
+
+
+def test_get_parquet_dir_from_env(monkeypatch):
+    monkeypatch.setenv("PARQUET_DIR", "export/morphemes")
+    assert get_parquet_dir() == "export/morphemes"
@@ -0,0 +1,24 @@
+from morphemes_extractor.incremental import compute_song_hash
+
+
+def test_compute_song_hash_is_stable():
+    song = {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "夜"}
+    assert compute_song_hash(song) == compute_song_hash(dict(song))
+
+
+def test_compute_song_hash_changes_with_lyrics():
+    song = {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "夜"}
+    changed = {**song, "lyrics": "朝"}
+    assert compute_song_hash(song) != compute_song_hash(changed)
+
+
+def test_compute_song_hash_changes_with_romanji_title():
+    song = {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "夜"}
+    changed = {**song, "romanji_title": "Racing into the Night"}
+    assert compute_song_hash(song) != compute_song_hash(changed)
+
+
+def test_compute_song_hash_separates_fields():
+    song = {"title": "ab", "romanji_title": "", "lyrics": "c"}
+    other = {"title": "a", "romanji_title": "", "lyrics": "bc"}
+    assert compute_song_hash(song) != compute_song_hash(other)
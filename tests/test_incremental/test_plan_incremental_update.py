@@ -0,0 +1,54 @@
+import pytest
+
+from morphemes_extractor.incremental import compute_song_hash, plan_incremental_update
+
+
+@pytest.fixture
+def songs():
+    return [
+        {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "夜"},
+        {"title": "群青", "romanji_title": "Gunjou", "lyrics": "嗚呼"},
+        {"title": "アイドル", "romanji_title": "Idol", "lyrics": "無敵の笑顔"},
+    ]
+
+
+def test_plan_without_stored_hashes(songs):
+    plan = plan_incremental_update(songs, {})
+
+    assert plan.songs_to_process == songs
+    assert plan.added == ["夜に駆ける", "群青", "アイドル"]
+    assert plan.changed == []
+    assert plan.skipped == []
+    assert plan.deleted == []
+
+
+def test_plan_classifies_songs(songs):
+    stored_hashes = {
+        "夜に駆ける": compute_song_hash(songs[0]),
+        "群青": "outdated",
+        "ハルジオン": "removed",
+    }
+
+    plan = plan_incremental_update(songs, stored_hashes)
+
+    assert plan.skipped == ["夜に駆ける"]
+    assert plan.changed == ["群青"]
+    assert plan.added == ["アイドル"]
+    assert plan.deleted == ["ハルジオン"]
+    assert plan.updated == ["アイドル", "群青"]
+    assert plan.songs_to_process == [songs[1], songs[2]]
+
+
+def test_plan_records_current_hashes(songs):
+    plan = plan_incremental_update(songs, {})
+
+    assert plan.song_hashes == {
+        song["title"]: compute_song_hash(song) for song in songs
+    }
+
+
+def test_plan_rejects_duplicate_titles(songs):
+    with pytest.raises(ValueError) as exc_info:
+        plan_incremental_update(songs + [songs[0]], {})
+
+    assert str(exc_info.value) == "Duplicate song title: 夜に駆ける"
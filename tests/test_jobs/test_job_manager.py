@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from morphemes_extractor.jobs import (
+    CANCELLED,
+    FAILED,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    JobManager,
+    get_job_workers,
+)
+
+
+@pytest.fixture
+def job_manager():
+    manager = JobManager(workers=1)
+    yield manager
+    manager.shutdown()
+
+
+def wait_for(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+    return job
+
+
+def test_job_succeeds_with_progress(job_manager):
+    def func(job):
+        for songs_processed in range(1, 4):
+            job.set_songs_processed(songs_processed)
+        batches = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+        rows = sum(len(batch) for batch in job.track_batches(iter(batches)))
+        return {"rows_saved": rows}
+
+    job = wait_for(job_manager.submit("extract", {"incremental": False}, func))
+    assert job.status == SUCCEEDED
+    assert job.result == {"rows_saved": 3}
+    assert job.to_dict()["progress"] == {"songs_processed": 3, "rows_written": 3}
+    assert job.started_at is not None
+    assert job.finished_at is not None
+    assert job_manager.get(job.id) is job
+
+
+def test_identical_jobs_are_coalesced(job_manager):
+    release = threading.Event()
+    calls = []
+
+    def func(job):
+        calls.append(job.id)
+        release.wait(5)
+        return {}
+
+    job = job_manager.submit("visualize", {"font_scale": 2.0}, func)
+    assert job_manager.submit("visualize", {"font_scale": 2.0}, func) is job
+    other_job = job_manager.submit("visualize", {"font_scale": 1.0}, func)
+    assert other_job is not job
+    release.set()
+    wait_for(job)
+    wait_for(other_job)
+    assert calls == [job.id, other_job.id]
+
+    # A finished job is not reused
+    assert job_manager.submit("visualize", {"font_scale": 2.0}, func) is not job
+
+
+def test_cancel_running_job(job_manager):
+    started = threading.Event()
+
+    def func(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+
+    job = job_manager.submit("extract", {}, func)
+    assert started.wait(5)
+    assert job.status == RUNNING
+    job_manager.cancel(job.id)
+    assert wait_for(job).status == CANCELLED
+    assert job.result is None
+
+
+def test_cancel_pending_job(job_manager):
+    release = threading.Event()
+    blocking_job = job_manager.submit("extract", {}, lambda job: release.wait(5) or {})
+    pending_job = job_manager.submit("visualize", {}, lambda job: {})
+    assert pending_job.status == PENDING
+
+    job_manager.cancel(pending_job.id)
+    assert pending_job.status == CANCELLED
+    release.set()
+    assert wait_for(blocking_job).status == SUCCEEDED
+
+
+def test_failed_job_reports_error(job_manager, caplog):
+    def func(job):
+        raise ValueError("No morphemes found")
+
+    job = wait_for(job_manager.submit("extract", {}, func))
+    assert job.status == FAILED
+    assert job.error == "No morphemes found"
+    # The traceback is logged, not only the message
+    assert any(record.exc_info for record in caplog.records)
+
+
+def test_unknown_job(job_manager):
+    assert job_manager.get("missing") is None
+    assert job_manager.cancel("missing") is None
+
+
+def test_get_job_workers(monkeypatch):
+    monkeypatch.setenv("JOB_WORKERS", "3")
+    assert get_job_workers() == 3
+    assert get_job_workers(2) == 2
+    with pytest.raises(ValueError, match="Invalid number of job workers"):
+        get_job_workers(0)
@@ -0,0 +1,122 @@
+import gzip
+import importlib.util
+import io
+import json
+import tempfile
+
+import pytest
+
+from morphemes_extractor.json_utils import (
+    LYRICS_DIR,
+    find_json_files,
+    get_lyrics_format,
+    iter_file_songs,
+    iter_json_songs,
+    iter_songs,
+)
+
+SONGS = [
+    {"title": "夜に駆ける", "romanji_title": "Yoru ni Kakeru", "lyrics": "沈むように"},
+    {"title": "群青", "romanji_title": "Gunjou", "lyrics": "嗚呼、いつもの様に"},
+]
+
+
+@pytest.fixture
+def lyrics_dir():
+    # Lyrics files are only read inside the lyrics directory
+    with tempfile.TemporaryDirectory(dir=LYRICS_DIR) as tmp_dir:
+        yield tmp_dir
+
+
+def write_file(path, text, opener=open):
+    with opener(path, "wt", encoding="utf-8") as file:
+        file.write(text)
+    return str(path)
+
+
+def test_iter_json_songs_skips_other_keys():
+    document = json.dumps({"artist": "YOASOBI", "songs": SONGS, "count": 12345})
+
+    assert list(iter_json_songs(io.StringIO(document))) == SONGS
+
+
+def test_iter_json_songs_across_chunk_boundaries():
+    document = json.dumps(
+        {"count": 12345, "songs": SONGS}, ensure_ascii=False, indent=2
+    )
+
+    assert list(iter_json_songs(io.StringIO(document), chunk_size=3)) == SONGS
+
+
+def test_iter_json_songs_without_songs():
+    assert list(iter_json_songs(io.StringIO("{}"))) == []
+    assert list(iter_json_songs(io.StringIO('{"songs": []}'))) == []
+    assert list(iter_json_songs(io.StringIO('{"other": [1, 2]}'))) == []
+
+
+def test_iter_json_songs_yields_songs_before_a_decode_error():
+    document = '{"songs": [' + json.dumps(SONGS[0]) + ", {invalid"
+    songs = iter_json_songs(io.StringIO(document))
+
+    assert next(songs) == SONGS[0]
+    with pytest.raises(json.JSONDecodeError):
+        next(songs)
+
+
+def test_iter_json_songs_rejects_extra_data():
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        list(iter_json_songs(io.StringIO('{"songs": []} []')))
+
+
+def test_iter_file_songs_formats(lyrics_dir):
+    document = json.dumps({"songs": SONGS})
+    lines = "\n".join(json.dumps(song) for song in SONGS) + "\n\n"
+    paths = [
+        write_file(f"{lyrics_dir}/songs.json", document),
+        write_file(f"{lyrics_dir}/songs.jsonl", lines),
+        write_file(f"{lyrics_dir}/songs.json.gz", document, gzip.open),
+        write_file(f"{lyrics_dir}/songs.jsonl.gz", lines, gzip.open),
+    ]
+
+    for path in paths:
+        assert list(iter_file_songs(path)) == SONGS
+    assert list(iter_songs(paths[:2])) == SONGS + SONGS
+
+
+def test_iter_file_songs_rejects_files_outside_lyrics_dir(tmp_path):
+    path = write_file(tmp_path / "songs.json", json.dumps({"songs": SONGS}))
+
+    with pytest.raises(ValueError, match="Invalid or unauthorized file path"):
+        list(iter_file_songs(path))
+
+
+def test_iter_file_songs_rejects_other_suffixes(lyrics_dir):
+    path = write_file(f"{lyrics_dir}/songs.txt", json.dumps({"songs": SONGS}))
+
+    with pytest.raises(ValueError, match="Invalid or unauthorized file path"):
+        list(iter_file_songs(path))
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("zstandard") is not None, reason="zstandard installed"
+)
+def test_iter_file_songs_zstd_requires_zstandard(lyrics_dir):
+    path = write_file(f"{lyrics_dir}/songs.json.zst", "")
+
+    with pytest.raises(ImportError, match="Install zstandard"):
+        list(iter_file_songs(path))
+
+
+def test_get_lyrics_format():
+    assert get_lyrics_format("songs.json") == (".json", None)
+    assert get_lyrics_format("songs.v2.jsonl.zst") == (".jsonl", ".zst")
+    with pytest.raises(ValueError, match="Invalid lyrics file"):
+        get_lyrics_format("songs.gz")
+
+
+def test_find_json_files_finds_lyrics_files(lyrics_dir):
+    for name in ("a.json", "b.jsonl", "c.json.gz", "d.jsonl.zst", "e.txt", "f.gz"):
+        write_file(f"{lyrics_dir}/{name}", "")
+
+    names = sorted(path.rsplit("/", 1)[1] for path in find_json_files(lyrics_dir))
+    assert names == ["a.json", "b.jsonl", "c.json.gz", "d.jsonl.zst"]
@@ -0,0 +1,101 @@
+import gzip
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from morphemes_extractor.json_utils import (
+    LYRICS_DIR,
+    get_json_decoder,
+    get_json_load_workers,
+    load_json,
+    load_songs,
+    read_file_songs,
+)
+
+
+@pytest.fixture
+def lyrics_dir():
+    # Lyrics files are only read inside the lyrics directory
+    with tempfile.TemporaryDirectory(dir=LYRICS_DIR) as tmp_dir:
+        yield tmp_dir
+
+
+@pytest.fixture
+def json_files(lyrics_dir):
+    paths = []
+    for i in range(12):
+        songs = [
+            {"title": f"曲{i}-{j}", "romanji_title": f"Kyoku {i}-{j}", "lyrics": "夜"}
+            for j in range(i % 4)
+        ]
+        path = os.path.join(lyrics_dir, f"songs_{i:02d}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"songs": songs}, file, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("workers", [1, 2, 8, 32])
+def test_load_songs_order_is_independent_of_workers(json_files, workers):
+    titles = [song["title"] for song in load_songs(json_files, workers=workers)]
+
+    assert titles == [f"曲{i}-{j}" for i in range(12) for j in range(i % 4)]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_load_json_order_is_independent_of_workers(json_files, workers):
+    assert load_json(json_files, workers=workers) == load_json(json_files, workers=1)
+
+
+@pytest.mark.parametrize("decoder", ["json", "auto"])
+def test_load_songs_decoders_agree(json_files, monkeypatch, decoder):
+    monkeypatch.setenv("JSON_DECODER", "json")
+    expected = load_songs(json_files)
+
+    monkeypatch.setenv("JSON_DECODER", decoder)
+    assert load_songs(json_files) == expected
+
+
+def test_read_file_songs_jsonl_and_gzip(lyrics_dir):
+    songs = [{"title": "群青", "romanji_title": "Gunjou", "lyrics": "嗚呼"}]
+    jsonl_path = os.path.join(lyrics_dir, "songs.jsonl.gz")
+    with gzip.open(jsonl_path, "wt", encoding="utf-8") as file:
+        file.write(json.dumps(songs[0], ensure_ascii=False) + "\n\n")
+
+    assert read_file_songs(jsonl_path) == songs
+
+
+def test_read_file_songs_rejects_path_outside_lyrics_dir():
+    with tempfile.NamedTemporaryFile(suffix=".json") as file:
+        with pytest.raises(ValueError):
+            read_file_songs(file.name)
+
+
+def test_get_json_decoder_falls_back_to_stdlib():
+    with patch("importlib.util.find_spec", return_value=None):
+        assert get_json_decoder("auto") == "json"
+        with pytest.raises(ImportError):
+            get_json_decoder("orjson")
+
+
+def test_get_json_decoder_from_env(monkeypatch):
+    monkeypatch.setenv("JSON_DECODER", "json")
+    assert get_json_decoder() == "json"
+
+
+def test_get_json_decoder_invalid():
+    with pytest.raises(ValueError):
+        get_json_decoder("simdjson")
+
+
+def test_get_json_load_workers_from_env(monkeypatch):
+    monkeypatch.setenv("JSON_LOAD_WORKERS", "3")
+    assert get_json_load_workers() == 3
+
+
+def test_get_json_load_workers_invalid():
+    with pytest.raises(ValueError):
+        get_json_load_workers(0)
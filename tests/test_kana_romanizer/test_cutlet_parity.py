@@ -0,0 +1,29 @@
+import pytest
+
+from morphemes_extractor.data_extractor import tokenize_lyrics
+from morphemes_extractor.kana_romanizer import katakana_to_romaji
+from morphemes_extractor.romanizer import romanize
+
+# Native words where the Sudachi reading engine must agree with Cutlet.
+# Loanwords and some place names differ by design: Cutlet uses their
+# original spelling (e.g. 東京 -> "Tokyo").
+PARITY_WORDS = [
+    "こんにちは", "世界", "食べる", "美しい", "は", "へ", "を", "学校",
+    "行く", "ちょっと", "きっと", "待つ", "原因", "本屋", "君", "夢",
+    "僕", "ある", "です", "ない", "一緒", "思い出", "ずっと", "会う",
+    "通り", "大きい", "十", "空", "心", "勇気", "花火", "夜", "駆ける",
+    "ねえ", "笑顔", "今日", "感じる", "出会う", "一人", "日々", "分かる",
+    "強い", "誰", "声", "光", "涙", "抱きしめる", "全部", "散歩",
+    "新しい", "雨", "風", "想い", "届く", "未来",
+]  # fmt: skip
+
+
+@pytest.mark.parametrize("word", PARITY_WORDS)
+def test_sudachi_reading_matches_cutlet(word):
+    tokenized = tokenize_lyrics(word)
+    assert tokenized.morphemes == [word]
+
+    sudachi_romaji = katakana_to_romaji(
+        tokenized.readings[0], tokenized.part_of_speech_list[0]
+    )
+    assert sudachi_romaji == romanize(word)
@@ -0,0 +1,64 @@
+from morphemes_extractor.kana_romanizer import katakana_to_romaji, to_katakana
+
+
+def test_katakana_to_romaji_basic():
+    assert katakana_to_romaji("セカイ") == "Sekai"
+
+
+def test_katakana_to_romaji_digraph():
+    assert katakana_to_romaji("キョウ") == "Kyou"
+
+
+def test_katakana_to_romaji_sokuon():
+    assert katakana_to_romaji("ガッコウ") == "Gakkou"
+
+
+def test_katakana_to_romaji_sokuon_before_chi():
+    assert katakana_to_romaji("マッチ") == "Matchi"
+
+
+def test_katakana_to_romaji_n_before_vowel():
+    assert katakana_to_romaji("ゲンイン") == "Gen'in"
+
+
+def test_katakana_to_romaji_n_before_y():
+    assert katakana_to_romaji("ホンヤ") == "Hon'ya"
+
+
+def test_katakana_to_romaji_n_before_consonant():
+    assert katakana_to_romaji("サンポ") == "Sanpo"
+
+
+def test_katakana_to_romaji_long_vowel_mark():
+    assert katakana_to_romaji("ネー") == "Nee"
+
+
+def test_katakana_to_romaji_lone_long_vowel_mark():
+    assert katakana_to_romaji("ー") == "-"
+
+
+def test_katakana_to_romaji_particles():
+    assert katakana_to_romaji("ハ", "Particle") == "Wa"
+    assert katakana_to_romaji("ヘ", "Particle") == "E"
+    assert katakana_to_romaji("ヲ", "Particle") == "Wo"
+
+
+def test_katakana_to_romaji_ha_outside_particle():
+    assert katakana_to_romaji("ハ", "Noun") == "Ha"
+
+
+def test_katakana_to_romaji_foreign_sounds():
+    assert katakana_to_romaji("ファン") == "Fan"
+    assert katakana_to_romaji("パーティー") == "Paatii"
+
+
+def test_katakana_to_romaji_hiragana_input():
+    assert katakana_to_romaji("こんにちは") == "Konnichiha"
+
+
+def test_katakana_to_romaji_empty_string():
+    assert katakana_to_romaji("") == ""
+
+
+def test_to_katakana_keeps_other_characters():
+    assert to_katakana("あいABC漢字") == "アイABC漢字"
@@ -0,0 +1,48 @@
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+from morphemes_extractor.metrics import (
+    DB_ROWS_WRITTEN,
+    METRIC_NAMESPACE,
+    expose,
+    get_ratio,
+    get_value,
+    record_db_write,
+)
+
+
+def test_get_value_reads_counter_and_histogram_samples():
+    registry = CollectorRegistry()
+    counter = Counter("hits", "Hits.", registry=registry)
+    histogram = Histogram("seconds", "Time.", buckets=(0.1, 1.0), registry=registry)
+    counter.inc(3)
+    for value in (0.05, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert get_value(counter, "_total") == 3
+    assert get_value(histogram, "_count") == 3
+    assert get_value(histogram, "_sum") == 3.55
+    assert get_value(counter, "_missing") == 0
+
+
+def test_ratio_gauge_is_read_at_exposition():
+    registry = CollectorRegistry()
+    hits = Counter("hits", "Hits.", registry=registry)
+    lookups = Counter("lookups", "Lookups.", registry=registry)
+    gauge = Gauge("hit_ratio", "Hit ratio.", registry=registry)
+    gauge.set_function(get_ratio(hits, lookups))
+
+    assert registry.get_sample_value("hit_ratio") == 0
+    hits.inc(3)
+    lookups.inc(4)
+    assert registry.get_sample_value("hit_ratio") == 0.75
+
+
+def test_expose_prefixes_metric_names():
+    record_db_write(10, 0.1)
+
+    lines = expose().decode().splitlines()
+    assert f"# TYPE {METRIC_NAMESPACE}_songs_processed_total counter" in lines
+    assert f"# TYPE {METRIC_NAMESPACE}_tokenize_seconds histogram" in lines
+    assert f"# TYPE {METRIC_NAMESPACE}_render_cache_hit_ratio gauge" in lines
+    written = get_value(DB_ROWS_WRITTEN, "_total")
+    assert f"{METRIC_NAMESPACE}_db_rows_written_total {written}" in lines
@@ -0,0 +1,67 @@
+from morphemes_extractor.data_extractor import iter_extracted_songs
+from morphemes_extractor.jp_data import CacheStats
+from morphemes_extractor.metrics import (
+    record_db_write,
+    record_render,
+    record_song,
+    snapshot,
+    summarize,
+)
+
+
+def test_summarize_counts_since_snapshot():
+    record_song(10, 0.002, 0.001, CacheStats(hits=1, misses=1))
+    before = snapshot()
+    record_song(4, 0.004, 0.002, CacheStats(hits=3, misses=1))
+    record_song(6, 0.002, 0.002, CacheStats(hits=0, misses=0))
+    record_db_write(10, 0.5)
+    record_render(0.2, cache_hit=False)
+    record_render(0.01, cache_hit=True)
+
+    summary = summarize(before)
+
+    assert summary["songs_processed"] == 2
+    assert summary["tokens_processed"] == 10
+    assert summary["rows_written"] == 10
+    assert summary["tokenize_ms"] == {"count": 2, "total": 6.0, "mean": 3.0}
+    assert summary["db_write_ms"]["count"] == 1
+    assert summary["rows_per_second"] == 20.0
+    assert summary["romanization_cache_hit_ratio"] == 0.75
+    assert summary["render_cache_hit_ratio"] == 0.5
+
+
+def test_summarize_leaves_out_stages_that_did_not_run():
+    summary = summarize(snapshot())
+
+    assert summary == {"songs_processed": 0, "tokens_processed": 0, "rows_written": 0}
+
+
+def test_render_without_cache_is_not_a_lookup():
+    before = snapshot()
+    record_render(0.2, cache_hit=None)
+
+    summary = summarize(before)
+    assert summary["render_ms"]["count"] == 1
+    assert "render_cache_hit_ratio" not in summary
+
+
+def test_iter_extracted_songs_records_songs():
+    songs = [
+        {
+            "title": "夜に駆ける",
+            "romanji_title": "Yoru ni Kakeru",
+            "lyrics": "夜に駆ける",
+        },
+        {"title": "群青", "romanji_title": "Gunjou", "lyrics": "嗚呼いつもの様に"},
+    ]
+
+    before = snapshot()
+    results = list(iter_extracted_songs(songs, workers=1))
+    summary = summarize(before)
+
+    assert summary["songs_processed"] == 2
+    assert summary["tokens_processed"] == sum(
+        len(extracted[0]) for extracted, _ in results
+    )
+    assert summary["tokenize_ms"]["count"] == summary["romanize_ms"]["count"] == 2
+    assert summary["tokenize_ms"]["total"] > 0
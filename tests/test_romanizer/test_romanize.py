@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import pytest
+
+from morphemes_extractor import romanizer
+from morphemes_extractor.romanizer import (
+    clear_romanization_cache,
+    get_cache_stats,
+    get_cutlet,
+    get_romanizer_engine,
+    romanize,
+    romanize_reading,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_romanization_cache()
+    yield
+    clear_romanization_cache()
+
+
+def test_romanize_word():
+    assert romanize("世界") == "Sekai"
+
+
+def test_romanize_counts_hits_and_misses():
+    romanize("世界")
+    romanize("世界")
+    romanize("夜")
+
+    stats = get_cache_stats()
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.hit_ratio == pytest.approx(1 / 3)
+
+
+def test_romanize_calls_cutlet_once_per_word():
+    with patch.object(romanizer, "get_cutlet") as mock_get_cutlet:
+        mock_get_cutlet.return_value.romaji.return_value = "Sekai"
+        for _ in range(5):
+            romanize("世界")
+
+    mock_get_cutlet.return_value.romaji.assert_called_once_with("世界")
+
+
+def test_get_cutlet_reuses_instance():
+    assert get_cutlet() is get_cutlet()
+
+
+def test_clear_romanization_cache_resets_stats():
+    romanize("世界")
+    clear_romanization_cache()
+
+    stats = get_cache_stats()
+    assert stats.hits == 0
+    assert stats.misses == 0
+
+
+def test_get_cache_size_from_env(monkeypatch):
+    monkeypatch.setenv("ROMANIZATION_CACHE_SIZE", "16")
+    assert romanizer.get_cache_size() == 16
+
+
+def test_romanize_reading_counts_in_cache_stats():
+    romanize_reading("セカイ", "Noun")
+    romanize_reading("セカイ", "Noun")
+
+    stats = get_cache_stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+
+
+def test_get_romanizer_engine_default(monkeypatch):
+    monkeypatch.delenv("ROMANIZER", raising=False)
+    assert get_romanizer_engine() == "cutlet"
+
+
+def test_get_romanizer_engine_from_env(monkeypatch):
+    monkeypatch.setenv("ROMANIZER", "Sudachi")
+    assert get_romanizer_engine() == "sudachi"
+
+
+def test_get_romanizer_engine_invalid():
+    with pytest.raises(ValueError) as exc_info:
+        get_romanizer_engine("kakasi")
+
+    assert str(exc_info.value) == "Invalid romanizer engine: kakasi"
@@ -0,0 +1,30 @@
+import pytest
+from sudachipy import tokenizer
+
+from morphemes_extractor.tokenizer_provider import get_split_mode
+
+
+def test_get_split_mode_default(monkeypatch):
+    monkeypatch.delenv("SUDACHI_SPLIT_MODE", raising=False)
+    assert get_split_mode() == tokenizer.Tokenizer.SplitMode.C
+
+
+def test_get_split_mode_from_argument():
+    assert get_split_mode("a") == tokenizer.Tokenizer.SplitMode.A
+
+
+def test_get_split_mode_from_env(monkeypatch):
+    monkeypatch.setenv("SUDACHI_SPLIT_MODE", "B")
+    assert get_split_mode() == tokenizer.Tokenizer.SplitMode.B
+
+
+def test_get_split_mode_argument_overrides_env(monkeypatch):
+    monkeypatch.setenv("SUDACHI_SPLIT_MODE", "B")
+    assert get_split_mode("A") == tokenizer.Tokenizer.SplitMode.A
+
+
+def test_get_split_mode_invalid():
+    with pytest.raises(ValueError) as exc_info:
+        get_split_mode("D")
+
+    assert str(exc_info.value) == "Invalid Sudachi split mode: D"
@@ -0,0 +1,53 @@
+import threading
+from unittest.mock import patch
+
+from morphemes_extractor import tokenizer_provider
+from morphemes_extractor.tokenizer_provider import (
+    get_dictionary,
+    get_tokenizer,
+    reset_tokenizer,
+)
+
+
+def test_get_tokenizer_reuses_tokenizer_in_same_thread():
+    assert get_tokenizer() is get_tokenizer()
+
+
+def test_get_tokenizer_creates_one_tokenizer_per_thread():
+    tokenizers = []
+    thread = threading.Thread(target=lambda: tokenizers.append(get_tokenizer()))
+    thread.start()
+    thread.join()
+
+    assert tokenizers[0] is not get_tokenizer()
+
+
+def test_get_dictionary_is_shared_across_threads():
+    dictionaries = []
+    thread = threading.Thread(target=lambda: dictionaries.append(get_dictionary()))
+    thread.start()
+    thread.join()
+
+    assert dictionaries[0] is get_dictionary()
+
+
+def test_get_tokenizer_loads_dictionary_once():
+    reset_tokenizer()
+    with patch.object(
+        tokenizer_provider.dictionary,
+        "Dictionary",
+        wraps=tokenizer_provider.dictionary.Dictionary,
+    ) as mock_dictionary:
+        for _ in range(3):
+            get_tokenizer().tokenize("こんにちは")
+        reset_tokenizer()
+        get_tokenizer()
+
+    assert mock_dictionary.call_count == 2
+    reset_tokenizer()
+
+
+def test_reset_tokenizer_creates_new_tokenizer():
+    tokenizer_obj = get_tokenizer()
+    reset_tokenizer()
+    assert get_tokenizer() is not tokenizer_obj
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from visualize import count_values
+
+
+def test_count_rows():
+    df = pd.DataFrame({"Morpheme": ["に", "夜", "君", "夜", "君", "夜"]})
+    counts = count_values(df, "Morpheme")
+    assert counts.to_dict() == {"夜": 3, "君": 2, "に": 1}
+    assert counts.index.tolist() == ["夜", "君", "に"]
+
+
+def test_aggregated_input_matches_rows():
+    rows = pd.DataFrame(
+        {
+            "Morpheme": ["夜", "君", "夜", "に", "君", "空"],
+            "Song": ["A", "A", "B", "B", "B", "B"],
+        }
+    )
+    aggregated = (
+        rows.groupby(["Morpheme", "Song"])
+        .size()
+        .reset_index(name="Count")
+        .sample(frac=1, random_state=0)
+    )
+
+    pd.testing.assert_series_equal(
+        count_values(rows, "Morpheme"), count_values(aggregated, "Morpheme")
+    )
+
+
+def test_ties_are_ordered_by_value():
+    df = pd.DataFrame({"Part_of_Speech": ["Verb", "Noun", "Particle", "Noun"]})
+    counts = count_values(df, "Part_of_Speech")
+    assert counts.index.tolist() == ["Noun", "Particle", "Verb"]
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from morphemes_extractor.chart_data import (
+    load_pos_counts,
+    load_top_morpheme_song_counts,
+    load_top_morphemes,
+)
+from morphemes_extractor.db_func import save_to_db
+from morphemes_extractor.exporters import save_to_parquet
+from visualize import aggregate_chart_data, load_morpheme_dataset
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame(
+        {
+            "Morpheme": ["夜", "に", "夜", "君", "空", "君", "夜", "に"],
+            "Romanji": ["Yoru", "Ni", "Yoru", "Kimi", "Sora", "Kimi", "Yoru", "Ni"],
+            "Part_of_Speech": [
+                "Noun",
+                "Particle",
+                "Noun",
+                "Pronoun",
+                "Noun",
+                "Pronoun",
+                "Noun",
+                "Particle",
+            ],
+            "Song": ["A", "A", "A", "A", "B", "B", "B", "B"],
+        }
+    )
+
+
+@pytest.fixture
+def dataset_dir(tmp_path, sample_df):
+    dataset_dir = str(tmp_path / "morphemes")
+    save_to_parquet(sample_df, dataset_dir)
+    return dataset_dir
+
+
+def test_load_morpheme_dataset_prunes_columns(dataset_dir):
+    df = load_morpheme_dataset(dataset_dir, columns=["Morpheme", "Song"])
+
+    assert list(df.columns) == ["Morpheme", "Song"]
+    assert len(df) == 8
+    assert all(isinstance(dtype, pd.CategoricalDtype) for dtype in df.dtypes)
+
+
+def test_load_morpheme_dataset_prunes_partitions(dataset_dir):
+    df = load_morpheme_dataset(dataset_dir, songs=["B"])
+
+    assert set(df["Song"]) == {"B"}
+    assert sorted(df["Morpheme"]) == ["に", "君", "夜", "空"]
+
+
+def test_load_morpheme_dataset_numeric_song_title(tmp_path, sample_df):
+    dataset_dir = str(tmp_path / "morphemes")
+    save_to_parquet(sample_df.replace({"Song": {"A": "1", "B": "2"}}), dataset_dir)
+
+    df = load_morpheme_dataset(dataset_dir, songs=["2"])
+
+    assert list(df["Song"].cat.categories) == ["2"]
+    assert sorted(df["Morpheme"]) == ["に", "君", "夜", "空"]
+
+
+def test_load_morpheme_dataset_empty(tmp_path):
+    df = load_morpheme_dataset(str(tmp_path), columns=["Morpheme"])
+
+    assert df.empty
+    assert list(df.columns) == ["Morpheme"]
+
+
+def test_aggregate_chart_data_matches_database(tmp_path, sample_df, dataset_dir):
+    db_url = f"sqlite:///{tmp_path / 'test.db'}"
+    save_to_db(sample_df, db_url)
+
+    chart_data = aggregate_chart_data(
+        load_morpheme_dataset(dataset_dir), top_n=3, heatmap_top_n=2
+    )
+
+    pd.testing.assert_frame_equal(
+        chart_data["top_morphemes"], load_top_morphemes(db_url, top_n=3)
+    )
+    pd.testing.assert_frame_equal(
+        chart_data["pos_distribution"], load_pos_counts(db_url)
+    )
+    pd.testing.assert_frame_equal(
+        chart_data["morpheme_song_heatmap"],
+        load_top_morpheme_song_counts(db_url, top_n=2),
+    )
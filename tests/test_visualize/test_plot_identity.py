@@ -0,0 +1,58 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from morphemes_extractor.data_transformer import concat_dataframes, transform_data_to_df
+from visualize import (
+    plot_morpheme_song_heatmap,
+    plot_pos_distribution,
+    plot_top_morphemes,
+)
+
+OUTPUT_FILES = [
+    "visual_output/top_morphemes.png",
+    "visual_output/pos_distribution.png",
+    "visual_output/morpheme_song_heatmap.png",
+]
+
+
+@pytest.fixture
+def categorical_df():
+    songs = [
+        (["夜", "に", "駆ける", "夜"], ["Noun", "Particle", "Verb", "Noun"], "夜に駆ける"),
+        (["空", "は", "青い", "空", "に"], ["Noun", "Particle", "Adjective", "Noun", "Particle"], "群青"),
+        (["君", "の", "夜", "君"], ["Pronoun", "Particle", "Noun", "Pronoun"], "ハルジオン"),
+    ]  # fmt: skip
+    return concat_dataframes(
+        [
+            transform_data_to_df(morphemes, morphemes, pos_list, title, title)
+            for morphemes, pos_list, title in songs
+        ]
+    )
+
+
+def render_plots(df):
+    with warnings.catch_warnings():
+        # The CI fonts may lack Japanese glyphs; both inputs render the same fallback
+        warnings.simplefilter("ignore", UserWarning)
+        plot_top_morphemes(df, top_n=5)
+        plot_pos_distribution(df)
+        plot_morpheme_song_heatmap(df, 3)
+    images = {}
+    for path in OUTPUT_FILES:
+        with open(path, "rb") as f:
+            images[path] = f.read()
+    return images
+
+
+def test_categorical_plots_match_object_plots(tmp_path, monkeypatch, categorical_df):
+    monkeypatch.chdir(tmp_path)
+    assert all(
+        isinstance(dtype, pd.CategoricalDtype) for dtype in categorical_df.dtypes
+    )
+
+    categorical_images = render_plots(categorical_df)
+    object_images = render_plots(categorical_df.astype(object))
+
+    assert categorical_images == object_images
@@ -0,0 +1,171 @@
+import os
+import warnings
+from unittest.mock import patch
+
+import matplotlib as mpl
+import pytest
+
+from morphemes_extractor.data_transformer import concat_dataframes, transform_data_to_df
+from visualize import (
+    RENDER_CACHE_DIR,
+    get_chart_fingerprint,
+    get_render_workers,
+    render_charts,
+    shutdown_render_pool,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_render_pool(tmp_path, monkeypatch):
+    # Rendering processes write relative to the directory they started in
+    monkeypatch.chdir(tmp_path)
+    shutdown_render_pool()
+    yield
+    shutdown_render_pool()
+
+
+@pytest.fixture
+def chart_data():
+    songs = [
+        (["夜", "に", "駆ける", "夜"], ["Noun", "Particle", "Verb", "Noun"], "夜に駆ける"),
+        (["空", "は", "青い", "空"], ["Noun", "Particle", "Adjective", "Noun"], "群青"),
+    ]  # fmt: skip
+    df = concat_dataframes(
+        [
+            transform_data_to_df(morphemes, morphemes, pos_list, title, title)
+            for morphemes, pos_list, title in songs
+        ]
+    )
+    return {
+        "top_morphemes": df,
+        "pos_distribution": df,
+        "morpheme_song_heatmap": df,
+    }
+
+
+def read_outputs(render_seconds):
+    images = {}
+    for path in render_seconds:
+        with open(path, "rb") as f:
+            images[path] = f.read()
+    return images
+
+
+def test_parallel_render_matches_serial_render(chart_data, monkeypatch):
+    monkeypatch.setenv("RENDER_CACHE_SIZE", "0")
+    with warnings.catch_warnings():
+        # The CI fonts may lack Japanese glyphs; both modes render the same fallback
+        warnings.simplefilter("ignore", UserWarning)
+        serial_seconds = render_charts(chart_data, font_scale=1.5, workers=1)
+        serial_images = read_outputs(serial_seconds)
+        parallel_seconds = render_charts(chart_data, font_scale=1.5, workers=2)
+
+    assert list(serial_seconds) == [
+        "visual_output/top_morphemes.png",
+        "visual_output/pos_distribution.png",
+        "visual_output/morpheme_song_heatmap.png",
+    ]
+    assert list(parallel_seconds) == list(serial_seconds)
+    assert all(seconds > 0 for seconds in parallel_seconds.values())
+    assert read_outputs(parallel_seconds) == serial_images
+
+
+def render_quietly(*args, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return render_charts(*args, workers=1, **kwargs)
+
+
+def test_serial_render_keeps_process_rc_params(chart_data, monkeypatch):
+    monkeypatch.setenv("RENDER_CACHE_SIZE", "0")
+    rc_params = dict(mpl.rcParams)
+
+    render_quietly(chart_data, font_scale=1.5)
+
+    assert dict(mpl.rcParams) == rc_params
+
+
+def test_charts_replace_output_files_atomically(chart_data, monkeypatch):
+    monkeypatch.setenv("RENDER_CACHE_SIZE", "0")
+    replaced = []
+    replace = os.replace
+
+    def record_replace(src, dst):
+        assert src.endswith(".tmp")
+        replaced.append(dst)
+        replace(src, dst)
+
+    with patch("visualize.os.replace", side_effect=record_replace):
+        render_seconds = render_quietly(chart_data, font_scale=1.5)
+
+    assert sorted(replaced) == sorted(render_seconds)
+    assert not [name for name in os.listdir("visual_output") if name.endswith(".tmp")]
+
+
+def test_unchanged_charts_are_restored_from_cache(chart_data):
+    render_seconds = render_quietly(chart_data, font_scale=1.5)
+    images = read_outputs(render_seconds)
+    mtimes = {path: os.stat(path).st_mtime_ns for path in render_seconds}
+
+    cached = []
+    assert list(render_quietly(chart_data, font_scale=1.5, cached=cached)) == list(
+        render_seconds
+    )
+    assert cached == list(render_seconds)
+    assert read_outputs(render_seconds) == images
+    # Unchanged outputs are not rewritten
+    assert {path: os.stat(path).st_mtime_ns for path in render_seconds} == mtimes
+
+    # Another font scale or other data is rendered again
+    cached = []
+    render_quietly(chart_data, font_scale=1.0, cached=cached)
+    assert cached == []
+    chart_data["pos_distribution"] = chart_data["pos_distribution"].head(3)
+    render_quietly(chart_data, font_scale=1.5, cached=cached)
+    assert cached == [
+        "visual_output/top_morphemes.png",
+        "visual_output/morpheme_song_heatmap.png",
+    ]
+
+    # Overwritten outputs are restored from the cache
+    with open("visual_output/top_morphemes.png", "wb") as f:
+        f.write(b"stale")
+    render_quietly(chart_data, font_scale=1.5)
+    assert read_outputs(["visual_output/top_morphemes.png"]) == {
+        "visual_output/top_morphemes.png": images["visual_output/top_morphemes.png"]
+    }
+
+
+def test_render_cache_is_pruned(chart_data, monkeypatch):
+    monkeypatch.setenv("RENDER_CACHE_SIZE", "2")
+    data = {"pos_distribution": chart_data["pos_distribution"]}
+    for font_scale in (1.0, 1.5, 2.0):
+        render_quietly(data, font_scale=font_scale)
+    assert len(os.listdir(RENDER_CACHE_DIR)) == 2
+
+    monkeypatch.setenv("RENDER_CACHE_SIZE", "0")
+    cached = []
+    render_quietly(data, font_scale=2.0, cached=cached)
+    assert cached == []
+
+
+def test_chart_fingerprint(chart_data):
+    df = chart_data["top_morphemes"]
+    fingerprint = get_chart_fingerprint("top_morphemes", df, 2.0)
+    assert get_chart_fingerprint("top_morphemes", df.astype(object), 2.0) == fingerprint
+    assert get_chart_fingerprint("top_morphemes", df, 1.0) != fingerprint
+    assert get_chart_fingerprint("pos_distribution", df, 2.0) != fingerprint
+    assert get_chart_fingerprint("top_morphemes", df.head(3), 2.0) != fingerprint
+
+
+def test_render_unknown_chart(chart_data):
+    with pytest.raises(ValueError, match="Invalid chart: word_cloud"):
+        render_charts({"word_cloud": chart_data["top_morphemes"]}, workers=1)
+
+
+def test_get_render_workers(monkeypatch):
+    monkeypatch.setenv("RENDER_WORKERS", "3")
+    assert get_render_workers() == 3
+    assert get_render_workers(2) == 2
+    with pytest.raises(ValueError, match="Invalid number of render workers"):
+        get_render_workers(-1)
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from morphemes_extractor.warmup import (
+    WarmUp,
+    get_warmup_steps,
+    warm_up_canary,
+    warm_up_romanizer,
+    warm_up_tokenizer,
+)
+
+
+def test_get_warmup_steps(monkeypatch):
+    monkeypatch.delenv("WARMUP_STEPS", raising=False)
+    assert get_warmup_steps() == [
+        "tokenizer",
+        "romanizer",
+        "db_engine",
+        "fonts",
+        "canary",
+    ]
+    assert get_warmup_steps("Canary, tokenizer") == ["canary", "tokenizer"]
+    assert get_warmup_steps("none") == []
+    assert get_warmup_steps("") == []
+    monkeypatch.setenv("WARMUP_STEPS", "fonts")
+    assert get_warmup_steps() == ["fonts"]
+    with pytest.raises(ValueError, match="Invalid warm-up step: cache"):
+        get_warmup_steps("tokenizer,cache")
+
+
+def test_warm_up_runs_steps_in_order(caplog):
+    calls = []
+
+    def fail():
+        calls.append("db_engine")
+        raise RuntimeError("connection refused")
+
+    warm_up = WarmUp()
+    assert not warm_up.ready
+    warm_up.run(
+        {
+            "tokenizer": lambda: calls.append("tokenizer"),
+            "db_engine": fail,
+            "canary": lambda: calls.append("canary"),
+        }
+    )
+
+    assert calls == ["tokenizer", "db_engine", "canary"]
+    status = warm_up.to_dict()
+    assert status["ready"] is True
+    assert status["pending_steps"] == []
+    assert list(status["step_ms"]) == ["tokenizer", "db_engine", "canary"]
+    assert status["errors"] == {"db_engine": "connection refused"}
+    assert any(record.exc_info for record in caplog.records)
+
+
+def test_warm_up_in_background():
+    release = threading.Event()
+    warm_up = WarmUp()
+    thread = warm_up.start({"fonts": lambda: release.wait(5)})
+    assert not warm_up.ready
+    assert warm_up.to_dict()["pending_steps"] == ["fonts"]
+
+    release.set()
+    thread.join(5)
+    assert warm_up.ready
+    assert warm_up.to_dict()["pending_steps"] == []
+
+
+def test_warm_up_analyzers_and_canary():
+    warm_up = WarmUp()
+    warm_up.run(
+        {
+            "tokenizer": warm_up_tokenizer,
+            "romanizer": warm_up_romanizer,
+            "canary": warm_up_canary,
+        }
+    )
+    assert warm_up.errors == {}
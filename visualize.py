@@ -1,13 +1,30 @@
+import filecmp
+import glob
+import hashlib
+import io
 import logging
-from typing import Optional, Dict, Any, Union, cast
+import multiprocessing
+import shutil
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Dict, Any, List, Union, cast
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from sqlalchemy import create_engine
 import os
 import matplotlib as mpl
+from matplotlib import font_manager
+from matplotlib.figure import Figure
+from morphemes_extractor.chart_data import (
+    DEFAULT_HEATMAP_TOP_MORPHEMES,
+    DEFAULT_TOP_MORPHEMES,
+)
+from morphemes_extractor.data_transformer import to_categorical
+from morphemes_extractor.db_engine import DB_URL_ENV, connect
 from morphemes_extractor.logger_config import setup_logger
+from morphemes_extractor.metrics import record_render
 
 # Set up logger
 logger: logging.Logger = setup_logger(__name__, logging.INFO)
@@ -20,6 +37,20 @@ DEFAULT_FONT_SIZES: Dict[str, float] = {
     "annotation": 9.0,
     "legend": 10.0,
 }
+COUNT_COL = "Count"
+JAPANESE_FONT_FAMILY = "Noto Sans CJK JP"
+OUTPUT_DIR = "visual_output"
+# Environment variable and default for the number of chart rendering processes
+RENDER_WORKERS_ENV = "RENDER_WORKERS"
+DEFAULT_RENDER_WORKERS = 0
+# Rendered charts are kept by fingerprint of their data and rendering parameters
+RENDER_CACHE_DIR = os.path.join(OUTPUT_DIR, ".cache")
+RENDER_CACHE_SIZE_ENV = "RENDER_CACHE_SIZE"
+DEFAULT_RENDER_CACHE_SIZE = 5
+# Part of every fingerprint; bump it when a plot function changes its output
+RENDER_CACHE_VERSION = 1
+# Columns the charts read from the Parquet dataset; the others are not read
+CHART_COLUMNS = ["Morpheme", "Part_of_Speech", "Song"]
 DEFAULT_DB_CONFIG = {
     "user": "postgres",
     "password": "postgres",
@@ -29,29 +60,70 @@ DEFAULT_DB_CONFIG = {
 }
 
 
+def get_font_sizes(font_scale: float = 1.0) -> Dict[str, float]:
+    """
+    Returns the font sizes of a font scale.
+    """
+    return {k: v * font_scale for k, v in DEFAULT_FONT_SIZES.items()}
+
+
+def get_rc_params(font_scale: float = 1.0) -> Dict[str, Any]:
+    """
+    Returns the matplotlib rcParams for Japanese text at a font scale.
+    """
+    font_sizes = get_font_sizes(font_scale)
+    return {
+        "savefig.dpi": 300,
+        "figure.figsize": (12, 7),
+        "font.size": font_sizes["tick"],
+        "axes.titlesize": font_sizes["title"],
+        "axes.labelsize": font_sizes["label"],
+        "xtick.labelsize": font_sizes["tick"],
+        "ytick.labelsize": font_sizes["tick"],
+        "legend.fontsize": font_sizes["legend"],
+        "font.family": [JAPANESE_FONT_FAMILY],
+        "figure.autolayout": True,
+    }
+
+
 def setup_visualization(font_scale: float = 1.0) -> Dict[str, float]:
     """
-    Configures matplotlib for Japanese text and returns font sizes.
+    Configures matplotlib for Japanese text for the whole process and returns font sizes.
+    Only for processes that render alone, such as rendering processes and scripts;
+    render_chart_in_thread renders without changing the process-wide rcParams.
     """
     logger.info(f"Setting up visualization environment with font scale: {font_scale}")
-    font_sizes = {k: v * font_scale for k, v in DEFAULT_FONT_SIZES.items()}
-    mpl.rcParams["savefig.dpi"] = 300
-    mpl.rcParams["figure.figsize"] = (12, 7)
-    plt.rcParams["font.size"] = font_sizes["tick"]
-    plt.rcParams["axes.titlesize"] = font_sizes["title"]
-    plt.rcParams["axes.labelsize"] = font_sizes["label"]
-    plt.rcParams["xtick.labelsize"] = font_sizes["tick"]
-    plt.rcParams["ytick.labelsize"] = font_sizes["tick"]
-    plt.rcParams["legend.fontsize"] = font_sizes["legend"]
-    plt.rcParams["font.family"] = ["Noto Sans CJK JP"]
-    plt.rcParams["figure.autolayout"] = True
-    return font_sizes
+    mpl.rcParams.update(get_rc_params(font_scale))
+    return get_font_sizes(font_scale)
+
+
+def prime_font_cache() -> str:
+    """
+    Loads matplotlib's font cache and the Japanese font, and draws Japanese text
+    once, so the first chart does not pay for font discovery and glyph loading.
+    Returns the path of the font used for Japanese text.
+    """
+    font_path = str(
+        font_manager.findfont(
+            font_manager.FontProperties(family=JAPANESE_FONT_FAMILY),
+            fallback_to_default=True,
+        )
+    )
+    fig = Figure(figsize=(1, 1))
+    fig.text(0, 0, "夜に駆ける", family=JAPANESE_FONT_FAMILY)
+    fig.savefig(io.BytesIO(), format="png")
+    logger.info(f"Primed font cache with {font_path}")
+    return font_path
 
 
 def get_db_url() -> str:
     """
-    Returns PostgreSQL connection URL from environment variables.
+    Returns the database URL of the DB_URL environment variable, or the
+    PostgreSQL connection URL from the DB_* environment variables.
     """
+    db_url = os.getenv(DB_URL_ENV)
+    if db_url:
+        return db_url
     db_user = os.getenv("DB_USER", DEFAULT_DB_CONFIG["user"])
     db_password = os.getenv("DB_PASSWORD", DEFAULT_DB_CONFIG["password"])
     db_host = os.getenv("DB_HOST", DEFAULT_DB_CONFIG["host"])
@@ -63,13 +135,12 @@ def get_db_url() -> str:
 
 def load_morpheme_table(db_url: str) -> pd.DataFrame:
     """
-    Loads morpheme data from the database.
+    Loads morpheme data from the database, with categorical string columns.
     """
     logger.info("Loading morpheme data from database...")
-    engine = create_engine(db_url)
     try:
-        with engine.connect() as conn:
-            df = pd.read_sql_table("Morpheme", conn)
+        with connect(db_url) as conn:
+            df = to_categorical(pd.read_sql_table("Morpheme", conn))
         logger.info(f"Successfully loaded {len(df)} morpheme records from database")
         return df
     except pd.errors.DatabaseError as e:
@@ -80,21 +151,137 @@ def load_morpheme_table(db_url: str) -> pd.DataFrame:
         raise
 
 
+def load_morpheme_dataset(
+    dataset_dir: str,
+    columns: Optional[List[str]] = None,
+    songs: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Loads morpheme data from the Parquet dataset written by save_to_parquet,
+    with categorical string columns. No database is needed.
+    Only the given columns are read, and only the Song=<title> partitions
+    of the given songs are opened. Song titles are always read as strings,
+    even when they look like numbers.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    logger.info(f"Loading morpheme data from Parquet dataset {dataset_dir}...")
+    dataset = ds.dataset(
+        dataset_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("Song", pa.string())]), flavor="hive"),
+    )
+    if not dataset.files:
+        logger.warning(f"No Parquet files found in {dataset_dir}")
+        return pd.DataFrame(columns=columns)
+    song_filter = None if songs is None else ds.field("Song").isin(songs)
+    table = dataset.to_table(columns=columns, filter=song_filter)
+    df = to_categorical(table.to_pandas())
+    logger.info(f"Successfully loaded {len(df)} morpheme records from {dataset_dir}")
+    return df
+
+
+def aggregate_chart_data(
+    df: pd.DataFrame,
+    top_n: int = DEFAULT_TOP_MORPHEMES,
+    heatmap_top_n: int = DEFAULT_HEATMAP_TOP_MORPHEMES,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Counts morpheme rows into the data of each chart of CHART_PLOTTERS,
+    in the shape and order the chart_data queries return from the database.
+    """
+    morpheme_counts = count_values(df, "Morpheme")
+    top_morphemes = morpheme_counts.index[:heatmap_top_n]
+    song_counts = (
+        df[df["Morpheme"].isin(top_morphemes)]
+        .groupby(["Morpheme", "Song"], observed=True)
+        .size()
+        .reset_index(name=COUNT_COL)
+        .astype({"Morpheme": object, "Song": object})
+        .sort_values(["Morpheme", "Song"], ignore_index=True)
+    )
+    return {
+        "top_morphemes": morpheme_counts.head(top_n).reset_index(),
+        "pos_distribution": count_values(df, "Part_of_Speech").reset_index(),
+        "morpheme_song_heatmap": song_counts,
+    }
+
+
+def count_values(df: pd.DataFrame, column: str) -> "pd.Series[int]":
+    """
+    Counts the occurrences of each value of a column, most frequent first.
+    Accepts morpheme rows or pre-aggregated counts with a Count column.
+    Ties are ordered by value, so both inputs give the same order.
+    Unused categories of categorical columns are not counted.
+    """
+    if COUNT_COL in df.columns:
+        counts = df.groupby(column, observed=True)[COUNT_COL].sum()
+    else:
+        counts = df[column].value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(object)
+    frame = counts.rename_axis(column).reset_index(name=COUNT_COL)
+    frame = frame.sort_values(
+        [COUNT_COL, column], ascending=[False, True], kind="stable"
+    )
+    return frame.set_index(column)[COUNT_COL]
+
+
+def save_figure(fig: Figure, name: str, **savefig_kwargs: Any) -> str:
+    """
+    Saves a figure as a PNG file in the output directory.
+    Figures are rendered by the Agg canvas without pyplot's global figure state,
+    so charts can be rendered from several threads or processes.
+    The PNG is written to a temporary file and then replaces the output file,
+    so GET /charts/{name} never serves a partly written chart.
+    Returns the output path.
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_path = get_chart_path(name)
+    tmp_path = get_tmp_path(output_path)
+    try:
+        fig.savefig(tmp_path, format="png", **savefig_kwargs)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path
+
+
+def get_tmp_path(path: str) -> str:
+    """
+    Returns a temporary path next to a file, unique to the process and thread,
+    to write the file before os.replace moves it into place.
+    """
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def get_chart_path(name: str) -> str:
+    """
+    Returns the output path of a chart.
+    """
+    return os.path.join(OUTPUT_DIR, f"{name}.png")
+
+
 def plot_pos_distribution(
     df: pd.DataFrame, font_sizes: Optional[Dict[str, float]] = None
-) -> None:
+) -> str:
     """
     Plots the distribution of parts of speech in the dataset.
+    Accepts morpheme rows or part of speech counts.
+    Returns the output path.
     """
     logger.info("Creating part of speech distribution chart...")
     if font_sizes is None:
         font_sizes = DEFAULT_FONT_SIZES
-    fig, ax = plt.subplots(figsize=(12, 8))
-    sns.countplot(
-        y="Part_of_Speech",
-        data=df,
-        order=df["Part_of_Speech"].value_counts().index,
-        hue="Part_of_Speech",
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    counts = count_values(df, "Part_of_Speech")
+    sns.barplot(
+        x=counts.values,
+        y=counts.index,
+        hue=counts.index,
         palette="mako",
         legend=False,
         ax=ax,
@@ -107,25 +294,26 @@ def plot_pos_distribution(
     ax.set_xlabel("Count", fontsize=font_sizes["label"])
     ax.set_ylabel("Part of Speech", fontsize=font_sizes["label"])
     ax.tick_params(axis="both", which="major", labelsize=font_sizes["tick"])
-    plt.tight_layout(pad=2.0)
-    os.makedirs("visual_output", exist_ok=True)
-    output_path = os.path.join("visual_output", "pos_distribution.png")
-    plt.savefig(output_path, bbox_inches="tight")
-    plt.close()
+    fig.tight_layout(pad=2.0)
+    output_path = save_figure(fig, "pos_distribution", bbox_inches="tight")
     logger.info(f"Part of speech distribution chart saved to {output_path}")
+    return output_path
 
 
 def plot_top_morphemes(
     df: pd.DataFrame, font_sizes: Optional[Dict[str, float]] = None, top_n: int = 20
-) -> None:
+) -> str:
     """
     Plots the most common morphemes in the dataset.
+    Accepts morpheme rows or morpheme counts.
+    Returns the output path.
     """
     logger.info(f"Creating chart for top {top_n} morphemes...")
     if font_sizes is None:
         font_sizes = DEFAULT_FONT_SIZES
-    fig, ax = plt.subplots(figsize=(14, 10))
-    top = df["Morpheme"].value_counts().head(top_n)
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
+    top = count_values(df, "Morpheme").head(top_n)
     ax = sns.barplot(
         x=top.values, y=top.index, hue=top.index, palette="viridis", legend=False, ax=ax
     )
@@ -148,21 +336,21 @@ def plot_top_morphemes(
     ax.set_xlabel("Count", fontsize=font_sizes["label"])
     ax.set_ylabel("Morpheme", fontsize=font_sizes["label"])
     ax.tick_params(axis="both", which="major", labelsize=font_sizes["tick"])
-    plt.tight_layout(pad=3.0)
-    os.makedirs("visual_output", exist_ok=True)
-    output_path = os.path.join("visual_output", "top_morphemes.png")
-    plt.savefig(output_path, bbox_inches="tight")
-    plt.close()
+    fig.tight_layout(pad=3.0)
+    output_path = save_figure(fig, "top_morphemes", bbox_inches="tight")
     logger.info(f"Top morphemes chart saved to {output_path}")
+    return output_path
 
 
 def plot_morpheme_song_heatmap(
     df: pd.DataFrame,
     font_sizes_or_top_n: Union[Optional[Dict[str, float]], int] = None,
     top_n_param: int = 10,
-) -> None:
+) -> str:
     """
     Plots a heatmap showing the usage frequency of top morphemes across songs.
+    Accepts morpheme rows or morpheme-by-song counts.
+    Returns the output path.
     """
     if isinstance(font_sizes_or_top_n, dict):
         font_sizes = font_sizes_or_top_n
@@ -176,7 +364,7 @@ def plot_morpheme_song_heatmap(
     logger.info(f"Creating morpheme-song heatmap for top {top_n} morphemes...")
     if font_sizes is None:
         font_sizes = DEFAULT_FONT_SIZES
-    top_morphemes = df["Morpheme"].value_counts().head(top_n).index
+    top_morphemes = count_values(df, "Morpheme").head(top_n).index
     filtered = df[df["Morpheme"].isin(top_morphemes)].copy()
 
     def flatten_morpheme(x: Any) -> str:
@@ -187,9 +375,10 @@ def plot_morpheme_song_heatmap(
             return ""
         return str(x)
 
-    filtered["Morpheme"] = filtered["Morpheme"].apply(flatten_morpheme)
+    filtered["Morpheme"] = filtered["Morpheme"].astype(object).apply(flatten_morpheme)
     filtered["Song"] = filtered["Song"].astype(str)
-    filtered["Count"] = 1
+    if COUNT_COL not in filtered.columns:
+        filtered[COUNT_COL] = 1
     pivot = pd.pivot_table(
         filtered,
         index="Morpheme",
@@ -197,8 +386,10 @@ def plot_morpheme_song_heatmap(
         values="Count",
         aggfunc="sum",
         fill_value=0,
+        observed=True,
     )
-    plt.figure(figsize=(16, 10))
+    fig = Figure(figsize=(16, 10))
+    ax = fig.subplots()
     sns.heatmap(
         pivot,
         annot=True,
@@ -207,19 +398,287 @@ def plot_morpheme_song_heatmap(
         cbar_kws={"label": "Frequency"},
         linewidths=0.5,
         annot_kws={"size": 10},
+        ax=ax,
     )
-    plt.title(
+    ax.set_title(
         f"Heatmap of Top {top_n} Morphemes Usage by Song from YOASOBI's songs",
         fontsize=font_sizes["title"],
         fontweight="bold",
         pad=20,
     )
-    plt.xlabel("Song", fontsize=font_sizes["label"], labelpad=10)
-    plt.ylabel("Morpheme", fontsize=font_sizes["label"], labelpad=10)
-    plt.xticks(rotation=45, ha="right")
-    plt.subplots_adjust(bottom=0.25)
-    os.makedirs("visual_output", exist_ok=True)
-    output_path = os.path.join("visual_output", "morpheme_song_heatmap.png")
-    plt.savefig(output_path, bbox_inches="tight", pad_inches=0.5)
-    plt.close()
+    ax.set_xlabel("Song", fontsize=font_sizes["label"], labelpad=10)
+    ax.set_ylabel("Morpheme", fontsize=font_sizes["label"], labelpad=10)
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment("right")
+    fig.subplots_adjust(bottom=0.25)
+    output_path = save_figure(
+        fig, "morpheme_song_heatmap", bbox_inches="tight", pad_inches=0.5
+    )
     logger.info(f"Morpheme-song heatmap saved to {output_path}")
+    return output_path
+
+
+# Charts rendered by render_charts, by name; each takes its data and the font sizes
+CHART_PLOTTERS: Dict[str, Callable[[pd.DataFrame, Dict[str, float]], str]] = {
+    "top_morphemes": plot_top_morphemes,
+    "pos_distribution": plot_pos_distribution,
+    "morpheme_song_heatmap": plot_morpheme_song_heatmap,
+}
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_workers = 0
+_render_pool_lock = threading.Lock()
+_worker_font_scale: Optional[float] = None
+_worker_font_sizes: Dict[str, float] = DEFAULT_FONT_SIZES
+_file_etags: Dict[str, tuple[int, int, str]] = {}
+# rcParams are process-wide, so charts rendered in request threads take turns
+_thread_render_lock = threading.Lock()
+
+
+def get_render_workers(workers: Optional[int] = None) -> int:
+    """
+    Gets the number of processes used to render charts.
+    If not given, the RENDER_WORKERS environment variable is used, then 0.
+    0 uses one process per CPU; 1 renders the charts serially in this process.
+    """
+    if workers is None:
+        workers = int(os.getenv(RENDER_WORKERS_ENV, DEFAULT_RENDER_WORKERS))
+    if workers < 0:
+        raise ValueError(f"Invalid number of render workers: {workers}")
+    return workers or os.cpu_count() or 1
+
+
+def set_worker_font_scale(font_scale: float) -> Dict[str, float]:
+    """
+    Applies setup_visualization in this process unless the font scale is already set.
+    """
+    global _worker_font_scale, _worker_font_sizes
+    if _worker_font_scale != font_scale:
+        _worker_font_sizes = setup_visualization(font_scale)
+        _worker_font_scale = font_scale
+    return _worker_font_sizes
+
+
+def init_render_worker(font_scale: float) -> None:
+    """
+    Selects the Agg backend and sets up fonts and rcParams of a rendering process
+    once, before it receives any chart.
+    """
+    mpl.use("Agg")
+    set_worker_font_scale(font_scale)
+
+
+def render_chart(name: str, df: pd.DataFrame, font_scale: float) -> tuple[str, float]:
+    """
+    Renders one chart of CHART_PLOTTERS in a rendering process.
+    Returns the output path and the render time in seconds.
+    """
+    font_sizes = set_worker_font_scale(font_scale)
+    start = time.perf_counter()
+    output_path = CHART_PLOTTERS[name](df, font_sizes)
+    return output_path, time.perf_counter() - start
+
+
+def render_chart_in_thread(
+    name: str, df: pd.DataFrame, font_scale: float
+) -> tuple[str, float]:
+    """
+    Renders one chart of CHART_PLOTTERS in the calling thread.
+    The rcParams of the font scale only apply during the render, and renders
+    from concurrent threads are serialized, so they do not affect each other.
+    Returns the output path and the render time in seconds.
+    """
+    with _thread_render_lock, mpl.rc_context(get_rc_params(font_scale)):
+        start = time.perf_counter()
+        output_path = CHART_PLOTTERS[name](df, get_font_sizes(font_scale))
+        return output_path, time.perf_counter() - start
+
+
+def get_render_pool(workers: int, font_scale: float) -> ProcessPoolExecutor:
+    """
+    Gets the rendering process pool, creating it on first use.
+    The pool is kept between calls, so processes import matplotlib and load
+    the fonts only once.
+    """
+    global _render_pool, _render_pool_workers
+    with _render_pool_lock:
+        if _render_pool is None or _render_pool_workers != workers:
+            if _render_pool is not None:
+                _render_pool.shutdown()
+            logger.info(f"Start {workers} chart rendering processes...")
+            # Spawn fresh processes: forking a process with server threads is not safe
+            _render_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_render_worker,
+                initargs=(font_scale,),
+            )
+            _render_pool_workers = workers
+        return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """
+    Stops the rendering processes.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown()
+            _render_pool = None
+
+
+def get_render_cache_size(cache_size: Optional[int] = None) -> int:
+    """
+    Gets the number of cached renders kept per chart.
+    If not given, the RENDER_CACHE_SIZE environment variable is used, then 5.
+    0 disables the render cache.
+    """
+    if cache_size is None:
+        cache_size = int(os.getenv(RENDER_CACHE_SIZE_ENV, DEFAULT_RENDER_CACHE_SIZE))
+    if cache_size < 0:
+        raise ValueError(f"Invalid render cache size: {cache_size}")
+    return cache_size
+
+
+def get_chart_fingerprint(name: str, df: pd.DataFrame, font_scale: float) -> str:
+    """
+    Fingerprints a chart by its data and rendering parameters.
+    Equal values give equal fingerprints whether columns are categorical or not.
+    """
+    digest = hashlib.sha256()
+    params = (
+        RENDER_CACHE_VERSION,
+        mpl.__version__,
+        sns.__version__,
+        name,
+        font_scale,
+        list(df.columns),
+    )
+    digest.update(repr(params).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def get_cached_chart_path(name: str, fingerprint: str) -> str:
+    """
+    Returns the render cache path of a chart fingerprint.
+    """
+    return os.path.join(RENDER_CACHE_DIR, f"{name}-{fingerprint}.png")
+
+
+def restore_cached_chart(name: str, fingerprint: str) -> Optional[str]:
+    """
+    Restores a chart from the render cache into the output directory.
+    The output file is only rewritten if it differs from the cached render.
+    Returns the output path, or None if the fingerprint is not cached.
+    """
+    cached_path = get_cached_chart_path(name, fingerprint)
+    if not os.path.isfile(cached_path):
+        return None
+    output_path = get_chart_path(name)
+    if not (
+        os.path.isfile(output_path)
+        and filecmp.cmp(output_path, cached_path, shallow=False)
+    ):
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        tmp_path = get_tmp_path(output_path)
+        shutil.copyfile(cached_path, tmp_path)
+        os.replace(tmp_path, output_path)
+    # Mark the render as recently used, so it is pruned last
+    os.utime(cached_path)
+    return output_path
+
+
+def store_cached_chart(
+    name: str, fingerprint: str, output_path: str, cache_size: int
+) -> None:
+    """
+    Copies a rendered chart into the render cache and prunes the least recently
+    used renders of the chart beyond the cache size.
+    """
+    os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+    cached_path = get_cached_chart_path(name, fingerprint)
+    tmp_path = get_tmp_path(cached_path)
+    shutil.copyfile(output_path, tmp_path)
+    os.replace(tmp_path, cached_path)
+    cached_paths = sorted(
+        glob.glob(get_cached_chart_path(name, "*")),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for stale_path in cached_paths[cache_size:]:
+        os.remove(stale_path)
+
+
+def get_file_etag(path: str) -> str:
+    """
+    Returns a strong ETag of a file, derived from its content.
+    The hash is recomputed only when the file's size or modification time changes.
+    """
+    stat = os.stat(path)
+    cached = _file_etags.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, "rb") as f:
+        etag = f'"{hashlib.sha256(f.read()).hexdigest()}"'
+    _file_etags[path] = (stat.st_mtime_ns, stat.st_size, etag)
+    return etag
+
+
+def render_charts(
+    chart_data: Dict[str, pd.DataFrame],
+    font_scale: float = 1.0,
+    workers: Optional[int] = None,
+    cached: Optional[List[str]] = None,
+) -> Dict[str, float]:
+    """
+    Renders charts of CHART_PLOTTERS concurrently in rendering processes.
+    Charts whose data and font scale match a cached render are restored from
+    the render cache instead.
+    :param chart_data: Data of each chart, by chart name.
+    :param font_scale: Font scale, see setup_visualization.
+    :param workers: Number of processes, see get_render_workers.
+    :param cached: If given, output paths restored from the cache are added to it.
+    :return: Render time in seconds of each chart, by output path, in the order
+    of chart_data.
+    """
+    unknown = [name for name in chart_data if name not in CHART_PLOTTERS]
+    if unknown:
+        raise ValueError(f"Invalid chart: {', '.join(unknown)}")
+    cache_size = get_render_cache_size()
+    fingerprints: Dict[str, str] = {}
+    results: Dict[str, tuple[str, float]] = {}
+    for name, df in chart_data.items():
+        if not cache_size:
+            continue
+        start = time.perf_counter()
+        fingerprints[name] = get_chart_fingerprint(name, df, font_scale)
+        output_path = restore_cached_chart(name, fingerprints[name])
+        if output_path is not None:
+            results[name] = output_path, time.perf_counter() - start
+            if cached is not None:
+                cached.append(output_path)
+
+    to_render = [name for name in chart_data if name not in results]
+    # The pool is sized for all charts, so it is kept when some are cached
+    workers = min(get_render_workers(workers), len(CHART_PLOTTERS))
+    if workers <= 1 or len(to_render) <= 1:
+        for name in to_render:
+            results[name] = render_chart_in_thread(name, chart_data[name], font_scale)
+    else:
+        pool = get_render_pool(workers, font_scale)
+        futures: Dict[str, Future[tuple[str, float]]] = {
+            name: pool.submit(render_chart, name, chart_data[name], font_scale)
+            for name in to_render
+        }
+        for name, future in futures.items():
+            results[name] = future.result()
+
+    for name in to_render:
+        if cache_size:
+            store_cached_chart(name, fingerprints[name], results[name][0], cache_size)
+    for name in chart_data:
+        record_render(results[name][1], name not in to_render if cache_size else None)
+    return dict(results[name] for name in chart_data)